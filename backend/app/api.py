@@ -1,32 +1,228 @@
 # backend/app/api.py
+import asyncio
 import os
-import tempfile
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, UploadFile, File, Form, Query, Header, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from typing import List
 import numpy as np
 
+from . import db as database
 from .db import get_db
-from .models import Resume, JobDescription, RankingResult
+from .models import Resume, ResumeEmbedding, JobDescription, RankingResult, RankingRun
 from .embeddings import Embedder
-from .text_extract import extract_text
-from .utils import validate_file_extension, truncate_text
+from .store import (
+    save_resume_embedding, load_resume_embeddings, load_resume_chunk_embeddings,
+    resumes_missing_embeddings, save_ranking_results, bump_results_version,
+    vector_to_blob, blob_to_vector, EMBEDDING_LOAD_BATCH_SIZE
+)
+from .ranking import (
+    encode_documents, score_embeddings, score_chunked, score_matrix_top_k, top_k_indices,
+    merge_rankings, fuse_scores, reciprocal_rank_fusion, CHUNK_POOLING, POOLING_MODES,
+    RANKING_MAX_STORED_RESULTS, HYBRID_LEXICAL_WEIGHT, HYBRID_FUSION, FUSION_MODES
+)
+from .vector_index import VectorIndex
+from .embedding_matrix import EmbeddingMatrix
+from .lexical_index import LexicalIndex
+from .near_duplicates import MinHashIndex, NEAR_DUPLICATE_THRESHOLD
+from .reranker import CrossEncoderReranker, RERANK_BUDGET_MS
+from .results_cache import ResultsCache
+from .embedding_cache import QueryEmbeddingCache, text_digest
+from .batching import MicroBatcher
+from .executors import run_extraction, run_encoding
+from .ingest import (
+    expand_upload, spool_to_temp_file, UploadTooLarge,
+    BULK_UPLOAD_MAX_FILES, UPLOAD_MAX_PAGES, UPLOAD_MAX_REQUEST_BYTES
+)
+from .tasks import RankingTaskManager, RANKING_CHUNK_SIZE
+from .text_extract import extract_text_with_stats, ExtractionStats
+from .utils import validate_file_extension, truncate_text, content_hash
+
+# Default and largest page size of /resumes and /jobs
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "100"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
 
 router = APIRouter()
 embedder = Embedder()
+vector_index = VectorIndex()
+# Memory-mapped copy of the stored embeddings, shared by all workers
+embedding_matrix = EmbeddingMatrix()
+# BM25 index over resume text for hybrid ranking, built on first use
+lexical_index = LexicalIndex()
+# MinHash/LSH index of resume text for near-duplicate detection
+near_duplicate_index = MinHashIndex()
+# Optional second ranking stage, loaded on first use
+reranker = CrossEncoderReranker()
+
+
+def _encode_resume_texts(texts: List[str]) -> list:
+    """Encode resume texts into (document vector, chunk vectors) pairs"""
+    vectors, chunks = encode_documents(embedder, texts)
+    return list(zip(vectors, chunks))
+
+
+# Coalesces concurrent uploads into batched encode calls
+embedding_batcher = MicroBatcher(_encode_resume_texts)
+
+# Background ranking runs for large corpora
+ranking_tasks = RankingTaskManager()
+# Per-document extraction timings, to find slow files
+extraction_stats = ExtractionStats()
+# Rendered /results bodies, keyed by the job's results version
+results_cache = ResultsCache()
+# Embeddings of recently encoded job and query texts
+query_embeddings = QueryEmbeddingCache()
 
 # Store current job description ID for ranking
 current_job_id = None
 
 
+async def _extract_text(path: str, filename: str) -> str:
+    """
+    Extract text in the extraction pool and record how long it took
+    
+    Args:
+        path: Spooled upload
+        filename: Uploaded filename, for the stats
+    
+    Returns:
+        Extracted text
+    """
+    text, stats = await run_extraction(extract_text_with_stats, path, max_pages=UPLOAD_MAX_PAGES)
+    extraction_stats.record(filename, stats)
+    if stats["error"]:
+        raise ValueError(stats["error"])
+    return text
+
+
+def _save_resumes(db: Session, entries: list, requisition_id: str = None) -> List[dict]:
+    """
+    Insert resumes with their embeddings in one transaction and add them
+    to the vector index
+    
+    A concurrent upload may store the same file or text between the
+    duplicate checks and this insert; the unique hash indexes then reject
+    the transaction, and it is retried without the entries stored since.
+    
+    Args:
+        db: Database session
+        entries: (filename, candidate_name, content, embedding, chunk embeddings,
+            file hash, content hash) tuples
+        requisition_id: Requisition (or any tag) the resumes were received for
+    
+    Returns:
+        id, filename and candidate_name of the resume of each entry, with
+        duplicate set when it was stored by another upload
+    """
+    results = [None] * len(entries)
+    pending = list(range(len(entries)))
+    while pending:
+        try:
+            saved, embedding_ids = _insert_resumes(db, [entries[i] for i in pending], requisition_id)
+        except IntegrityError:
+            db.rollback()
+            known_files = _find_resumes_by_hash(db, Resume.file_hash, [entries[i][5] for i in pending])
+            known_texts = _find_resumes_by_hash(db, Resume.content_hash, [entries[i][6] for i in pending])
+            remaining = []
+            for i in pending:
+                known = known_files.get(entries[i][5]) or known_texts.get(entries[i][6])
+                if known:
+                    results[i] = {**known, "duplicate": True}
+                else:
+                    remaining.append(i)
+            if len(remaining) == len(pending):
+                raise
+            pending = remaining
+            continue
+        for i, resume in zip(pending, saved):
+            results[i] = {**resume, "duplicate": False}
+        break
+    
+    if pending:
+        for i, resume in zip(pending, saved):
+            lexical_index.add(resume["id"], entries[i][2])
+            near_duplicate_index.add(resume["id"], entries[i][2])
+        vector_index.add(
+            [resume["id"] for resume in saved], np.vstack([entries[i][3] for i in pending]), embedder, embedding_ids
+        )
+    return results
+
+
+def _insert_resumes(db: Session, entries: list, requisition_id: str):
+    """Insert resumes and their embeddings and commit; returns the saved resumes and their embedding IDs"""
+    resumes = [
+        Resume(
+            filename=filename,
+            candidate_name=candidate_name,
+            requisition_id=requisition_id,
+            content=content,
+            file_hash=file_hash,
+            content_hash=text_hash
+        )
+        for filename, candidate_name, content, _, _, file_hash, text_hash in entries
+    ]
+    db.add_all(resumes)
+    db.flush()
+    rows = [
+        save_resume_embedding(db, resume.id, entry[3], embedder, entry[4])
+        for resume, entry in zip(resumes, entries)
+    ]
+    db.flush()
+    # Read back before commit expires the rows (avoids one SELECT per resume)
+    saved = [
+        {"id": resume.id, "filename": resume.filename, "candidate_name": resume.candidate_name}
+        for resume in resumes
+    ]
+    embedding_ids = [row.id for row in rows]
+    with embedding_matrix.locked(embedder):
+        db.commit()
+        embedding_matrix.add(
+            [resume["id"] for resume in saved], np.vstack([entry[3] for entry in entries]), embedder, embedding_ids
+        )
+    return saved, embedding_ids
+
+
+def _find_resumes_by_hash(db: Session, column, hashes) -> dict:
+    """
+    Look up stored resumes by file or content hash
+    
+    Args:
+        db: Database session
+        column: Resume.file_hash or Resume.content_hash
+        hashes: Hashes to look up
+    
+    Returns:
+        Mapping of each known hash to the id, filename and candidate_name
+        of its resume
+    """
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    rows = db.query(column, Resume.id, Resume.filename, Resume.candidate_name).filter(column.in_(hashes))
+    return {
+        resume_hash: {"id": resume_id, "filename": filename, "candidate_name": candidate_name}
+        for resume_hash, resume_id, filename, candidate_name in rows
+    }
+
+
 @router.post("/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...),
     candidate_name: str = None,
+    requisition_id: str = None,
     db: Session = Depends(get_db)
 ):
     """
     Upload and process a resume file (PDF or DOCX)
+    
+    A file whose bytes or normalized text match a stored resume is not
+    stored again; the response then describes the stored resume and has
+    duplicate set. requisition_id tags the resume for filtered rankings.
     """
     # Validate file extension
     if not validate_file_extension(file.filename):
@@ -35,33 +231,54 @@ async def upload_resume(
             detail="Unsupported file format. Only PDF and DOCX are supported."
         )
     
+    # Stream the upload to a temporary file in chunks, hashing it on the way
+    try:
+        tmp_path, file_hash = await run_in_threadpool(spool_to_temp_file, file.file, file.filename)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
     try:
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            contents = await file.read()
-            tmp.write(contents)
-            tmp_path = tmp.name
+        try:
+            # Known file: skip extraction and encoding altogether
+            known = await run_in_threadpool(_find_resumes_by_hash, db, Resume.file_hash, [file_hash])
+            if known:
+                return {**known[file_hash], "duplicate": True}
+            
+            # Extract text in the extraction pool, off the event loop
+            resume_text = await _extract_text(tmp_path, file.filename)
+        finally:
+            # Clean up temp file
+            os.unlink(tmp_path)
+        
+        # Scanned or image-only files: all of them would share one content hash
+        if not resume_text.strip():
+            raise ValueError("No text could be extracted")
         
-        # Extract text
-        resume_text = extract_text(tmp_path)
+        # Same text in another file (e.g. re-exported PDF): skip encoding
+        text_hash = content_hash(resume_text)
+        known = await run_in_threadpool(_find_resumes_by_hash, db, Resume.content_hash, [text_hash])
+        if known:
+            return {**known[text_hash], "duplicate": True}
         
-        # Clean up temp file
-        os.unlink(tmp_path)
+        # Embed once at upload so ranking only needs a lookup
+        resume_embedding, chunk_embeddings = await embedding_batcher.submit(resume_text)
         
         # Save to database
-        resume = Resume(
-            filename=file.filename,
-            candidate_name=candidate_name or file.filename.split('.')[0],
-            content=resume_text
+        entry = (
+            file.filename,
+            candidate_name or file.filename.split('.')[0],
+            resume_text,
+            resume_embedding,
+            chunk_embeddings,
+            file_hash,
+            text_hash
         )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        resume = (await run_in_threadpool(_save_resumes, db, [entry], requisition_id))[0]
+        if resume["duplicate"]:
+            return resume
         
         return {
-            "id": resume.id,
-            "filename": resume.filename,
-            "candidate_name": resume.candidate_name,
+            **resume,
             "preview": truncate_text(resume_text, 200)
         }
     
@@ -69,6 +286,240 @@ async def upload_resume(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/upload-resumes")
+async def upload_resumes(
+    files: List[UploadFile] = File(...),
+    candidate_names: List[str] = Form(None),
+    requisition_id: str = Form(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many resume files (PDF, DOCX, or ZIP archives of them) at once
+    
+    Texts are extracted in parallel, encoded in batches and inserted in a
+    single transaction. candidate_names, if given, pairs with files by
+    position; ZIP members are named after their filenames.
+    
+    Files matching a stored resume, or an earlier file of the same upload,
+    by bytes or normalized text are reported with status "duplicate" and
+    duplicate_of instead of being stored again. requisition_id tags every
+    stored resume for filtered rankings.
+    """
+    names = candidate_names or []
+    
+    entries = []
+    # Files repeated within this upload, resolved once their first copy is
+    file_repeats = []
+    try:
+        # Stream uploads (and ZIP members) to temporary files within the size limits
+        spooled_bytes = 0
+        for index, file in enumerate(files):
+            try:
+                expanded = await run_in_threadpool(
+                    expand_upload,
+                    file.file,
+                    file.filename,
+                    UPLOAD_MAX_REQUEST_BYTES - spooled_bytes,
+                    BULK_UPLOAD_MAX_FILES - len(entries)
+                )
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            name = names[index] if index < len(names) and not file.filename.lower().endswith(".zip") else None
+            entries.extend(
+                (filename, name, path, error, file_hash) for filename, path, error, file_hash in expanded
+            )
+            spooled_bytes += sum(os.path.getsize(path) for _, path, _, _ in expanded if path)
+            if spooled_bytes > UPLOAD_MAX_REQUEST_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload is larger than the {UPLOAD_MAX_REQUEST_BYTES // (1024 * 1024)} MB limit"
+                )
+        
+        statuses = [
+            {"filename": filename, "status": "error", "error": error}
+            for filename, _, path, error, _ in entries if not path
+        ]
+        
+        # Known files skip extraction and encoding altogether
+        spooled = [entry for entry in entries if entry[2]]
+        known_files = await run_in_threadpool(
+            _find_resumes_by_hash, db, Resume.file_hash, [entry[4] for entry in spooled]
+        )
+        to_extract, seen_files = [], set()
+        for entry in spooled:
+            filename, _, _, _, file_hash = entry
+            if file_hash in known_files:
+                statuses.append(
+                    {"filename": filename, "status": "duplicate", "duplicate_of": known_files[file_hash]["id"]}
+                )
+            elif file_hash in seen_files:
+                file_repeats.append((filename, file_hash))
+            else:
+                seen_files.add(file_hash)
+                to_extract.append(entry)
+        
+        # Extract all texts in the extraction pool
+        texts = await asyncio.gather(
+            *(_extract_text(path, filename) for filename, _, path, _, _ in to_extract),
+            return_exceptions=True
+        )
+    finally:
+        for _, _, path, _, _ in entries:
+            if path:
+                os.unlink(path)
+    
+    # Outcome of the first copy of every file, for its repeats
+    outcomes = {}
+    extracted = []
+    for (filename, name, _, _, file_hash), text in zip(to_extract, texts):
+        if isinstance(text, Exception):
+            outcomes[file_hash] = {"status": "error", "error": str(text)}
+        elif not text:
+            outcomes[file_hash] = {"status": "error", "error": "No text could be extracted"}
+        else:
+            extracted.append((filename, name or filename.split('.')[0], text, file_hash, content_hash(text)))
+            continue
+        statuses.append({"filename": filename, **outcomes[file_hash]})
+    
+    # Same text in another file: point at the stored or first uploaded copy
+    known_texts = await run_in_threadpool(
+        _find_resumes_by_hash, db, Resume.content_hash, [entry[4] for entry in extracted]
+    )
+    to_save, text_repeats = [], []
+    first_by_text = {}
+    for entry in extracted:
+        filename, _, _, file_hash, text_hash = entry
+        if text_hash in known_texts:
+            outcomes[file_hash] = {"status": "duplicate", "duplicate_of": known_texts[text_hash]["id"]}
+            statuses.append({"filename": filename, **outcomes[file_hash]})
+        elif text_hash in first_by_text:
+            text_repeats.append(entry)
+        else:
+            first_by_text[text_hash] = entry
+            to_save.append(entry)
+    
+    if to_save:
+        # Encode every text in batched forward passes, then insert all rows at once
+        vectors, chunks = await run_encoding(encode_documents, embedder, [entry[2] for entry in to_save])
+        resumes = await run_in_threadpool(
+            _save_resumes,
+            db,
+            [
+                (filename, name, text, vector, chunk, file_hash, text_hash)
+                for (filename, name, text, file_hash, text_hash), vector, chunk in zip(to_save, vectors, chunks)
+            ],
+            requisition_id
+        )
+        for (filename, _, _, file_hash, text_hash), resume in zip(to_save, resumes):
+            if resume.pop("duplicate"):
+                # Stored by a concurrent upload since the checks above
+                statuses.append({"filename": filename, "status": "duplicate", "duplicate_of": resume["id"]})
+            else:
+                statuses.append({"status": "ok", **resume})
+            outcomes[file_hash] = {"status": "duplicate", "duplicate_of": resume["id"]}
+            known_texts[text_hash] = resume
+    
+    for filename, _, _, file_hash, text_hash in text_repeats:
+        outcomes[file_hash] = {"status": "duplicate", "duplicate_of": known_texts[text_hash]["id"]}
+        statuses.append({"filename": filename, **outcomes[file_hash]})
+    statuses.extend({"filename": filename, **outcomes[file_hash]} for filename, file_hash in file_repeats)
+    
+    return {
+        "total": len(statuses),
+        "uploaded": sum(1 for status in statuses if status["status"] == "ok"),
+        "duplicates": sum(1 for status in statuses if status["status"] == "duplicate"),
+        "failed": sum(1 for status in statuses if status["status"] == "error"),
+        "results": statuses
+    }
+
+
+def _encode_query_texts(texts: List[str]) -> np.ndarray:
+    """
+    Encode job or query texts, skipping the model for recently seen texts
+    
+    Args:
+        texts: Texts to encode
+    
+    Returns:
+        L2-normalized document vectors, one row per text
+    """
+    digests = [text_digest(text) for text in texts]
+    vectors = [query_embeddings.get(embedder, digest) for digest in digests]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        encoded = encode_documents(embedder, [texts[i] for i in missing])[0]
+        for i, vector in zip(missing, encoded):
+            vectors[i] = vector
+            query_embeddings.put(embedder, digests[i], vector)
+    return np.vstack(vectors)
+
+
+def _job_embedding_fields(content: str, vector: np.ndarray) -> dict:
+    """JobDescription columns recording the embedding of its text"""
+    return {
+        "content_hash": text_digest(content),
+        "embedding": vector_to_blob(vector),
+        "embedding_model_name": embedder.model_name,
+        "embedding_model_version": embedder.model_version
+    }
+
+
+def _job_embeddings(db: Session, jobs) -> np.ndarray:
+    """
+    Embeddings of job descriptions, read from the job rows when current
+    
+    Jobs without an embedding of the current model (created before
+    embeddings were stored, or under another model) are encoded once and
+    updated, so later rankings skip the model.
+    
+    Args:
+        db: Database session
+        jobs: JobDescription rows (or rows with the same columns)
+    
+    Returns:
+        Job vectors, one row per job
+    """
+    vectors = [None] * len(jobs)
+    stale = []
+    for i, job in enumerate(jobs):
+        if (
+            job.embedding is not None
+            and job.embedding_model_name == embedder.model_name
+            and job.embedding_model_version == embedder.model_version
+            and job.content_hash == text_digest(job.content)
+        ):
+            vectors[i] = blob_to_vector(job.embedding)
+        else:
+            stale.append(i)
+    
+    if stale:
+        encoded = _encode_query_texts([jobs[i].content for i in stale])
+        db.bulk_update_mappings(JobDescription, [
+            {"id": jobs[i].id, **_job_embedding_fields(jobs[i].content, vector)}
+            for i, vector in zip(stale, encoded)
+        ])
+        db.commit()
+        for i, vector in zip(stale, encoded):
+            vectors[i] = vector
+    return np.vstack(vectors)
+
+
+def _save_job(db: Session, job_title: str, company: str, content: str, embedding: np.ndarray) -> JobDescription:
+    """
+    Insert a job description with its embedding
+    """
+    job = JobDescription(
+        job_title=job_title,
+        company=company,
+        content=content,
+        **_job_embedding_fields(content, embedding)
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
 @router.post("/upload-job-description")
 async def upload_job_description(
     job_title: str,
@@ -93,30 +544,26 @@ async def upload_job_description(
             )
         
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-                contents = await file.read()
-                tmp.write(contents)
-                tmp_path = tmp.name
-            
-            job_content = extract_text(tmp_path)
-            os.unlink(tmp_path)
+            tmp_path, _ = await run_in_threadpool(spool_to_temp_file, file.file, file.filename)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
+        try:
+            job_content = await _extract_text(tmp_path, file.filename)
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            os.unlink(tmp_path)
     
     if not job_content:
         raise HTTPException(status_code=400, detail="Job description content is required")
     
     try:
+        # Encoded once here; rankings read the stored vector
+        job_embedding = (await run_encoding(_encode_query_texts, [job_content]))[0]
+        
         # Save to database
-        job = JobDescription(
-            job_title=job_title,
-            company=company,
-            content=job_content
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+        job = await run_in_threadpool(_save_job, db, job_title, company, job_content, job_embedding)
         
         current_job_id = job.id
         
@@ -131,118 +578,907 @@ async def upload_job_description(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _backfill_embeddings(db: Session, task=None, chunk_size: int = None) -> None:
+    """
+    Encode and store embeddings for resumes that have none for the current
+    model (uploaded before embeddings were persisted, or a new model)
+    
+    Args:
+        db: Database session
+        task: Background ranking task to report progress to
+        chunk_size: Commit after this many resumes (EMBEDDING_LOAD_BATCH_SIZE if None)
+    """
+    missing = resumes_missing_embeddings(db, embedder)
+    if task is not None:
+        task.begin_phase("encoding", len(missing))
+    if not missing:
+        return
+    
+    # Resume text is loaded one chunk at a time, never for the whole backlog
+    chunk_size = chunk_size or EMBEDDING_LOAD_BATCH_SIZE
+    for start in range(0, len(missing), chunk_size):
+        batch = missing[start:start + chunk_size]
+        contents = dict(db.query(Resume.id, Resume.content).filter(Resume.id.in_(batch)))
+        chunk = [resume_id for resume_id in batch if resume_id in contents]  # skip deleted meanwhile
+        if chunk:
+            chunk_vectors, chunk_embeddings = encode_documents(embedder, [contents[resume_id] for resume_id in chunk])
+            rows = [
+                save_resume_embedding(db, resume_id, resume_embedding, embedder, chunks)
+                for resume_id, resume_embedding, chunks in zip(chunk, chunk_vectors, chunk_embeddings)
+            ]
+            db.flush()
+            embedding_ids = [row.id for row in rows]
+            with embedding_matrix.locked(embedder):
+                db.commit()
+                embedding_matrix.add(chunk, chunk_vectors, embedder, embedding_ids)
+            vector_index.add(chunk, chunk_vectors, embedder, embedding_ids)
+        if task is not None:
+            task.advance(len(batch))
+
+
+def _score_resumes(db: Session, resume_ids, job_embedding: np.ndarray, pooling: str):
+    """
+    Score stored resume embeddings against a job embedding
+    
+    Args:
+        db: Database session
+        resume_ids: Resumes to score, as IDs or a SELECT of resume IDs (all
+            with a stored embedding if None)
+        job_embedding: L2-normalized job vector
+        pooling: Chunk pooling mode
+    
+    Returns:
+        (IDs of the resumes that have a stored embedding, their scores)
+    """
+    if embedder.chunking and pooling != "mean":
+        stored = load_resume_chunk_embeddings(db, embedder, resume_ids)
+        ids = list(stored)
+        return ids, score_chunked(job_embedding, [stored[i] for i in ids], pooling)
+    
+    if embedding_matrix.ensure_built(db, embedder):
+        if isinstance(resume_ids, Select):
+            resume_ids = [resume_id for (resume_id,) in db.execute(resume_ids)]
+        # Scored straight from the mapped file, no per-row objects
+        ids, scores = embedding_matrix.score(job_embedding, embedder, resume_ids)
+        return ids.tolist(), scores
+    
+    stored = load_resume_embeddings(db, embedder, resume_ids)
+    ids = list(stored)
+    if not ids:
+        return ids, np.empty(0, dtype=np.float32)
+    return ids, score_embeddings(job_embedding, np.vstack([stored[i] for i in ids]))
+
+
+def _embedding_watermark(db: Session) -> int:
+    """Highest stored embedding ID for the current model (0 if none)"""
+    return db.query(func.max(ResumeEmbedding.id)).filter(
+        ResumeEmbedding.model_name == embedder.model_name,
+        ResumeEmbedding.model_version == embedder.model_version
+    ).scalar() or 0
+
+
+def _record_ranking_run(db: Session, job_id: int, top_k: int, pooling: str, watermark: int) -> None:
+    """Remember what a completed ranking covered (the caller commits)"""
+    run = db.query(RankingRun).filter(RankingRun.job_id == job_id).first()
+    if run is None:
+        run = RankingRun(job_id=job_id)
+        db.add(run)
+    run.model_name = embedder.model_name
+    run.model_version = embedder.model_version
+    run.pooling = pooling
+    run.top_k = top_k
+    run.last_embedding_id = watermark
+
+
+def _rank_full(
+    db: Session,
+    job_id: int,
+    job_embedding: np.ndarray,
+    top_k: int,
+    pooling: str,
+    filtered_ids: Select = None
+) -> list:
+    """
+    Score the whole corpus (or only the resumes selected by filtered_ids),
+    replace the stored ranking of the job and return it as (resume ID,
+    score) pairs, best first
+    """
+    watermark = _embedding_watermark(db)
+    
+    # Mean pooling is what the stored document vectors hold; max and top-n
+    # need the per-chunk vectors, which the index does not carry
+    chunk_pooling = embedder.chunking and pooling != "mean"
+    # The shared matrix serves top_k as well: a FAISS copy of it would
+    # duplicate every vector in every worker
+    use_faiss = top_k is not None and not chunk_pooling and not embedding_matrix.enabled
+    
+    if filtered_ids is not None:
+        # Only the rows of the filtered resumes are read and scored
+        resume_ids, scores = _score_resumes(db, filtered_ids, job_embedding, pooling)
+        ranked = [(resume_ids[i], float(scores[i])) for i in top_k_indices(scores, top_k)]
+    elif use_faiss and vector_index.ensure_built(db, embedder):
+        # Retrieve the best candidates from the index. It matched the
+        # database when checked; rows committed since are not in it, so the
+        # ranking covers the index's embeddings, not the database's
+        watermark = vector_index.watermark
+        resume_ids, scores = vector_index.search(job_embedding, top_k)
+        ranked = [(resume_id, float(score)) for resume_id, score in zip(resume_ids.tolist(), scores)]
+    else:
+        # Score the whole corpus with one matrix product
+        resume_ids, scores = _score_resumes(db, None, job_embedding, pooling)
+        ranked = [(resume_ids[i], float(scores[i])) for i in top_k_indices(scores, top_k)]
+    
+    # Delete existing results for this job
+    db.query(RankingResult).filter(RankingResult.job_id == job_id).delete()
+    
+    # Save ranking results to database
+    save_ranking_results(db, job_id, ranked)
+    
+    if filtered_ids is None:
+        _record_ranking_run(db, job_id, top_k, pooling, watermark)
+    else:
+        # New uploads may fall outside the filters: never extend incrementally
+        db.query(RankingRun).filter(RankingRun.job_id == job_id).delete()
+    db.commit()
+    return ranked
+
+
+def _rank_incremental(db: Session, run: RankingRun, job_embedding: np.ndarray) -> list:
+    """
+    Score only embeddings stored since the job's last ranking, merge them
+    into the stored ranking and rewrite only the ranks that moved
+    """
+    new_embeddings = db.query(ResumeEmbedding.id, ResumeEmbedding.resume_id).filter(
+        ResumeEmbedding.model_name == embedder.model_name,
+        ResumeEmbedding.model_version == embedder.model_version,
+        ResumeEmbedding.id > run.last_embedding_id
+    ).all()
+    existing = db.query(
+        RankingResult.id, RankingResult.resume_id, RankingResult.similarity_score, RankingResult.rank
+    ).filter(RankingResult.job_id == run.job_id).all()
+    
+    new_scores = {}
+    if new_embeddings:
+        resume_ids, scores = _score_resumes(
+            db, [resume_id for _, resume_id in new_embeddings], job_embedding, run.pooling
+        )
+        new_scores = dict(zip(resume_ids, (float(score) for score in scores)))
+    
+    merged, moved, dropped = merge_rankings(
+        [(resume_id, score, rank) for _, resume_id, score, rank in existing],
+        new_scores,
+        run.top_k
+    )
+    
+    # Replace rows of re-embedded resumes, drop rows pushed out of the top_k
+    stale = [resume_id for _, resume_id, _, _ in existing if resume_id in new_scores] + dropped
+    if stale:
+        db.query(RankingResult).filter(
+            RankingResult.job_id == run.job_id,
+            RankingResult.resume_id.in_(stale)
+        ).delete(synchronize_session=False)
+    
+    row_ids = {resume_id: row_id for row_id, resume_id, _, _ in existing}
+    db.bulk_update_mappings(
+        RankingResult,
+        [{"id": row_ids[resume_id], "rank": rank} for resume_id, rank in moved.items()]
+    )
+    inserted = [
+        (rank, resume_id, score)
+        for rank, (resume_id, score) in enumerate(merged, 1)
+        if resume_id in new_scores
+    ]
+    save_ranking_results(
+        db,
+        run.job_id,
+        [(resume_id, score) for _, resume_id, score in inserted],
+        ranks=[rank for rank, _, _ in inserted]
+    )
+    
+    if new_embeddings:
+        run.last_embedding_id = max(embedding_id for embedding_id, _ in new_embeddings)
+    db.commit()
+    return merged
+
+
+def _rank_hybrid(
+    db: Session,
+    job: JobDescription,
+    job_embedding: np.ndarray,
+    top_k: int,
+    pooling: str,
+    lexical_weight: float,
+    fusion: str,
+    lexical_candidates: int,
+    resume_ids: Select = None
+):
+    """
+    Combine cosine and BM25 scores, store the ranking of the job and return
+    it as (resume ID, score) pairs, best first, with the component scores
+    
+    With lexical_candidates, only the best BM25 matches are scored
+    semantically (all resumes if none match). resume_ids, a SELECT of
+    resume IDs, restricts both stages to a filtered slice.
+    """
+    lexical_index.ensure_built(db)
+    if resume_ids is not None:
+        # BM25 scores the slice in memory, so its IDs are needed here
+        resume_ids = [resume_id for (resume_id,) in db.execute(resume_ids)]
+    
+    candidate_ids = resume_ids
+    if lexical_candidates:
+        if resume_ids is None:
+            matched, _ = lexical_index.search(job.content, lexical_candidates)
+        else:
+            matched, lexical_scores = lexical_index.score(job.content, resume_ids)
+            matched = matched[top_k_indices(lexical_scores, lexical_candidates)]
+        candidate_ids = matched.tolist() or resume_ids
+    
+    resume_ids, semantic = _score_resumes(db, candidate_ids, job_embedding, pooling)
+    lexical = np.zeros(len(resume_ids), dtype=np.float32)
+    positions = {resume_id: i for i, resume_id in enumerate(resume_ids)}
+    for resume_id, score in zip(*lexical_index.score(job.content, candidate_ids)):
+        if resume_id in positions:
+            lexical[positions[resume_id]] = score
+    
+    if fusion == "rrf":
+        combined = reciprocal_rank_fusion([semantic, np.where(lexical > 0, lexical, -np.inf)])
+    else:
+        combined = fuse_scores(semantic, lexical, lexical_weight)
+    
+    order = top_k_indices(combined, top_k)
+    ranked = [(resume_ids[i], float(combined[i])) for i in order]
+    components = {resume_ids[i]: (float(semantic[i]), float(lexical[i])) for i in order}
+    
+    # Lexical scores shift with every upload, so hybrid rankings are never
+    # extended incrementally
+    db.query(RankingResult).filter(RankingResult.job_id == job.id).delete()
+    db.query(RankingRun).filter(RankingRun.job_id == job.id).delete()
+    save_ranking_results(db, job.id, ranked)
+    db.commit()
+    return ranked, components
+
+
+def _collapse_near_duplicates(db: Session, ranked: list):
+    """
+    Keep the best-scoring resume of each group of near duplicates
+    
+    Returns:
+        (ranking without the collapsed resumes, {kept resume ID: IDs of
+         its near duplicates that were collapsed into it})
+    """
+    near_duplicate_index.ensure_built(db)
+    positions = {resume_id: position for position, (resume_id, _) in enumerate(ranked)}
+    kept, collapsed, covered = [], {}, set()
+    for resume_id, score in ranked:
+        if resume_id in covered:
+            continue
+        kept.append((resume_id, score))
+        # Only duplicates within this ranking, in ranking order
+        duplicates = [
+            other for other in near_duplicate_index.near_duplicates(resume_id)
+            if other in positions and other not in covered
+        ]
+        if not duplicates:
+            continue
+        covered.update(duplicates)
+        collapsed[resume_id] = sorted(duplicates, key=positions.get)
+    return kept, collapsed
+
+
+def _rerank_head(db: Session, job: JobDescription, ranked: list, rerank_k: int, budget_ms: float):
+    """
+    Reorder the best rerank_k of a ranking by cross-encoder score
+    
+    Returns:
+        (reordered ranking, {resume ID: cross-encoder score}, stage stats)
+    """
+    head = [resume_id for resume_id, _ in ranked[:rerank_k]]
+    contents = dict(db.query(Resume.id, Resume.content).filter(Resume.id.in_(head)))
+    head = [resume_id for resume_id in head if resume_id in contents]
+    
+    scores, elapsed_ms = reranker.rerank(job.content, [contents[resume_id] for resume_id in head], budget_ms)
+    rerank_scores = {
+        resume_id: float(score) for resume_id, score in zip(head, scores) if not np.isnan(score)
+    }
+    
+    # Re-scored resumes first; those the budget did not reach keep their order
+    reordered = sorted(
+        (item for item in ranked if item[0] in rerank_scores),
+        key=lambda item: -rerank_scores[item[0]]
+    ) + [item for item in ranked if item[0] not in rerank_scores]
+    stats = {
+        "requested": len(head),
+        "scored": len(rerank_scores),
+        "elapsed_ms": round(elapsed_ms, 1),
+        "budget_ms": budget_ms
+    }
+    return reordered, rerank_scores, stats
+
+
+def _run_ranking_task(task, job_id: int, top_k: int, pooling: str, chunk_size: int) -> None:
+    """
+    Rank all resumes for a job in chunks, storing results as they come
+    
+    Each scored chunk is written to RankingResult without ranks so
+    /results can serve partial results; ranks are assigned at the end.
+    """
+    db = database.SessionLocal()
+    try:
+        job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
+        job_embedding = _job_embeddings(db, [job])[0]
+        
+        _backfill_embeddings(db, task, chunk_size)
+        
+        watermark = _embedding_watermark(db)
+        resume_ids = [resume_id for (resume_id,) in db.query(Resume.id).order_by(Resume.id)]
+        task.begin_phase("scoring", len(resume_ids))
+        db.query(RankingRun).filter(RankingRun.job_id == job_id).delete()
+        db.query(RankingResult).filter(RankingResult.job_id == job_id).delete()
+        bump_results_version(db, [job_id])
+        db.commit()
+        
+        for start in range(0, len(resume_ids), chunk_size):
+            chunk_ids, scores = _score_resumes(
+                db, resume_ids[start:start + chunk_size], job_embedding, pooling
+            )
+            
+            # Rows outside a chunk's own top_k can never reach the overall top_k
+            best = top_k_indices(scores, top_k)
+            save_ranking_results(
+                db, job_id, [(chunk_ids[i], scores[i]) for i in best], ranks=[None] * len(best)
+            )
+            bump_results_version(db, [job_id])
+            db.commit()
+            task.advance(len(resume_ids[start:start + chunk_size]))
+        
+        # Assign final ranks, dropping rows beyond top_k
+        task.phase = "finalizing"
+        ordered = [
+            result_id
+            for (result_id,) in db.query(RankingResult.id).filter(
+                RankingResult.job_id == job_id
+            ).order_by(RankingResult.similarity_score.desc(), RankingResult.resume_id)
+        ]
+        if top_k is not None and len(ordered) > top_k:
+            db.query(RankingResult).filter(
+                RankingResult.id.in_(ordered[top_k:])
+            ).delete(synchronize_session=False)
+            ordered = ordered[:top_k]
+        db.bulk_update_mappings(
+            RankingResult,
+            [{"id": result_id, "rank": rank} for rank, result_id in enumerate(ordered, 1)]
+        )
+        _record_ranking_run(db, job_id, top_k, pooling, watermark)
+        bump_results_version(db, [job_id])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _resume_filters(
+    uploaded_after: datetime = None,
+    uploaded_before: datetime = None,
+    name: str = None,
+    requisition_id: str = None
+) -> list:
+    """
+    SQL conditions selecting the resumes a ranking is restricted to
+    
+    Args:
+        uploaded_after: Uploaded at or after this time
+        uploaded_before: Uploaded before this time
+        name: Case-insensitive pattern for the candidate name or filename;
+            * matches any characters, without it any substring matches
+        requisition_id: Requisition (or tag) given at upload
+    
+    Returns:
+        Conditions on Resume (empty when no filter is set)
+    """
+    def as_utc(value: datetime) -> datetime:
+        # created_at is stored as naive UTC
+        return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+    
+    conditions = []
+    if uploaded_after is not None:
+        conditions.append(Resume.created_at >= as_utc(uploaded_after))
+    if uploaded_before is not None:
+        conditions.append(Resume.created_at < as_utc(uploaded_before))
+    if requisition_id is not None:
+        conditions.append(Resume.requisition_id == requisition_id)
+    if name:
+        escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = escaped.replace("*", "%") if "*" in name else f"%{escaped}%"
+        conditions.append(or_(
+            Resume.candidate_name.ilike(pattern, escape="\\"),
+            Resume.filename.ilike(pattern, escape="\\")
+        ))
+    return conditions
+
+
 @router.post("/rank-resumes")
-async def rank_resumes(job_id: int = None, db: Session = Depends(get_db)):
+def rank_resumes(
+    job_id: int = None,
+    top_k: int = None,
+    pooling: str = CHUNK_POOLING,
+    background: bool = False,
+    chunk_size: int = RANKING_CHUNK_SIZE,
+    incremental: bool = True,
+    lexical_weight: float = HYBRID_LEXICAL_WEIGHT,
+    fusion: str = HYBRID_FUSION,
+    lexical_candidates: int = 0,
+    rerank_k: int = 0,
+    rerank_budget_ms: float = RERANK_BUDGET_MS,
+    collapse_duplicates: bool = False,
+    uploaded_after: datetime = None,
+    uploaded_before: datetime = None,
+    name: str = None,
+    requisition_id: str = None,
+    db: Session = Depends(get_db)
+):
     """
     Rank all resumes against a job description
+    
+    With top_k, only the best top_k resumes are returned and stored; they
+    are retrieved from the vector index when faiss is installed. Without
+    it, RANKING_MAX_STORED_RESULTS (if set) caps the stored ranking. pooling
+    selects how the chunk scores of chunked resumes are combined.
+    
+    If the job was ranked before with the same model, pooling and top_k,
+    only resumes embedded since then are scored and merged into the
+    stored ranking (incremental=false forces a full re-rank).
+    
+    Hybrid ranking mixes in BM25 scores from the lexical index: weighted
+    fusion with lexical_weight > 0, or fusion=rrf for reciprocal rank
+    fusion. lexical_candidates > 0 scores only the best BM25 matches.
+    
+    rerank_k > 0 re-scores the best rerank_k results with a cross-encoder
+    and orders them by its score, stopping when rerank_budget_ms runs out.
+    This stage only reorders the response; stored results keep the
+    first-stage ranking.
+    
+    collapse_duplicates=true keeps only the best-scoring resume of each
+    group of near duplicates in the response (before re-ranking) and lists
+    the others under its duplicates.
+    
+    uploaded_after, uploaded_before, name (candidate name or filename
+    pattern, * as wildcard) and requisition_id restrict the ranking to
+    the matching resumes. The slice is selected in SQL and only its
+    embeddings are scored; such a ranking replaces the stored one and is
+    never extended incrementally.
+    
+    With background=true, a task handle is returned at once and the
+    ranking runs in chunks of chunk_size; poll /ranking-tasks/{task_id}
+    for progress while /results serves the partial results.
     """
     job_id = job_id or current_job_id
     
     if not job_id:
         raise HTTPException(status_code=400, detail="Job description ID is required")
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be a positive integer")
+    if pooling not in POOLING_MODES:
+        raise HTTPException(status_code=400, detail=f"pooling must be one of {', '.join(POOLING_MODES)}")
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be a positive integer")
+    if not 0 <= lexical_weight <= 1:
+        raise HTTPException(status_code=400, detail="lexical_weight must be between 0 and 1")
+    if fusion not in FUSION_MODES:
+        raise HTTPException(status_code=400, detail=f"fusion must be one of {', '.join(FUSION_MODES)}")
+    if lexical_candidates < 0:
+        raise HTTPException(status_code=400, detail="lexical_candidates must not be negative")
+    if rerank_k < 0:
+        raise HTTPException(status_code=400, detail="rerank_k must not be negative")
+    if rerank_budget_ms <= 0:
+        raise HTTPException(status_code=400, detail="rerank_budget_ms must be positive")
+    hybrid = lexical_weight > 0 or fusion == "rrf" or lexical_candidates > 0
+    conditions = _resume_filters(uploaded_after, uploaded_before, name, requisition_id)
+    if (hybrid or rerank_k or collapse_duplicates or conditions) and background:
+        raise HTTPException(
+            status_code=400,
+            detail="Hybrid ranking, re-ranking, collapsing and filters are not available in the background"
+        )
+    if top_k is None and RANKING_MAX_STORED_RESULTS > 0:
+        top_k = RANKING_MAX_STORED_RESULTS
     
     # Get job description
     job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job description not found")
     
-    # Get all resumes
-    resumes = db.query(Resume).all()
-    if not resumes:
+    total_resumes = db.query(func.count(Resume.id)).scalar()
+    if not total_resumes:
         raise HTTPException(status_code=404, detail="No resumes found")
     
-    # Generate embeddings
-    job_embedding = embedder.embed_text(job.content)[0]
+    filtered_ids = filtered_count = None
+    if conditions:
+        # Passed on as a subquery: a large slice would not fit in one IN list
+        filtered_ids = select(Resume.id).where(*conditions)
+        filtered_count = db.query(func.count(Resume.id)).filter(*conditions).scalar()
+        if not filtered_count:
+            raise HTTPException(status_code=404, detail="No resumes match the filters")
     
-    results = []
-    scores = []
+    if background:
+        task = ranking_tasks.submit(job_id, _run_ranking_task, job_id, top_k, pooling, chunk_size)
+        return JSONResponse(
+            status_code=202,
+            content={
+                **task.to_dict(),
+                "status_url": f"/ranking-tasks/{task.id}"
+            }
+        )
     
-    for resume in resumes:
-        resume_embedding = embedder.embed_text(resume.content)[0]
-        similarity_score = float(np.dot(job_embedding, resume_embedding))
-        scores.append(similarity_score)
-        
-        results.append({
-            "resume_id": resume.id,
-            "candidate_name": resume.candidate_name,
-            "filename": resume.filename,
-            "similarity_score": similarity_score
-        })
+    # Job embedding stored at upload (encoded now if missing)
+    job_embedding = _job_embeddings(db, [job])[0]
     
-    # Sort by score descending and add ranks
-    results.sort(key=lambda x: x["similarity_score"], reverse=True)
+    _backfill_embeddings(db)
     
-    # Delete existing results for this job
-    db.query(RankingResult).filter(RankingResult.job_id == job_id).delete()
-    
-    # Save ranking results to database
-    for rank, result in enumerate(results, 1):
-        ranking = RankingResult(
-            resume_id=result["resume_id"],
-            job_id=job_id,
-            similarity_score=result["similarity_score"],
-            rank=rank
+    components = {}
+    run = db.query(RankingRun).filter(RankingRun.job_id == job_id).first()
+    if hybrid:
+        ranked, components = _rank_hybrid(
+            db, job, job_embedding, top_k, pooling, lexical_weight, fusion, lexical_candidates, filtered_ids
         )
-        db.add(ranking)
-        result["rank"] = rank
-    
+    elif (
+        filtered_ids is None
+        and incremental
+        and run is not None
+        and run.model_name == embedder.model_name
+        and run.model_version == embedder.model_version
+        and run.pooling == pooling
+        and run.top_k == top_k
+    ):
+        ranked = _rank_incremental(db, run, job_embedding)
+    else:
+        ranked = _rank_full(db, job_id, job_embedding, top_k, pooling, filtered_ids)
+    # After the results are committed, never before (see bump_results_version)
+    bump_results_version(db, [job_id])
     db.commit()
     
+    collapsed = {}
+    if collapse_duplicates:
+        ranked, collapsed = _collapse_near_duplicates(db, ranked)
+    
+    rerank = None
+    rerank_scores = {}
+    if rerank_k:
+        ranked, rerank_scores, rerank = _rerank_head(db, job, ranked, rerank_k, rerank_budget_ms)
+    
+    # Ordered by score descending; names are looked up in batches, since
+    # a ranking without top_k covers the whole pool
+    ranked_ids = [resume_id for resume_id, _ in ranked]
+    resumes = {}
+    for start in range(0, len(ranked_ids), EMBEDDING_LOAD_BATCH_SIZE):
+        resumes.update(
+            (resume_id, (candidate_name, filename))
+            for resume_id, candidate_name, filename in db.query(
+                Resume.id, Resume.candidate_name, Resume.filename
+            ).filter(Resume.id.in_(ranked_ids[start:start + EMBEDDING_LOAD_BATCH_SIZE]))
+        )
+    results = [
+        {
+            "resume_id": resume_id,
+            "candidate_name": resumes[resume_id][0],
+            "filename": resumes[resume_id][1],
+            "similarity_score": score,
+            "rank": rank,
+            **(
+                {"semantic_score": components[resume_id][0], "lexical_score": components[resume_id][1]}
+                if resume_id in components else {}
+            ),
+            **({"rerank_score": rerank_scores.get(resume_id)} if rerank_k else {}),
+            **({"duplicates": collapsed.get(resume_id, [])} if collapse_duplicates else {})
+        }
+        for rank, (resume_id, score) in enumerate(ranked, 1)
+        if resume_id in resumes
+    ]
+    
     return {
         "job_id": job_id,
         "job_title": job.job_title,
-        "total_resumes": len(results),
+        "total_resumes": total_resumes,
+        **({"filtered_resumes": filtered_count} if filtered_count is not None else {}),
+        **({"rerank": rerank} if rerank_k else {}),
         "rankings": results
     }
 
 
+@router.post("/rank-jobs")
+def rank_jobs(
+    job_ids: List[int] = Query(None),
+    top_k: int = None,
+    jobs_per_resume: int = 3,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank the resume pool against many job descriptions in one pass
+    
+    The job embeddings and the resume embedding matrix are loaded once and
+    scored block by block (RANKING_MATRIX_BLOCK_SIZE resumes per matrix
+    product). Each job's top_k is stored in RankingResult as /rank-resumes
+    would with mean pooling; the reverse view lists the best
+    jobs_per_resume jobs for every resume (0 leaves it out).
+    """
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be a positive integer")
+    if jobs_per_resume < 0:
+        raise HTTPException(status_code=400, detail="jobs_per_resume must not be negative")
+    if top_k is None and RANKING_MAX_STORED_RESULTS > 0:
+        top_k = RANKING_MAX_STORED_RESULTS
+    
+    query = db.query(
+        JobDescription.id, JobDescription.job_title, JobDescription.content, JobDescription.content_hash,
+        JobDescription.embedding, JobDescription.embedding_model_name, JobDescription.embedding_model_version
+    )
+    if job_ids:
+        query = query.filter(JobDescription.id.in_(job_ids))
+    jobs = query.order_by(JobDescription.id).all()
+    if not jobs or (job_ids and len(jobs) < len(set(job_ids))):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    total_resumes = db.query(func.count(Resume.id)).scalar()
+    if not total_resumes:
+        raise HTTPException(status_code=404, detail="No resumes found")
+    
+    _backfill_embeddings(db)
+    watermark = _embedding_watermark(db)
+    
+    job_matrix = _job_embeddings(db, jobs)
+    scales = live = None
+    if embedding_matrix.ensure_built(db, embedder):
+        mapped_ids, resume_matrix, scales = embedding_matrix.view(embedder)
+        live = mapped_ids >= 0
+        resume_ids = mapped_ids.tolist()
+    else:
+        stored = load_resume_embeddings(db, embedder)
+        resume_ids = list(stored)
+        resume_matrix = np.vstack([stored[resume_id] for resume_id in resume_ids])
+        del stored
+    
+    best_resumes, resume_scores, best_jobs, job_scores = score_matrix_top_k(
+        job_matrix, resume_matrix, top_k, jobs_per_resume, scales=scales, live=live
+    )
+    
+    # Replace the stored ranking of every job
+    db.query(RankingResult).filter(
+        RankingResult.job_id.in_([job.id for job in jobs])
+    ).delete(synchronize_session=False)
+    for job, indices, scores in zip(jobs, best_resumes, resume_scores):
+        save_ranking_results(db, job.id, [(resume_ids[i], score) for i, score in zip(indices, scores)])
+        _record_ranking_run(db, job.id, top_k, "mean", watermark)
+    bump_results_version(db, [job.id for job in jobs])
+    db.commit()
+    
+    names = dict(db.query(Resume.id, Resume.candidate_name))
+    return {
+        "total_jobs": len(jobs),
+        "total_resumes": total_resumes,
+        "jobs": [
+            {
+                "job_id": job.id,
+                "job_title": job.job_title,
+                "rankings": [
+                    {
+                        "resume_id": resume_ids[i],
+                        "candidate_name": names.get(resume_ids[i]),
+                        "similarity_score": float(score),
+                        "rank": rank
+                    }
+                    for rank, (i, score) in enumerate(zip(indices, scores), 1)
+                ]
+            }
+            for job, indices, scores in zip(jobs, best_resumes, resume_scores)
+        ],
+        "resumes": [
+            {
+                "resume_id": resume_id,
+                "candidate_name": names.get(resume_id),
+                "best_jobs": [
+                    {
+                        "job_id": jobs[j].id,
+                        "job_title": jobs[j].job_title,
+                        "similarity_score": float(score)
+                    }
+                    for j, score in zip(indices, scores)
+                ]
+            }
+            for resume_id, indices, scores in zip(resume_ids, best_jobs, job_scores)
+            if resume_id >= 0
+        ] if jobs_per_resume else []
+    }
+
+
+@router.get("/near-duplicates")
+def near_duplicates(threshold: float = NEAR_DUPLICATE_THRESHOLD, db: Session = Depends(get_db)):
+    """
+    Groups of near-duplicate resumes (lightly edited copies)
+    
+    Found through the MinHash/LSH index, so only resumes sharing an LSH
+    bucket are compared; threshold is the minimum estimated Jaccard
+    similarity of word shingles.
+    """
+    if not 0 < threshold <= 1:
+        raise HTTPException(status_code=400, detail="threshold must be between 0 and 1")
+    
+    near_duplicate_index.ensure_built(db)
+    clusters = near_duplicate_index.clusters(threshold)
+    resumes = {
+        resume_id: {"id": resume_id, "filename": filename, "candidate_name": candidate_name}
+        for resume_id, filename, candidate_name in db.query(
+            Resume.id, Resume.filename, Resume.candidate_name
+        ).filter(Resume.id.in_([resume_id for cluster in clusters for resume_id in cluster]))
+    }
+    
+    return {
+        "threshold": threshold,
+        "total_clusters": len(clusters),
+        "clusters": [
+            {
+                "size": len(cluster),
+                "resumes": [resumes[resume_id] for resume_id in cluster if resume_id in resumes]
+            }
+            for cluster in clusters
+        ]
+    }
+
+
+@router.get("/ranking-tasks/{task_id}")
+def get_ranking_task(task_id: str):
+    """
+    Progress and ETA of a background ranking task
+    """
+    task = ranking_tasks.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Ranking task not found")
+    return task.to_dict()
+
+
+def _results_etag(job_id: int, created_at, results_version) -> str:
+    """ETag of a job's stored results; the creation time tells a reused job ID apart"""
+    created = int(created_at.timestamp() * 1e6) if created_at else 0
+    return f'"{job_id}-{created}-{results_version or 0}"'
+
+
 @router.get("/results")
-async def get_results(job_id: int = None, db: Session = Depends(get_db)):
+def get_results(
+    job_id: int = None,
+    if_none_match: str = Header(None),
+    db: Session = Depends(get_db)
+):
     """
     Get ranking results for a specific job
+    
+    While a background ranking runs, the results scored so far are
+    returned by descending score with "complete" set to false.
+    
+    Complete results carry an ETag that changes whenever the job is
+    re-ranked; a request with a matching If-None-Match gets an empty 304,
+    and repeated requests are served from an in-memory cache of the
+    rendered body.
     """
     job_id = job_id or current_job_id
     
     if not job_id:
         raise HTTPException(status_code=400, detail="Job description ID is required")
     
-    results = db.query(RankingResult).filter(
+    task = ranking_tasks.active_for_job(job_id)
+    job = db.query(
+        JobDescription.job_title, JobDescription.created_at, JobDescription.results_version
+    ).filter(JobDescription.id == job_id).first()
+    etag = _results_etag(job_id, job.created_at, job.results_version) if job and task is None else None
+    if etag is not None:
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers={"ETag": etag})
+        body = results_cache.get(job_id, etag)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    
+    # Ranked rows first; unranked rows of a running task by score
+    results = db.query(
+        RankingResult.rank, RankingResult.resume_id, RankingResult.similarity_score
+    ).filter(
         RankingResult.job_id == job_id
-    ).order_by(RankingResult.rank).all()
+    ).order_by(
+        RankingResult.rank.is_(None),
+        RankingResult.rank,
+        RankingResult.similarity_score.desc()
+    ).all()
     
     if not results:
         raise HTTPException(status_code=404, detail="No ranking results found")
     
-    job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
-    
-    return {
+    response = JSONResponse(content={
         "job_id": job_id,
         "job_title": job.job_title,
         "total_results": len(results),
+        "complete": task is None,
+        "task_id": task.id if task else None,
         "rankings": [
             {
-                "rank": r.rank,
+                "rank": r.rank if r.rank is not None else position,
                 "resume_id": r.resume_id,
                 "similarity_score": r.similarity_score
             }
-            for r in results
+            for position, r in enumerate(results, 1)
         ]
-    }
+    })
+    if etag is not None:
+        results_cache.put(job_id, etag, response.body)
+        response.headers["ETag"] = etag
+    return response
+
+
+@router.get("/metrics/embedding")
+async def embedding_metrics():
+    """
+    Micro-batching statistics for upload encoding and hit rate of the
+    job/query embedding cache
+    """
+    return {**embedding_batcher.metrics(), "query_cache": query_embeddings.metrics()}
+
+
+@router.get("/metrics/results-cache")
+async def results_cache_metrics():
+    """
+    Size and hit rate of the /results cache
+    """
+    return results_cache.metrics()
+
+
+@router.get("/metrics/extraction")
+async def extraction_metrics():
+    """
+    Extraction timing per backend and the slowest documents seen
+    """
+    return extraction_stats.metrics()
+
+
+def _page(query, id_column, after_id: int, limit: int):
+    """
+    One page of a listing in ID order, using the last ID as the cursor
+    
+    Args:
+        query: Query of the listed columns
+        id_column: Primary key column to order and seek by
+        after_id: Only rows with a larger ID (0 for the first page)
+        limit: Page size (LIST_PAGE_SIZE if None)
+    
+    Returns:
+        (rows of the page, cursor of the next page or None on the last page)
+    """
+    limit = LIST_PAGE_SIZE if limit is None else limit
+    if not 1 <= limit <= LIST_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {LIST_MAX_PAGE_SIZE}")
+    
+    # Seeking on the primary key costs the same on every page, unlike OFFSET
+    rows = query.filter(id_column > after_id).order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
 
 
 @router.get("/resumes")
-async def list_resumes(db: Session = Depends(get_db)):
+def list_resumes(after_id: int = 0, limit: int = None, db: Session = Depends(get_db)):
     """
-    List all uploaded resumes
+    List uploaded resumes, a page at a time
+    
+    Pass the returned next_cursor as after_id to get the following page;
+    it is null on the last page. Resume text is never loaded.
     """
-    resumes = db.query(Resume).all()
+    total = db.query(func.count(Resume.id)).scalar()
+    resumes, next_cursor = _page(
+        db.query(Resume.id, Resume.filename, Resume.candidate_name, Resume.requisition_id, Resume.created_at),
+        Resume.id, after_id, limit
+    )
     return {
-        "total": len(resumes),
+        "total": total,
+        "next_cursor": next_cursor,
         "resumes": [
             {
                 "id": r.id,
                 "filename": r.filename,
                 "candidate_name": r.candidate_name,
+                "requisition_id": r.requisition_id,
                 "created_at": r.created_at
             }
             for r in resumes
@@ -251,13 +1487,21 @@ async def list_resumes(db: Session = Depends(get_db)):
 
 
 @router.get("/jobs")
-async def list_jobs(db: Session = Depends(get_db)):
+def list_jobs(after_id: int = 0, limit: int = None, db: Session = Depends(get_db)):
     """
-    List all job descriptions
+    List job descriptions, a page at a time
+    
+    Pass the returned next_cursor as after_id to get the following page;
+    it is null on the last page. Job text is never loaded.
     """
-    jobs = db.query(JobDescription).all()
+    total = db.query(func.count(JobDescription.id)).scalar()
+    jobs, next_cursor = _page(
+        db.query(JobDescription.id, JobDescription.job_title, JobDescription.company, JobDescription.created_at),
+        JobDescription.id, after_id, limit
+    )
     return {
-        "total": len(jobs),
+        "total": total,
+        "next_cursor": next_cursor,
         "jobs": [
             {
                 "id": j.id,
@@ -271,7 +1515,7 @@ async def list_jobs(db: Session = Depends(get_db)):
 
 
 @router.delete("/resume/{resume_id}")
-async def delete_resume(resume_id: int, db: Session = Depends(get_db)):
+def delete_resume(resume_id: int, db: Session = Depends(get_db)):
     """
     Delete a resume
     """
@@ -279,14 +1523,37 @@ async def delete_resume(resume_id: int, db: Session = Depends(get_db)):
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
+    # Drop its ranking rows; rankings that contained it are redone in full
+    # next time since a top_k ranking may now be missing a candidate
+    affected_jobs = [
+        job_id for (job_id,) in db.query(RankingResult.job_id).filter(
+            RankingResult.resume_id == resume_id
+        ).distinct()
+    ]
+    db.query(RankingResult).filter(RankingResult.resume_id == resume_id).delete()
+    if affected_jobs:
+        db.query(RankingRun).filter(RankingRun.job_id.in_(affected_jobs)).delete(synchronize_session=False)
+        bump_results_version(db, affected_jobs)
+    embedding_ids = [
+        embedding_id for (embedding_id,) in db.query(ResumeEmbedding.id).filter(
+            ResumeEmbedding.resume_id == resume_id,
+            ResumeEmbedding.model_name == embedder.model_name,
+            ResumeEmbedding.model_version == embedder.model_version
+        )
+    ]
     db.delete(resume)
-    db.commit()
+    with embedding_matrix.locked(embedder):
+        db.commit()
+        embedding_matrix.remove([resume_id], embedder, embedding_ids)
+    vector_index.remove([resume_id], embedding_ids)
+    lexical_index.remove([resume_id])
+    near_duplicate_index.remove([resume_id])
     
     return {"message": "Resume deleted successfully"}
 
 
 @router.delete("/job/{job_id}")
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+def delete_job(job_id: int, db: Session = Depends(get_db)):
     """
     Delete a job description
     """
@@ -296,8 +1563,10 @@ async def delete_job(job_id: int, db: Session = Depends(get_db)):
     
     # Also delete associated ranking results
     db.query(RankingResult).filter(RankingResult.job_id == job_id).delete()
+    db.query(RankingRun).filter(RankingRun.job_id == job_id).delete()
     db.delete(job)
     db.commit()
+    results_cache.invalidate(job_id)
     
     return {"message": "Job description deleted successfully"}
  
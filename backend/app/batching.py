@@ -0,0 +1,156 @@
+# backend/app/batching.py
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+# A micro-batch is flushed when it holds this many texts...
+MICROBATCH_MAX_ITEMS = int(os.getenv("EMBED_MICROBATCH_MAX_ITEMS", "32"))
+# ...or when its first text has waited this long
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMBED_MICROBATCH_MAX_WAIT_MS", "10"))
+
+
+class _Pending:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str, future: asyncio.Future):
+        self.text = text
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent encode requests into batched model calls
+
+    Coroutines await submit(text); a background task gathers queued texts
+    for up to max_wait_ms or max_items, runs one encode call in an executor
+    and resolves each caller's future with its own result.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], List[Any]],
+        max_items: int = MICROBATCH_MAX_ITEMS,
+        max_wait_ms: float = MICROBATCH_MAX_WAIT_MS,
+        executor=None
+    ):
+        self.encode = encode
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_sizes = deque(maxlen=1000)
+        self._queue_waits = deque(maxlen=1000)
+        self._batches = 0
+        self._items = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Start the batching task on the running event loop"""
+        if not self.running:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching task and fail any requests still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _fail([self._queue.get_nowait()], RuntimeError("Embedding batcher stopped"))
+
+    async def submit(self, text: str) -> Any:
+        """
+        Encode one text as part of the next micro-batch
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            The encode result for this text
+        """
+        loop = asyncio.get_running_loop()
+        if not self.running:
+            # Not started (e.g. outside the app lifespan): encode on its own
+            return (await loop.run_in_executor(self.executor, self.encode, [text]))[0]
+
+        future = loop.create_future()
+        await self._queue.put(_Pending(text, future))
+        return await future
+
+    def metrics(self) -> dict:
+        """Batch size and queue wait statistics over the recent batches"""
+        sizes = list(self._batch_sizes)
+        waits = sorted(self._queue_waits)
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "items": self._items,
+            "max_items": self.max_items,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batch_size_mean": sum(sizes) / len(sizes) if sizes else 0.0,
+            "batch_size_max": max(sizes) if sizes else 0,
+            "queue_wait_ms_mean": 1000.0 * sum(waits) / len(waits) if waits else 0.0,
+            "queue_wait_ms_p95": 1000.0 * waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "queue_wait_ms_max": 1000.0 * waits[-1] if waits else 0.0,
+        }
+
+    async def _collect(self, batch: List[_Pending]) -> None:
+        """Fill batch in place, so a cancelled worker still knows what it took"""
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_items:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = []
+                await self._collect(batch)
+                started = time.perf_counter()
+                self._batches += 1
+                self._items += len(batch)
+                self._batch_sizes.append(len(batch))
+                self._queue_waits.extend(started - pending.enqueued_at for pending in batch)
+
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, self.encode, [pending.text for pending in batch]
+                    )
+                except Exception as e:
+                    _fail(batch, e)
+                    continue
+
+                for pending, result in zip(batch, results):
+                    if not pending.future.done():
+                        pending.future.set_result(result)
+        finally:
+            # Cancelled by stop() while collecting or encoding: callers of the
+            # current batch would otherwise wait forever
+            _fail(batch, RuntimeError("Embedding batcher stopped"))
+
+
+def _fail(batch: List[_Pending], error: BaseException) -> None:
+    for pending in batch:
+        if not pending.future.done():
+            pending.future.set_exception(error)
@@ -1,17 +1,91 @@
 # backend/app/db.py
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
 from .models import Base
 
 # Database URL - using SQLite by default
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resumes.db")
 
+# SQLite connection settings: WAL lets readers run alongside the writer,
+# NORMAL only syncs at checkpoints (safe with WAL), mmap_size maps that many
+# bytes of the file and busy_timeout waits for a lock instead of failing
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Connection pool of server databases (PostgreSQL, MySQL)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def sqlite_pragmas(in_memory: bool = False) -> dict:
+    """
+    PRAGMA settings applied to every new SQLite connection
+    
+    Args:
+        in_memory: The database lives in memory (no journal or mmap to tune)
+    
+    Returns:
+        Mapping of pragma name to value
+    """
+    pragmas = {"busy_timeout": SQLITE_BUSY_TIMEOUT_MS}
+    if not in_memory:
+        pragmas.update(
+            journal_mode=SQLITE_JOURNAL_MODE,
+            synchronous=SQLITE_SYNCHRONOUS,
+            mmap_size=SQLITE_MMAP_SIZE
+        )
+    return pragmas
+
+
+def make_engine(url: str = DATABASE_URL, pragmas: dict = None, **kwargs):
+    """
+    Create an engine tuned for the database behind the URL
+    
+    SQLite connections get the pragmas on connect; server databases get a
+    bounded connection pool that checks connections before use.
+    
+    Args:
+        url: Database URL
+        pragmas: SQLite pragmas (sqlite_pragmas() if None, {} for none)
+        **kwargs: Passed on to create_engine
+    
+    Returns:
+        SQLAlchemy engine
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        kwargs.setdefault("pool_size", DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", DB_POOL_RECYCLE)
+        kwargs.setdefault("pool_pre_ping", True)
+        return create_engine(url, **kwargs)
+    
+    connect_args = kwargs.pop("connect_args", {})
+    connect_args.setdefault("check_same_thread", False)
+    new_engine = create_engine(url, connect_args=connect_args, **kwargs)
+    if pragmas is None:
+        pragmas = sqlite_pragmas(in_memory=url.database in (None, "", ":memory:"))
+    
+    @event.listens_for(new_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    return new_engine
+
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = make_engine(DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,6 +94,23 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips indexes added to tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _add_missing_columns():
+    """Add nullable columns introduced after a table was created"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
 
 
 def get_db() -> Session:
@@ -0,0 +1,81 @@
+# backend/app/embedding_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+
+# Query texts whose embeddings are kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+
+
+def text_digest(text: str) -> str:
+    """
+    Hash of the exact text an embedding is computed from
+
+    Unlike utils.content_hash nothing is normalized: a cased model embeds
+    texts differing only in case differently.
+
+    Args:
+        text: Query or job description text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """
+    Embeddings of recent query texts, least recently used evicted first
+
+    Entries are keyed by model name, model version and text digest, so a
+    model change never serves vectors of the previous model.
+    """
+
+    def __init__(self, max_entries: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, embedder, digest: str) -> Optional[np.ndarray]:
+        """Cached embedding of a text digest (None if missing)"""
+        key = (embedder.model_name, embedder.model_version, digest)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return vector
+
+    def put(self, embedder, digest: str, vector: np.ndarray) -> None:
+        """Remember the embedding of a text digest"""
+        if self.max_entries <= 0:
+            return
+        key = (embedder.model_name, embedder.model_version, digest)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Entries and hit rate"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
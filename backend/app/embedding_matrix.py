@@ -0,0 +1,388 @@
+# backend/app/embedding_matrix.py
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Optional, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; appends are then only safe within one process
+    fcntl = None
+
+from .models import ResumeEmbedding
+from .store import blob_to_vector, embedding_fingerprint, EMBEDDING_LOAD_BATCH_SIZE
+
+# Directory of the memory-mapped embedding matrix files (empty disables them)
+EMBEDDING_MATRIX_DIR = os.getenv("EMBEDDING_MATRIX_DIR", "./embedding_matrix")
+# Storage type of the mapped vectors: float16, or int8 with one scale per vector
+EMBEDDING_MATRIX_DTYPE = os.getenv("EMBEDDING_MATRIX_DTYPE", "float16")
+EMBEDDING_MATRIX_DTYPES = ("float16", "int8")
+# Rows decoded to float32 per matrix product when scoring
+EMBEDDING_MATRIX_BLOCK_SIZE = int(os.getenv("EMBEDDING_MATRIX_BLOCK_SIZE", "8192"))
+
+
+def quantize(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert float32 vectors to the storage type
+
+    Args:
+        matrix: Vectors, one per row
+        dtype: float16 or int8
+
+    Returns:
+        (stored rows, per-row scales for int8 or None)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1
+    return np.round(matrix / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+
+class EmbeddingMatrix:
+    """
+    Resume embeddings in flat files mapped with np.memmap
+
+    Three files per model: the vectors (float16, or int8 with a float32
+    scale file), and the resume ID of every row. Each uvicorn worker maps
+    the same files, so the vectors sit once in the page cache however many
+    workers there are, and scoring reads the mapped rows directly.
+
+    Appends take an exclusive file lock, write the vector rows first and
+    the IDs last: a row only exists once its ID is written, so readers
+    never see a half-written vector, and rows left by an interrupted
+    append are cut off by the next one. Deleted rows get the ID -1 and
+    are dropped when the files are rebuilt.
+
+    The meta file records the count and sum of the ResumeEmbedding IDs the
+    files hold. Embedding IDs are never reused, so a database that no
+    longer matches the files (restored, replaced, or written without
+    updating them) has another fingerprint and the files are rebuilt.
+    Writers commit and update the files under locked(), so a ranking never
+    sees a commit without its rows.
+    """
+
+    def __init__(self, directory: str = EMBEDDING_MATRIX_DIR, dtype: str = EMBEDDING_MATRIX_DTYPE):
+        if dtype not in EMBEDDING_MATRIX_DTYPES:
+            raise ValueError(f"Unsupported EMBEDDING_MATRIX_DTYPE: {dtype}")
+        self.directory = directory
+        self.dtype = dtype
+        self._maps = {}
+        self._lock = threading.RLock()
+        # flock is per open file: a holder of the exclusive lock must not
+        # wait for the shared one
+        self._exclusive_held = False
+
+    @property
+    def enabled(self) -> bool:
+        """True if a directory is configured"""
+        return bool(self.directory)
+
+    @contextmanager
+    def locked(self, embedder):
+        """
+        Hold the write lock of the embedder's files
+
+        Commit embedding inserts and deletes inside it and update the files
+        before leaving, so rankings see both or neither.
+        """
+        if not self.enabled:
+            yield
+            return
+        with self._exclusive(self._paths(embedder)):
+            yield
+
+    def add(self, ids: Iterable[int], matrix: np.ndarray, embedder, embedding_ids: Iterable[int]) -> None:
+        """
+        Append vectors, replacing earlier rows of the same resumes
+
+        Does nothing until the files exist; ensure_built creates them.
+
+        Args:
+            ids: Resume IDs, one per matrix row
+            matrix: L2-normalized embeddings
+            embedder: Embedder that produced the vectors
+            embedding_ids: IDs of the committed ResumeEmbedding rows
+        """
+        if not self.enabled:
+            return
+        ids = np.asarray(list(ids), dtype=np.int64)
+        rows, scales = quantize(np.asarray(matrix).reshape(len(ids), -1), self.dtype)
+        paths = self._paths(embedder)
+        with self._exclusive(paths):
+            if not os.path.exists(paths["meta"]):
+                return
+            meta = self._read_meta(paths["meta"])
+            committed = os.path.getsize(paths["ids"]) // 8
+            self._mark_deleted(paths, ids, committed)
+            self._append(paths["vectors"], rows, committed)
+            if scales is not None:
+                self._append(paths["scales"], scales, committed)
+            self._append(paths["ids"], ids, committed)
+            # Built from an empty table: the dimension is known only now
+            self._write_meta(
+                paths["meta"], meta["dimension"] or rows.shape[1], self._shift(meta, embedding_ids, 1)
+            )
+
+    def remove(self, ids: Iterable[int], embedder, embedding_ids: Iterable[int]) -> None:
+        """
+        Mark the rows of resumes as deleted
+
+        Args:
+            ids: Resume IDs
+            embedder: Embedder whose files hold the rows
+            embedding_ids: IDs of the deleted ResumeEmbedding rows
+        """
+        if not self.enabled:
+            return
+        paths = self._paths(embedder)
+        with self._exclusive(paths):
+            if os.path.exists(paths["meta"]):
+                meta = self._read_meta(paths["meta"])
+                self._mark_deleted(paths, np.asarray(list(ids), dtype=np.int64), os.path.getsize(paths["ids"]) // 8)
+                self._write_meta(paths["meta"], meta["dimension"], self._shift(meta, embedding_ids, -1))
+
+    def build(self, db, embedder) -> int:
+        """
+        Rewrite the files from the stored embeddings
+
+        The new files are written next to the old ones and moved into place,
+        so workers still scoring from the old mapping are unaffected.
+
+        Args:
+            db: Database session
+            embedder: Embedder whose stored vectors are mapped
+
+        Returns:
+            Number of rows written
+        """
+        with self._exclusive(self._paths(embedder)):
+            return self._build(db, embedder, self._paths(embedder))
+
+    def ensure_built(self, db, embedder) -> bool:
+        """
+        Build the files if they are missing, stale or mostly deleted rows
+
+        Args:
+            db: Database session
+            embedder: Embedder whose stored vectors are mapped
+
+        Returns:
+            True if the matrix can be scored
+        """
+        if not self.enabled:
+            return False
+        if self._is_current(embedder, embedding_fingerprint(db, embedder)):
+            return True
+
+        paths = self._paths(embedder)
+        with self._exclusive(paths):
+            # Writers update the files before releasing the lock, and another
+            # worker may have rebuilt them while we waited: look again
+            if not self._is_current(embedder, embedding_fingerprint(db, embedder)):
+                self._build(db, embedder, paths)
+        return True
+
+    def view(self, embedder) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Current mapping of the files, remapped after appends and rebuilds
+
+        Args:
+            embedder: Embedder whose vectors are mapped
+
+        Returns:
+            (resume ID per row, -1 for deleted rows; stored vectors; int8
+            scales or None), all read-only
+        """
+        paths = self._paths(embedder)
+        try:
+            stat = os.stat(paths["ids"])
+        except FileNotFoundError:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=self.dtype), None
+        key = (stat.st_ino, stat.st_size)
+        with self._lock:
+            cached = self._maps.get(paths["ids"])
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            if self._exclusive_held:
+                mapped = self._map(paths)
+            else:
+                with self._shared(paths):
+                    mapped = self._map(paths)
+            self._maps[paths["ids"]] = ((os.stat(paths["ids"]).st_ino, len(mapped[0]) * 8), mapped)
+            return mapped
+
+    def score(
+        self,
+        query_embedding: np.ndarray,
+        embedder,
+        resume_ids: Optional[Iterable[int]] = None,
+        block_size: int = EMBEDDING_MATRIX_BLOCK_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score the mapped vectors against a query
+
+        Rows are decoded to float32 one block at a time, so scoring never
+        holds more than block_size full-precision rows.
+
+        Args:
+            query_embedding: L2-normalized query vector
+            embedder: Embedder whose vectors are scored
+            resume_ids: Only score these resumes (all if None)
+            block_size: Rows per matrix product
+
+        Returns:
+            (resume IDs, cosine similarities) in row order
+        """
+        ids, vectors, scales = self.view(embedder)
+        keep = ids >= 0
+        if resume_ids is not None:
+            keep &= np.isin(ids, np.fromiter(resume_ids, dtype=np.int64))
+        rows = np.flatnonzero(keep)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), block_size):
+            block = rows[start:start + block_size]
+            scores[start:start + len(block)] = np.asarray(vectors[block], dtype=np.float32) @ query
+            if scales is not None:
+                scores[start:start + len(block)] *= scales[block]
+        return np.asarray(ids[rows]), scores
+
+    @staticmethod
+    def _shift(meta: dict, embedding_ids: Iterable[int], sign: int) -> list:
+        embedding_ids = [int(embedding_id) for embedding_id in embedding_ids]
+        count, total = meta.get("fingerprint") or (0, 0)
+        return [count + sign * len(embedding_ids), total + sign * sum(embedding_ids)]
+
+    def _is_current(self, embedder, fingerprint: list) -> bool:
+        paths = self._paths(embedder)
+        try:
+            meta = self._read_meta(paths["meta"])
+        except FileNotFoundError:
+            return False
+        if meta.get("fingerprint") != fingerprint:
+            return False
+        ids, _, _ = self.view(embedder)
+        return int(np.count_nonzero(ids >= 0)) * 2 >= len(ids)
+
+    def _build(self, db, embedder, paths: dict) -> int:
+        query = db.query(ResumeEmbedding.id, ResumeEmbedding.resume_id, ResumeEmbedding.vector).filter(
+            ResumeEmbedding.model_name == embedder.model_name,
+            ResumeEmbedding.model_version == embedder.model_version
+        ).order_by(ResumeEmbedding.resume_id)
+
+        written = 0
+        id_sum = 0
+        dimension = None
+        temporary = {name: path + ".tmp" for name, path in paths.items() if name != "lock"}
+        with open(temporary["vectors"], "wb") as vector_file, \
+                open(temporary["scales"], "wb") as scale_file, \
+                open(temporary["ids"], "wb") as id_file:
+            batch_ids, batch_vectors = [], []
+            # The fingerprint is taken from the rows written, not a second query
+            for embedding_id, resume_id, blob in query.yield_per(EMBEDDING_LOAD_BATCH_SIZE):
+                id_sum += embedding_id
+                batch_ids.append(resume_id)
+                batch_vectors.append(blob_to_vector(blob))
+                if len(batch_ids) == EMBEDDING_LOAD_BATCH_SIZE:
+                    dimension = self._write_batch(vector_file, scale_file, id_file, batch_ids, batch_vectors)
+                    written += len(batch_ids)
+                    batch_ids, batch_vectors = [], []
+            if batch_ids:
+                dimension = self._write_batch(vector_file, scale_file, id_file, batch_ids, batch_vectors)
+                written += len(batch_ids)
+        self._write_meta(temporary["meta"], dimension or 0, [written, id_sum])
+
+        # IDs go last: readers map the vectors of the IDs they find
+        for name in ("meta", "vectors", "scales", "ids"):
+            os.replace(temporary[name], paths[name])
+        return written
+
+    def _write_meta(self, path: str, dimension: int, fingerprint: list) -> None:
+        # Replaced whole, so lock-free readers never see a partial file
+        with open(path + ".part", "w") as meta_file:
+            json.dump({"dtype": self.dtype, "dimension": dimension, "fingerprint": fingerprint}, meta_file)
+        os.replace(path + ".part", path)
+
+    @staticmethod
+    def _read_meta(path: str) -> dict:
+        with open(path) as meta_file:
+            return json.load(meta_file)
+
+    def _write_batch(self, vector_file, scale_file, id_file, ids, vectors) -> int:
+        rows, scales = quantize(np.vstack(vectors), self.dtype)
+        vector_file.write(rows.tobytes())
+        if scales is not None:
+            scale_file.write(scales.tobytes())
+        id_file.write(np.asarray(ids, dtype=np.int64).tobytes())
+        return rows.shape[1]
+
+    def _map(self, paths: dict) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        meta = self._read_meta(paths["meta"])
+        rows = os.path.getsize(paths["ids"]) // 8
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, meta["dimension"]), dtype=meta["dtype"]), None
+        ids = np.memmap(paths["ids"], dtype=np.int64, mode="r", shape=(rows,))
+        vectors = np.memmap(paths["vectors"], dtype=meta["dtype"], mode="r", shape=(rows, meta["dimension"]))
+        scales = None
+        if meta["dtype"] == "int8":
+            scales = np.memmap(paths["scales"], dtype=np.float32, mode="r", shape=(rows,))
+        return ids, vectors, scales
+
+    @staticmethod
+    def _append(path: str, array: np.ndarray, committed: int) -> None:
+        row_bytes = array.nbytes // len(array) if len(array) else 0
+        with open(path, "r+b") as handle:
+            # Cut off rows of an append that never got as far as its IDs
+            handle.truncate(committed * row_bytes)
+            handle.seek(0, os.SEEK_END)
+            handle.write(np.ascontiguousarray(array).tobytes())
+
+    @staticmethod
+    def _mark_deleted(paths: dict, ids: np.ndarray, committed: int) -> None:
+        if not committed or not len(ids):
+            return
+        stored = np.memmap(paths["ids"], dtype=np.int64, mode="r+", shape=(committed,))
+        stored[np.isin(stored, ids)] = -1
+        stored.flush()
+        del stored
+
+    def _paths(self, embedder) -> dict:
+        key = f"{embedder.model_name.replace('/', '__')}-{embedder.model_version}-{self.dtype}"
+        base = os.path.join(self.directory, key)
+        return {name: f"{base}.{name}" for name in ("meta", "vectors", "scales", "ids", "lock")}
+
+    @contextmanager
+    def _exclusive(self, paths: dict):
+        with self._lock:
+            if self._exclusive_held:
+                # Nested in locked(): this thread already holds the file lock
+                yield
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with self._file_lock(paths, fcntl.LOCK_EX if fcntl else None):
+                self._exclusive_held = True
+                try:
+                    yield
+                finally:
+                    self._exclusive_held = False
+
+    @contextmanager
+    def _shared(self, paths: dict):
+        with self._file_lock(paths, fcntl.LOCK_SH if fcntl else None):
+            yield
+
+    @contextmanager
+    def _file_lock(self, paths: dict, mode):
+        if mode is None or not os.path.isdir(self.directory):
+            yield
+            return
+        with open(paths["lock"], "a") as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,19 +1,159 @@
- # backend/app/embeddings.py
+# backend/app/embeddings.py
+import os
+import threading
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.preprocessing import normalize
 
-MODEL_NAME = "all-MiniLM-L6-v2"  # CPU-friendly and small
+MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")  # CPU-friendly and small
+# Bump when stored vectors must be recomputed (e.g. preprocessing changes)
+MODEL_VERSION = os.getenv("EMBEDDING_MODEL_VERSION", "1")
+# Split long documents into overlapping token windows instead of truncating them
+CHUNKING = os.getenv("EMBED_CHUNKING", "false").lower() in ("1", "true", "yes")
+CHUNK_OVERLAP = int(os.getenv("EMBED_CHUNK_OVERLAP", "32"))
+# Inference backend: torch, onnx, or onnx-int8 (dynamically quantized ONNX)
+BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Where exported ONNX models are kept between restarts
+ONNX_EXPORT_DIR = os.getenv("EMBEDDING_ONNX_DIR", "./onnx_models")
+# Instruction set targeted by int8 quantization: arm64, avx2, avx512 or avx512_vnni
+ONNX_QUANTIZATION = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+
+
+def load_torch_model(model_name):
+    return SentenceTransformer(model_name)
+
+
+def load_onnx_model(model_name):
+    # Needs optimum[onnxruntime]; exports the model to ONNX on first load
+    export_path = os.path.join(ONNX_EXPORT_DIR, model_name.replace("/", "__"))
+    if os.path.isdir(export_path):
+        return SentenceTransformer(export_path, backend="onnx")
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(export_path)
+    return model
+
+
+def load_onnx_int8_model(model_name):
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    export_path = os.path.join(ONNX_EXPORT_DIR, model_name.replace("/", "__"))
+    file_name = os.path.join("onnx", "model_qint8.onnx")
+    if not os.path.exists(os.path.join(export_path, file_name)):
+        model = load_onnx_model(model_name)
+        export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION, export_path, file_suffix="qint8")
+    return SentenceTransformer(export_path, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+BACKENDS = {
+    "torch": load_torch_model,
+    "onnx": load_onnx_model,
+    "onnx-int8": load_onnx_int8_model,
+}
+
+
+def token_windows(n_tokens, window, overlap):
+    """
+    Split a token sequence into overlapping [start, end) windows
+
+    Args:
+        n_tokens: Length of the token sequence
+        window: Maximum tokens per window
+        overlap: Tokens shared by consecutive windows
+
+    Returns:
+        List of (start, end) token offsets covering the whole sequence
+    """
+    if n_tokens <= window:
+        return [(0, n_tokens)]
+    stride = max(1, window - overlap)
+    windows = []
+    for start in range(0, n_tokens, stride):
+        end = min(start + window, n_tokens)
+        windows.append((start, end))
+        if end == n_tokens:
+            break
+    return windows
+
 
 class Embedder:
-    def __init__(self, model_name=MODEL_NAME):
-        self.model = SentenceTransformer(model_name)
-    def embed_text(self, texts):
+    def __init__(self, model_name=MODEL_NAME, model_version=MODEL_VERSION,
+                 chunking=CHUNKING, chunk_overlap=CHUNK_OVERLAP, backend=BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+        self.model_name = model_name
+        # Vectors from another backend or from chunking are not interchangeable
+        # with plain torch vectors, so tag them apart
+        if backend != "torch":
+            model_version = f"{model_version}+{backend}"
+        self.model_version = f"{model_version}+chunked" if chunking else model_version
+        self.chunking = chunking
+        self.chunk_overlap = chunk_overlap
+        self.backend = backend
+        # True once the model has run an encode (see warmup)
+        self.ready = False
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self):
+        # Loaded on first use so importing the API does not load the transformer
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = BACKENDS[self.backend](self.model_name)
+        return self._model
+
+    def warmup(self):
+        # Load the model and run one encode so the first request is not slow
+        self.embed_text("Warm-up: software engineer with Python experience.")
+
+    def embed_text(self, texts, batch_size=32):
         # texts: list[str] or str
         if isinstance(texts, str):
             texts = [texts]
-        emb = self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+        emb = self.model.encode(
+            texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+        )
+        self.ready = True
         # L2-normalize for cosine sim via dot product
         emb = normalize(emb)
         return emb
 
+    def chunk_text(self, text):
+        # Windows of at most max_seq_length word pieces (minus [CLS]/[SEP]),
+        # sliced from the original text via the tokenizer's character offsets
+        window = self.model.max_seq_length - 2
+        encoding = self.model.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+        )
+        offsets = encoding["offset_mapping"]
+        if len(offsets) <= window:
+            return [text]
+        return [
+            text[offsets[start][0]:offsets[end - 1][1]]
+            for start, end in token_windows(len(offsets), window, self.chunk_overlap)
+        ]
+
+
+def parity_check(candidate, reference, texts):
+    """
+    Measure how far a backend's embeddings drift from a reference backend
+
+    Args:
+        candidate: Embedder under test (e.g. onnx-int8)
+        reference: Embedder used as ground truth (e.g. torch)
+        texts: Sample texts to encode with both
+
+    Returns:
+        Dict with mean, max and min cosine similarity and the mean / max
+        cosine drift (1 - similarity) across the samples
+    """
+    similarities = np.sum(candidate.embed_text(texts) * reference.embed_text(texts), axis=1)
+    drift = 1.0 - similarities
+    return {
+        "samples": len(texts),
+        "mean_cosine": float(similarities.mean()),
+        "min_cosine": float(similarities.min()),
+        "mean_drift": float(drift.mean()),
+        "max_drift": float(drift.max()),
+    }
@@ -0,0 +1,91 @@
+# backend/app/executors.py
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from .text_extract import mark_extraction_pool_process, close_extraction_helpers
+
+# Processes parsing PDF/DOCX uploads (0 runs extraction in threads instead)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "2"))
+# Threads running model inference; torch already parallelizes each call
+ENCODE_WORKERS = int(os.getenv("ENCODE_WORKERS", "1"))
+
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_encode_pool: Optional[ThreadPoolExecutor] = None
+_pools_lock = threading.Lock()
+
+
+def get_extract_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for CPU-bound text extraction (None if disabled)"""
+    global _extract_pool
+    if EXTRACT_WORKERS <= 0:
+        return None
+    with _pools_lock:
+        if _extract_pool is None:
+            # spawn: forking a process that holds torch threads is unsafe
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=mark_extraction_pool_process
+            )
+        return _extract_pool
+
+
+def get_encode_pool() -> ThreadPoolExecutor:
+    """Bounded thread pool for model inference"""
+    global _encode_pool
+    with _pools_lock:
+        if _encode_pool is None:
+            _encode_pool = ThreadPoolExecutor(
+                max_workers=max(1, ENCODE_WORKERS), thread_name_prefix="encode"
+            )
+        return _encode_pool
+
+
+async def run_extraction(fn, *args, **kwargs):
+    """
+    Run a text extraction function off the event loop
+
+    Args:
+        fn: Picklable module-level function (e.g. text_extract.extract_text)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The function's result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_extract_pool(), partial(fn, *args, **kwargs))
+
+
+async def run_encoding(fn, *args, **kwargs):
+    """
+    Run a model inference function in the encode thread pool
+
+    Args:
+        fn: Function calling the embedding model
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The function's result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_encode_pool(), partial(fn, *args, **kwargs))
+
+
+def shutdown_pools() -> None:
+    """Shut down the worker pools (they are recreated on next use)"""
+    global _extract_pool, _encode_pool
+    with _pools_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown(cancel_futures=True)
+            _extract_pool = None
+        if _encode_pool is not None:
+            _encode_pool.shutdown(wait=False, cancel_futures=True)
+            _encode_pool = None
+    close_extraction_helpers()
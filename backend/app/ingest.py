@@ -0,0 +1,153 @@
+# backend/app/ingest.py
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import BinaryIO, List, Tuple
+
+from .utils import validate_file_extension
+
+# Upper bound on resumes accepted by one bulk upload (files plus ZIP members)
+BULK_UPLOAD_MAX_FILES = int(os.getenv("BULK_UPLOAD_MAX_FILES", "10000"))
+# Largest accepted file (each loose file or ZIP member)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+# Largest total of spooled files in one bulk upload
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(1024 * 1024 * 1024)))
+# PDFs with more pages are rejected before their text is extracted (0 = no limit)
+UPLOAD_MAX_PAGES = int(os.getenv("UPLOAD_MAX_PAGES", "50"))
+# Bytes copied per read while spooling
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """An upload is over a size or file-count limit"""
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / (1024 * 1024):g} MB"
+
+
+def spool_to_temp_file(source: BinaryIO, filename: str, max_bytes: int = None) -> Tuple[str, str]:
+    """
+    Copy a file-like object to a named temporary file chunk by chunk,
+    hashing it on the way, so the upload is never held in memory whole
+
+    Args:
+        source: Readable binary file object
+        filename: Original filename (its extension is kept)
+        max_bytes: Size limit of the file (UPLOAD_MAX_BYTES if None)
+
+    Returns:
+        (path of the temporary file, hex SHA-256 of its bytes); the caller
+        deletes the file
+
+    Raises:
+        UploadTooLarge: If the file is over max_bytes (nothing is left on disk)
+    """
+    max_bytes = UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp:
+        try:
+            for chunk in iter(lambda: source.read(SPOOL_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"{filename} is larger than the {_megabytes(max_bytes)} limit")
+                digest.update(chunk)
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        return tmp.name, digest.hexdigest()
+
+
+def _too_many_files() -> UploadTooLarge:
+    return UploadTooLarge(f"Too many resumes in one upload (max {BULK_UPLOAD_MAX_FILES})")
+
+
+def expand_upload(
+    source: BinaryIO,
+    filename: str,
+    max_total_bytes: int = None,
+    max_entries: int = None
+) -> List[Tuple[str, str, str, str]]:
+    """
+    Spool an uploaded resume, or every resume inside an uploaded ZIP archive
+
+    Args:
+        source: Uploaded file object
+        filename: Uploaded filename
+        max_total_bytes: Limit on the bytes spooled from a ZIP archive
+            (UPLOAD_MAX_REQUEST_BYTES if None)
+        max_entries: Limit on the returned entries, checked against the ZIP
+            directory before anything is spooled (BULK_UPLOAD_MAX_FILES if None)
+
+    Returns:
+        List of (filename, temp path or "", error, file hash) entries; error
+        is empty for spooled files, path and hash are empty for rejected ones
+
+    Raises:
+        UploadTooLarge: If the spooled files add up to more than
+            max_total_bytes, or there are more than max_entries files (none
+            of them is left on disk)
+    """
+    max_total_bytes = UPLOAD_MAX_REQUEST_BYTES if max_total_bytes is None else max_total_bytes
+    max_entries = BULK_UPLOAD_MAX_FILES if max_entries is None else max_entries
+    if not filename.lower().endswith(".zip"):
+        if max_entries < 1:
+            raise _too_many_files()
+        if not validate_file_extension(filename):
+            return [(filename, "", "Unsupported file format. Only PDF and DOCX are supported.", "")]
+        try:
+            path, file_hash = spool_to_temp_file(source, filename)
+        except UploadTooLarge as e:
+            return [(filename, "", str(e), "")]
+        return [(filename, path, "", file_hash)]
+
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        return [(filename, "", "Invalid ZIP archive", "")]
+
+    entries = []
+    total = 0
+    with archive:
+        # Counted from the central directory, before any member is spooled
+        members = [
+            member for member in archive.infolist()
+            if not member.is_dir()
+            and os.path.basename(member.filename)
+            and not member.filename.startswith("__MACOSX/")
+        ]
+        if len(members) > max_entries:
+            raise _too_many_files()
+        try:
+            for member in members:
+                member_name = os.path.basename(member.filename)
+                if not validate_file_extension(member_name):
+                    error = "Unsupported file format. Only PDF and DOCX are supported."
+                    entries.append((member_name, "", error, ""))
+                    continue
+                # The declared size can lie, so spooling enforces the limit again
+                if member.file_size > UPLOAD_MAX_BYTES:
+                    error = f"{member_name} is larger than the {_megabytes(UPLOAD_MAX_BYTES)} limit"
+                    entries.append((member_name, "", error, ""))
+                    continue
+                try:
+                    with archive.open(member) as member_file:
+                        path, file_hash = spool_to_temp_file(member_file, member_name)
+                except UploadTooLarge as e:
+                    entries.append((member_name, "", str(e), ""))
+                    continue
+                entries.append((member_name, path, "", file_hash))
+                total += os.path.getsize(path)
+                if total > max_total_bytes:
+                    raise UploadTooLarge(f"{filename} unpacks to more than the {_megabytes(max_total_bytes)} limit")
+        except BaseException:
+            # Corrupt members, size limits or cancellation: leave nothing on disk
+            for _, spooled, _, _ in entries:
+                if spooled:
+                    os.unlink(spooled)
+            raise
+    return entries
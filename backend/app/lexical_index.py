@@ -0,0 +1,198 @@
+# backend/app/lexical_index.py
+import os
+import threading
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+import numpy as np
+
+from .models import Resume
+from .store import resume_fingerprint
+from .utils import tokenize
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+
+class LexicalIndex:
+    """
+    In-memory BM25 inverted index over resume text
+
+    Each term maps to the slots of the resumes containing it and their term
+    counts; a query only touches the postings of its own terms. Resumes
+    are added and removed one by one as they are uploaded and deleted.
+    ensure_built compares the count and highest ID of the indexed resumes
+    with the database's, so uploads and deletes of other workers are seen.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._slots = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lengths = np.empty(0, dtype=np.float32)
+        self._terms = {}
+        self._total_length = 0
+        self._next_slot = 0
+        self._max_id = 0
+        self._built = False
+        self._lock = threading.RLock()
+
+    @property
+    def size(self) -> int:
+        """Number of indexed resumes"""
+        return len(self._slots)
+
+    def add(self, resume_id: int, text: str) -> None:
+        """Index (or re-index) one resume"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(resume_id)
+            counts = Counter(tokenize(text))
+            if self._next_slot == len(self._ids):
+                self._grow()
+            slot = self._next_slot
+            self._next_slot += 1
+            self._slots[resume_id] = slot
+            self._max_id = max(self._max_id, resume_id)
+            self._ids[slot] = resume_id
+            self._lengths[slot] = sum(counts.values())
+            self._total_length += int(self._lengths[slot])
+            self._terms[resume_id] = list(counts)
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[slot] = count
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Remove resumes from the index"""
+        with self._lock:
+            for resume_id in ids:
+                self._remove(resume_id)
+
+    def reset(self) -> None:
+        """Drop the index so it is rebuilt on next use"""
+        with self._lock:
+            self._postings = {}
+            self._slots = {}
+            self._ids = np.empty(0, dtype=np.int64)
+            self._lengths = np.empty(0, dtype=np.float32)
+            self._terms = {}
+            self._total_length = 0
+            self._next_slot = 0
+            self._max_id = 0
+            self._built = False
+
+    def ensure_built(self, db) -> None:
+        """
+        Bring the index in line with the stored resumes
+
+        Resumes newer than the highest indexed ID are added; if the count
+        still differs (resumes deleted elsewhere), the index is rebuilt.
+
+        Args:
+            db: Database session
+        """
+        fingerprint = resume_fingerprint(db)
+        with self._lock:
+            if self._built and self._fingerprint() == fingerprint:
+                return
+            if self._built:
+                self._index_rows(db.query(Resume.id, Resume.content).filter(Resume.id > self._max_id))
+                if self._fingerprint() == fingerprint:
+                    return
+            self.reset()
+            self._built = True
+            self._index_rows(db.query(Resume.id, Resume.content))
+
+    def score(self, query: str, resume_ids: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 scores of the resumes matching at least one query term
+
+        Args:
+            query: Query text (tokenized like the resumes)
+            resume_ids: Only score these resumes (all if None)
+
+        Returns:
+            (resume IDs, BM25 scores) of the matching resumes
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n = self.size
+            if not n or not terms:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+            lengths = self._lengths[:self._next_slot]
+            norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / n))
+            scores = np.zeros(self._next_slot, dtype=np.float32)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                counts = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+                idf = np.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                scores[slots] += idf * counts * (self.k1 + 1) / (counts + norm[slots])
+
+            if resume_ids is not None:
+                mask = np.zeros_like(scores, dtype=bool)
+                slots = [self._slots[i] for i in resume_ids if i in self._slots]
+                mask[slots] = True
+                scores[~mask] = 0
+            matched = np.flatnonzero(scores > 0)
+            return self._ids[matched].copy(), scores[matched]
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k resumes with the highest BM25 score
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            (resume IDs, BM25 scores), best first
+        """
+        ids, scores = self.score(query)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return ids[order], scores[order]
+
+    def _fingerprint(self) -> list:
+        return [self.size, self._max_id]
+
+    def _index_rows(self, query) -> None:
+        for resume_id, content in query.yield_per(1000):
+            self.add(resume_id, content)
+
+    def _grow(self) -> None:
+        """Make room for one more slot, compacting if most slots are free"""
+        if self._next_slot - self.size > self.size:
+            remap = {old: new for new, old in enumerate(sorted(self._slots.values()))}
+            self._postings = {
+                term: {remap[slot]: count for slot, count in postings.items()}
+                for term, postings in self._postings.items()
+            }
+            live = np.fromiter(remap.keys(), dtype=np.int64, count=len(remap))
+            self._ids[:len(live)] = self._ids[live]
+            self._lengths[:len(live)] = self._lengths[live]
+            self._slots = {resume_id: remap[slot] for resume_id, slot in self._slots.items()}
+            self._next_slot = len(live)
+        if self._next_slot == len(self._ids):
+            capacity = max(1024, 2 * len(self._ids))
+            self._ids = np.resize(self._ids, capacity)
+            self._lengths = np.resize(self._lengths, capacity)
+
+    def _remove(self, resume_id: int) -> None:
+        slot = self._slots.pop(resume_id, None)
+        if slot is None:
+            return
+        if resume_id == self._max_id:
+            self._max_id = max(self._slots, default=0)
+        for term in self._terms.pop(resume_id):
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._ids[slot] = -1
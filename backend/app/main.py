@@ -1,19 +1,78 @@
 # backend/app/main.py
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from . import db as database
 from .db import init_db
-from .api import router
+from .api import router, embedder, embedding_batcher, ranking_tasks
+from .executors import get_encode_pool, shutdown_pools
+from .request_limits import RequestBodyLimitMiddleware
+from .store import backfill_content_hashes
+
+logger = logging.getLogger(__name__)
+
+# Load and warm up the embedding model in the background at startup
+EMBEDDER_WARMUP = os.getenv("EMBEDDER_WARMUP", "true").lower() in ("1", "true", "yes")
+# Seconds before a failed warm-up is retried, doubling up to 5 minutes
+EMBEDDER_WARMUP_RETRY_SECONDS = float(os.getenv("EMBEDDER_WARMUP_RETRY_SECONDS", "10"))
+EMBEDDER_WARMUP_MAX_RETRY_SECONDS = 300
+
+
+async def warm_up_embedder(retry_seconds: float = EMBEDDER_WARMUP_RETRY_SECONDS):
+    """
+    Load the embedding model off the event loop and run a first encode,
+    retrying until it succeeds (e.g. the model download failed once)
+    """
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(get_encode_pool(), embedder.warmup)
+            logger.info("Embedding model %s is ready", embedder.model_name)
+            return
+        except Exception:
+            logger.exception("Embedding model warm-up failed, retrying in %g s", retry_seconds)
+        await asyncio.sleep(retry_seconds)
+        retry_seconds = min(retry_seconds * 2, EMBEDDER_WARMUP_MAX_RETRY_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize database
+    init_db()
+    db = database.SessionLocal()
+    try:
+        hashed = backfill_content_hashes(db)
+        if hashed:
+            logger.info("Hashed %d resumes stored before deduplication", hashed)
+    finally:
+        db.close()
+    # Model inference runs in the bounded encode pool, never on the event loop
+    embedding_batcher.executor = get_encode_pool()
+    await embedding_batcher.start()
+    # Serve liveness checks right away; readiness flips once the model is hot
+    warmup_task = asyncio.create_task(warm_up_embedder()) if EMBEDDER_WARMUP else None
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await embedding_batcher.stop()
+    ranking_tasks.shutdown()
+    shutdown_pools()
 
-# Initialize database
-init_db()
 
 # Create FastAPI app
 app = FastAPI(
     title="Resume Ranker API",
     description="API for ranking resumes against job descriptions using AI embeddings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Reject oversized uploads before their multipart form is parsed
+app.add_middleware(RequestBodyLimitMiddleware)
+
 # Add CORS middleware to allow frontend communication
 app.add_middleware(
     CORSMiddleware,
@@ -33,19 +92,42 @@ async def root():
     return {
         "message": "Resume Ranker API",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/health/ready"
     }
 
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness check: the process is up and serving requests"""
     return {
         "status": "healthy",
         "service": "Resume Ranker API"
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness check: the embedding model is loaded and warmed up
+
+    With EMBEDDER_WARMUP off the model loads on the first request instead,
+    so there is nothing to wait for and the service is always ready.
+    """
+    if EMBEDDER_WARMUP and not embedder.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "loading", "service": "Resume Ranker API"}
+        )
+    return {
+        "status": "ready",
+        "service": "Resume Ranker API",
+        "model": embedder.model_name,
+        "model_loaded": embedder.ready
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,6 +1,9 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, Integer, String, Float, Text, DateTime, ForeignKey, LargeBinary, UniqueConstraint, Index
+)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 
 Base = declarative_base()
@@ -9,14 +12,53 @@ Base = declarative_base()
 class Resume(Base):
     """Resume document model"""
     __tablename__ = "resumes"
+    # IDs must never be reused: in-memory indexes detect writes of other
+    # workers by the count and highest ID (store.resume_fingerprint)
+    __table_args__ = ({"sqlite_autoincrement": True},)
     
     id = Column(Integer, primary_key=True, index=True)
+    # Not indexed: the name filter of ranking is a case-insensitive
+    # substring match, which no index on these columns can serve
     filename = Column(String(255), nullable=False)
     candidate_name = Column(String(255), nullable=True)
-    content = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Indexed for the metadata filters of ranking
+    requisition_id = Column(String(64), nullable=True, index=True)
+    # Loaded only when accessed; listings and rankings never need the text
+    content = deferred(Column(Text, nullable=False))
+    # SHA-256 of the uploaded file and of the normalized text, for deduplication
+    file_hash = Column(String(64), nullable=True, unique=True, index=True)
+    content_hash = Column(String(64), nullable=True, unique=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    embeddings = relationship(
+        "ResumeEmbedding",
+        back_populates="resume",
+        cascade="all, delete-orphan"
+    )
+
+
+class ResumeEmbedding(Base):
+    """Embedding vector computed once per resume and embedding model"""
+    __tablename__ = "resume_embeddings"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "model_name", "model_version", name="uq_resume_embedding_model"),
+        # IDs must never be reused: incremental re-ranking treats them as a watermark
+        {"sqlite_autoincrement": True},
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    model_name = Column(String(255), nullable=False)
+    model_version = Column(String(64), nullable=False)
+    dimension = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32, L2-normalized
+    chunk_count = Column(Integer, nullable=False, default=1)
+    chunk_vectors = Column(LargeBinary, nullable=True)  # float32 (chunk_count x dimension)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    resume = relationship("Resume", back_populates="embeddings")
+
 
 class JobDescription(Base):
     """Job description model"""
@@ -26,6 +68,13 @@ class JobDescription(Base):
     job_title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
+    # Bumped whenever the job's stored ranking changes; part of the /results ETag
+    results_version = Column(Integer, nullable=True, default=0)
+    # Embedding computed at upload; reused while the text hash and model match
+    content_hash = Column(String(64), nullable=True)
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_model_name = Column(String(255), nullable=True)
+    embedding_model_version = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -33,12 +82,29 @@ class JobDescription(Base):
 class RankingResult(Base):
     """Ranking result model storing similarity scores"""
     __tablename__ = "ranking_results"
+    # Serves the per-job delete before re-ranking and /results ordered by rank
+    __table_args__ = (Index("ix_ranking_results_job_rank", "job_id", "rank"),)
     
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    # Indexed for the delete of a resume's results
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, index=True)
     job_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
     similarity_score = Column(Float, nullable=False)
     rank = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
- 
+
+
+class RankingRun(Base):
+    """Last ranking of a job, so re-ranking only scores newer embeddings"""
+    __tablename__ = "ranking_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False, unique=True, index=True)
+    model_name = Column(String(255), nullable=False)
+    model_version = Column(String(64), nullable=False)
+    pooling = Column(String(16), nullable=False)
+    top_k = Column(Integer, nullable=True)
+    last_embedding_id = Column(Integer, nullable=False)  # highest ResumeEmbedding.id scored
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,230 @@
+# backend/app/near_duplicates.py
+import os
+import threading
+import zlib
+from typing import Iterable, List
+import numpy as np
+
+from .models import Resume
+from .store import resume_fingerprint
+from .utils import tokenize
+
+# Hash functions per MinHash signature
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+# LSH bands the signature is split into (must divide the permutations)
+MINHASH_BANDS = int(os.getenv("MINHASH_BANDS", "16"))
+# Words per shingle
+MINHASH_SHINGLE_SIZE = int(os.getenv("MINHASH_SHINGLE_SIZE", "3"))
+# Estimated Jaccard similarity from which two resumes are near duplicates
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# Prime above 2**32 for the universal hash family a * x + b mod p
+_PRIME = np.uint64(4294967311)
+
+
+def shingle_hashes(text: str, size: int = MINHASH_SHINGLE_SIZE) -> np.ndarray:
+    """
+    32-bit hashes of the distinct word shingles of a text
+
+    Args:
+        text: Document text
+        size: Words per shingle
+
+    Returns:
+        Unique shingle hashes (empty for a text without words)
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHashIndex:
+    """
+    MinHash signatures of resume texts, bucketed by LSH bands
+
+    Two resumes land in a common bucket with high probability once the
+    Jaccard similarity of their shingle sets passes about
+    (1 / bands) ** (1 / rows per band), so near duplicates are found by
+    looking at bucket mates only instead of comparing every pair. Bucket
+    mates are confirmed by the fraction of agreeing signature entries.
+    ensure_built compares the count and highest ID of the indexed resumes
+    with the database's, so uploads and deletes of other workers are seen.
+    """
+
+    def __init__(self, permutations: int = MINHASH_PERMUTATIONS, bands: int = MINHASH_BANDS, seed: int = 1):
+        if permutations % bands:
+            raise ValueError("MINHASH_BANDS must divide MINHASH_PERMUTATIONS")
+        self.permutations = permutations
+        self.bands = bands
+        self.rows = permutations // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=permutations, dtype=np.uint64)
+        self._signatures = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._max_id = 0
+        self._built = False
+        self._lock = threading.RLock()
+
+    @property
+    def size(self) -> int:
+        """Number of indexed resumes"""
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text (None if it has no words)"""
+        hashes = shingle_hashes(text)
+        if not len(hashes):
+            return None
+        # (shingles x permutations); a, b, x < 2**32 keep a * x + b below 2**64
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+    def add(self, resume_id: int, text: str) -> None:
+        """Index (or re-index) one resume"""
+        signature = self.signature(text)
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(resume_id)
+            # Kept without buckets when the text has no words, so the count
+            # still matches the database
+            self._signatures[resume_id] = signature
+            self._max_id = max(self._max_id, resume_id)
+            if signature is None:
+                return
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(resume_id)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Remove resumes from the index"""
+        with self._lock:
+            for resume_id in ids:
+                self._remove(resume_id)
+
+    def reset(self) -> None:
+        """Drop the index so it is rebuilt on next use"""
+        with self._lock:
+            self._signatures = {}
+            self._buckets = [{} for _ in range(self.bands)]
+            self._max_id = 0
+            self._built = False
+
+    def ensure_built(self, db) -> None:
+        """
+        Bring the index in line with the stored resumes
+
+        Resumes newer than the highest indexed ID are added; if the count
+        still differs (resumes deleted elsewhere), the index is rebuilt.
+
+        Args:
+            db: Database session
+        """
+        fingerprint = resume_fingerprint(db)
+        with self._lock:
+            if self._built and self._fingerprint() == fingerprint:
+                return
+            if self._built:
+                self._index_rows(db.query(Resume.id, Resume.content).filter(Resume.id > self._max_id))
+                if self._fingerprint() == fingerprint:
+                    return
+            self.reset()
+            self._built = True
+            self._index_rows(db.query(Resume.id, Resume.content))
+
+    def similarity(self, first: int, second: int) -> float:
+        """Estimated Jaccard similarity of two indexed resumes"""
+        return float(np.mean(self._signatures[first] == self._signatures[second]))
+
+    def near_duplicates(self, resume_id: int, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[int]:
+        """
+        Indexed resumes similar to one resume
+
+        Args:
+            resume_id: Indexed resume
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            IDs of its near duplicates (not including itself)
+        """
+        with self._lock:
+            signature = self._signatures.get(resume_id)
+            if signature is None:
+                return []
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates |= self._buckets[band].get(key, set())
+            candidates.discard(resume_id)
+            return sorted(other for other in candidates if self.similarity(resume_id, other) >= threshold)
+
+    def clusters(self, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[List[int]]:
+        """
+        Groups of near-duplicate resumes
+
+        Only pairs sharing a bucket are compared; confirmed pairs are joined
+        transitively with union-find.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of a pair
+
+        Returns:
+            Clusters of two or more resume IDs, largest first
+        """
+        parent = {}
+
+        def find(resume_id):
+            parent.setdefault(resume_id, resume_id)
+            while parent[resume_id] != resume_id:
+                parent[resume_id] = parent[parent[resume_id]]
+                resume_id = parent[resume_id]
+            return resume_id
+
+        with self._lock:
+            checked = set()
+            for buckets in self._buckets:
+                for members in buckets.values():
+                    if len(members) < 2:
+                        continue
+                    members = sorted(members)
+                    for i, first in enumerate(members):
+                        for second in members[i + 1:]:
+                            if (first, second) in checked:
+                                continue
+                            checked.add((first, second))
+                            if self.similarity(first, second) >= threshold:
+                                root_first, root_second = find(first), find(second)
+                                if root_first != root_second:
+                                    parent[max(root_first, root_second)] = min(root_first, root_second)
+
+        groups = {}
+        for resume_id in sorted(parent):
+            groups.setdefault(find(resume_id), []).append(resume_id)
+        return sorted(groups.values(), key=lambda group: (-len(group), group[0]))
+
+    def _fingerprint(self) -> list:
+        return [self.size, self._max_id]
+
+    def _index_rows(self, query) -> None:
+        for resume_id, content in query.yield_per(1000):
+            self.add(resume_id, content)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _remove(self, resume_id: int) -> None:
+        if resume_id not in self._signatures:
+            return
+        signature = self._signatures.pop(resume_id)
+        if resume_id == self._max_id:
+            self._max_id = max(self._signatures, default=0)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            members = self._buckets[band].get(key)
+            if members is not None:
+                members.discard(resume_id)
+                if not members:
+                    del self._buckets[band][key]
@@ -0,0 +1,337 @@
+# backend/app/ranking.py
+import os
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# Number of texts per model.encode call when encoding in bulk
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+# How chunk scores of a chunked resume are combined: mean, max or top-n
+CHUNK_POOLING = os.getenv("EMBED_CHUNK_POOLING", "mean")
+CHUNK_POOLING_TOP_N = int(os.getenv("EMBED_CHUNK_POOLING_TOP_N", "3"))
+POOLING_MODES = ("mean", "max", "top-n")
+# Ranking rows stored per job when no top_k is requested (0 stores all)
+RANKING_MAX_STORED_RESULTS = int(os.getenv("RANKING_MAX_STORED_RESULTS", "0"))
+# Hybrid ranking: share of the BM25 score in weighted fusion (0 = semantic only)
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "0"))
+# How semantic and BM25 scores are combined: weighted or rrf
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "weighted")
+FUSION_MODES = ("weighted", "rrf")
+# Rank offset of reciprocal rank fusion (damps the weight of top ranks)
+RRF_K = int(os.getenv("RRF_K", "60"))
+# Resumes scored per block by multi-job ranking (bounds the score matrix)
+RANKING_MATRIX_BLOCK_SIZE = int(os.getenv("RANKING_MATRIX_BLOCK_SIZE", "4096"))
+
+
+def encode_in_batches(embedder, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """
+    Encode many texts with one forward pass per batch
+
+    Texts are sorted by length first so each batch holds similarly sized
+    inputs and little compute is wasted on padding.
+
+    Args:
+        embedder: Embedder used to encode the texts
+        texts: Texts to encode
+        batch_size: Number of texts per batch
+
+    Returns:
+        Embedding matrix with one row per text, in input order
+    """
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    order = np.argsort([len(text) for text in texts], kind="stable")
+    batches = []
+    for start in range(0, len(order), batch_size):
+        batch = [texts[i] for i in order[start:start + batch_size]]
+        batches.append(embedder.embed_text(batch, batch_size=batch_size))
+
+    sorted_embeddings = np.vstack(batches)
+    embeddings = np.empty_like(sorted_embeddings)
+    embeddings[order] = sorted_embeddings
+    return embeddings
+
+
+def encode_documents(
+    embedder,
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE
+) -> Tuple[np.ndarray, List[Optional[np.ndarray]]]:
+    """
+    Encode whole documents, chunking them when the embedder is configured to
+
+    All chunks of all documents are encoded together in one batched pass.
+
+    Args:
+        embedder: Embedder used to encode the texts
+        texts: Documents to encode
+        batch_size: Number of texts (or chunks) per batch
+
+    Returns:
+        (document vectors, chunk vectors per document). A document's chunk
+        vectors are None when it fits in a single window.
+    """
+    if not getattr(embedder, "chunking", False):
+        return encode_in_batches(embedder, texts, batch_size), [None] * len(texts)
+
+    chunked = [embedder.chunk_text(text) for text in texts]
+    flat = [chunk for chunks in chunked for chunk in chunks]
+    chunk_embeddings = encode_in_batches(embedder, flat, batch_size)
+
+    boundaries = np.cumsum([len(chunks) for chunks in chunked])[:-1]
+    per_document = np.split(chunk_embeddings, boundaries)
+    document_vectors = np.vstack([mean_pool(chunks) for chunks in per_document])
+    return document_vectors, [chunks if len(chunks) > 1 else None for chunks in per_document]
+
+
+def mean_pool(chunk_embeddings: np.ndarray) -> np.ndarray:
+    """
+    Combine chunk vectors into one L2-normalized document vector
+
+    Args:
+        chunk_embeddings: Chunk vectors, one row per chunk
+
+    Returns:
+        Normalized mean of the chunk vectors
+    """
+    pooled = chunk_embeddings.mean(axis=0)
+    norm = np.linalg.norm(pooled)
+    return pooled / norm if norm > 0 else pooled
+
+
+def score_embeddings(query_embedding: np.ndarray, embedding_matrix: np.ndarray) -> np.ndarray:
+    """
+    Score every row of an embedding matrix against a query
+
+    Args:
+        query_embedding: L2-normalized query vector
+        embedding_matrix: L2-normalized embeddings, one row per document
+
+    Returns:
+        Cosine similarity for each row
+    """
+    return embedding_matrix @ query_embedding
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the highest scores, best first
+
+    Only the top k entries are sorted, using np.argpartition to avoid
+    a full sort of the corpus.
+
+    Args:
+        scores: Score for each document
+        k: Number of indices to return (all if None)
+
+    Returns:
+        Indices into scores ordered by descending score
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def fuse_scores(semantic: np.ndarray, lexical: np.ndarray, weight: float) -> np.ndarray:
+    """
+    Weighted sum of cosine and BM25 scores
+
+    BM25 scores are unbounded, so they are divided by the best one first to
+    share the [0, 1] range of the cosine scores.
+
+    Args:
+        semantic: Cosine similarity per document
+        lexical: BM25 score per document (0 for no match)
+        weight: Share of the lexical score, between 0 and 1
+
+    Returns:
+        Combined score per document
+    """
+    best = lexical.max() if len(lexical) else 0.0
+    normalized = lexical / best if best > 0 else np.zeros_like(semantic)
+    return (1.0 - weight) * semantic + weight * normalized
+
+
+def reciprocal_rank_fusion(score_lists: Sequence[np.ndarray], k: int = RRF_K) -> np.ndarray:
+    """
+    Combine rankings by summing 1 / (k + rank) over them
+
+    Args:
+        score_lists: Score per document for each ranking; -inf leaves a
+            document out of that ranking
+        k: Rank offset
+
+    Returns:
+        Fused score per document
+    """
+    fused = np.zeros(len(score_lists[0]), dtype=np.float64)
+    for scores in score_lists:
+        ranks = np.empty(len(scores), dtype=np.float64)
+        ranks[np.argsort(-scores, kind="stable")] = np.arange(1, len(scores) + 1)
+        fused += np.where(np.isfinite(scores), 1.0 / (k + ranks), 0.0)
+    return fused
+
+
+def _sorted_rows(indices: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort each row by descending score, ties by ascending index"""
+    order = np.lexsort((indices, -scores))
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def score_matrix_top_k(
+    query_matrix: np.ndarray,
+    embedding_matrix: np.ndarray,
+    k: Optional[int] = None,
+    reverse_k: int = 0,
+    block_size: int = RANKING_MATRIX_BLOCK_SIZE,
+    scales: Optional[np.ndarray] = None,
+    live: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top documents for each query and top queries for each document
+
+    Documents are scored in blocks of block_size rows, one matrix product
+    per block, so at most (queries x block_size) scores are held at a time;
+    each query's running top k is merged with every block. The embedding
+    matrix may be a float16 or int8 memmap: only the current block is
+    converted to float32.
+
+    Args:
+        query_matrix: L2-normalized queries, one row per query
+        embedding_matrix: L2-normalized embeddings, one row per document
+        k: Documents kept per query (all if None)
+        reverse_k: Queries kept per document (0 skips the reverse view)
+        block_size: Documents scored per matrix product
+        scales: Per-document factor of int8 embeddings (None for float)
+        live: Documents that may be returned (all if None); the reverse
+            view of the others is meaningless
+
+    Returns:
+        (document indices and scores per query, each (queries x k) and best
+         first; query indices and scores per document, each
+         (documents x reverse_k) and best first)
+    """
+    n_queries, n_documents = len(query_matrix), len(embedding_matrix)
+    n_live = n_documents if live is None else int(np.count_nonzero(live))
+    k = n_live if k is None else min(k, n_live)
+    reverse_k = min(reverse_k, n_queries)
+
+    best_indices = np.empty((n_queries, 0), dtype=np.int64)
+    best_scores = np.empty((n_queries, 0), dtype=np.float32)
+    reverse_indices = np.empty((n_documents, reverse_k), dtype=np.int64)
+    reverse_scores = np.empty((n_documents, reverse_k), dtype=np.float32)
+
+    for start in range(0, n_documents, block_size):
+        block = query_matrix @ np.asarray(embedding_matrix[start:start + block_size], dtype=np.float32).T
+        width = block.shape[1]
+        if scales is not None:
+            block *= scales[start:start + width]
+        if live is not None:
+            block[:, ~live[start:start + width]] = -np.inf
+
+        if reverse_k:
+            rows = np.argpartition(-block.T, reverse_k - 1, axis=1)[:, :reverse_k]
+            reverse_indices[start:start + width], reverse_scores[start:start + width] = _sorted_rows(
+                rows, np.take_along_axis(block.T, rows, axis=1)
+            )
+
+        candidates = np.hstack([best_indices, np.broadcast_to(np.arange(start, start + width), block.shape)])
+        scores = np.hstack([best_scores, block])
+        if candidates.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k else candidates[:, :0]
+            candidates = np.take_along_axis(candidates, keep, axis=1)
+            scores = np.take_along_axis(scores, keep, axis=1)
+        best_indices, best_scores = candidates, scores
+
+    best_indices, best_scores = _sorted_rows(best_indices, best_scores)
+    return best_indices, best_scores, reverse_indices, reverse_scores
+
+
+def score_chunked(
+    query_embedding: np.ndarray,
+    chunk_matrices: Sequence[np.ndarray],
+    pooling: str = CHUNK_POOLING,
+    top_n: int = CHUNK_POOLING_TOP_N
+) -> np.ndarray:
+    """
+    Score chunked documents by pooling their per-chunk similarities
+
+    Args:
+        query_embedding: L2-normalized query vector
+        chunk_matrices: Chunk vectors of each document
+        pooling: "max" (best chunk), "top-n" (mean of the top_n best chunks)
+            or "mean" (similarity to the mean_pool vector, the document
+            vector encode_documents stores, so not the mean of chunk scores)
+        top_n: Number of chunks averaged by top-n pooling
+
+    Returns:
+        One score per document
+    """
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unsupported pooling: {pooling}")
+    if not chunk_matrices:
+        return np.empty(0, dtype=np.float32)
+
+    counts = np.array([len(chunks) for chunks in chunk_matrices])
+    chunk_scores = score_embeddings(query_embedding, np.vstack(chunk_matrices))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    if pooling == "max":
+        return np.maximum.reduceat(chunk_scores, starts)
+    if pooling == "mean":
+        # q . mean(chunks) / |mean(chunks)|, without building the pooled vectors
+        sums = np.add.reduceat(np.vstack(chunk_matrices), starts, axis=0)
+        norms = np.linalg.norm(sums, axis=1)
+        return np.add.reduceat(chunk_scores, starts) / np.where(norms > 0, norms, 1)
+
+    # top-n: pad every document to the same chunk count and sort each row
+    padded = np.full((len(counts), counts.max()), -np.inf, dtype=chunk_scores.dtype)
+    columns = np.arange(len(chunk_scores)) - np.repeat(starts, counts)
+    padded[np.repeat(np.arange(len(counts)), counts), columns] = chunk_scores
+    best = -np.sort(-padded, axis=1)[:, :top_n]
+    taken = np.minimum(counts, top_n)
+    return np.where(np.isfinite(best), best, 0).sum(axis=1) / taken
+
+
+def merge_rankings(
+    existing: Sequence[Tuple[int, float, int]],
+    new_scores: dict,
+    top_k: Optional[int] = None
+) -> Tuple[List[Tuple[int, float]], dict, List[int]]:
+    """
+    Merge newly scored documents into an existing ranking
+
+    Args:
+        existing: (document ID, score, rank) rows of the stored ranking;
+            rows of documents in new_scores are treated as replaced
+        new_scores: Score of each new or changed document
+        top_k: Keep only the best top_k documents (all if None)
+
+    Returns:
+        (merged [(document ID, score)] best first,
+         {document ID: new rank} for existing rows whose rank changed,
+         existing document IDs pushed out of the top_k)
+    """
+    kept = [(doc_id, score, rank) for doc_id, score, rank in existing if doc_id not in new_scores]
+    merged = sorted(
+        [(doc_id, score) for doc_id, score, _ in kept] + list(new_scores.items()),
+        key=lambda item: (-item[1], item[0])
+    )
+
+    dropped = []
+    if top_k is not None and len(merged) > top_k:
+        dropped = [doc_id for doc_id, _ in merged[top_k:] if doc_id not in new_scores]
+        merged = merged[:top_k]
+
+    new_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(merged, 1)}
+    moved = {
+        doc_id: new_ranks[doc_id]
+        for doc_id, _, rank in kept
+        if doc_id in new_ranks and new_ranks[doc_id] != rank
+    }
+    return merged, moved, dropped
@@ -0,0 +1,62 @@
+# backend/app/request_limits.py
+from typing import Callable, Dict
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+from . import ingest
+
+# Allowance for multipart boundaries, part headers and form fields on top of the file limits
+UPLOAD_FORM_OVERHEAD_BYTES = 1024 * 1024
+
+
+def upload_body_limits() -> Dict[str, int]:
+    """File bytes allowed in the body of each upload endpoint (read per request)"""
+    return {
+        "/upload-resume": ingest.UPLOAD_MAX_BYTES,
+        "/upload-job-description": ingest.UPLOAD_MAX_BYTES,
+        "/upload-resumes": ingest.UPLOAD_MAX_REQUEST_BYTES,
+    }
+
+
+class RequestBodyLimitMiddleware:
+    """
+    Reject upload requests whose body is over the limit of their path with
+    413, before Starlette parses the multipart form and spools its parts
+
+    A declared Content-Length is checked before any of the body is read;
+    otherwise (chunked requests, or a Content-Length that lies) the received
+    bytes are counted and the request fails as soon as they pass the limit.
+    The per-file limits are enforced again while the endpoints spool.
+    """
+
+    def __init__(self, app, limits: Callable[[], Dict[str, int]] = upload_body_limits):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits().get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload is larger than the {limit / (1024 * 1024):g} MB limit"
+        limit += UPLOAD_FORM_OVERHEAD_BYTES
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Re-raised by FastAPI's body parsing, rendered by the exception middleware
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, counting_receive, send)
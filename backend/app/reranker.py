@@ -0,0 +1,64 @@
+# backend/app/reranker.py
+import os
+import threading
+import time
+import numpy as np
+from sentence_transformers import CrossEncoder
+
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")  # small, CPU-friendly
+# Query/resume pairs per cross-encoder forward pass
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+# Default time the re-ranking stage may take per request
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "500"))
+
+
+class CrossEncoderReranker:
+    """
+    Second-stage scorer reading job and resume text together
+
+    Much slower than comparing stored embeddings, so it only re-scores the
+    best candidates of the first stage, batch by batch, and stops once the
+    next batch would not fit in the time budget.
+    """
+
+    def __init__(self, model_name=RERANK_MODEL, batch_size=RERANK_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self):
+        # Loaded on first use; most deployments never enable re-ranking
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def rerank(self, query, documents, budget_ms=None):
+        """
+        Score (query, document) pairs within a time budget
+
+        Args:
+            query: Job description text
+            documents: Candidate resume texts, best first-stage match first
+            budget_ms: Time allowed for scoring (unbounded if None); the
+                first batch always runs
+
+        Returns:
+            (scores with NaN for documents left unscored, elapsed milliseconds)
+        """
+        model = self.model  # load outside the budget
+        scores = np.full(len(documents), np.nan, dtype=np.float32)
+        started = time.perf_counter()
+        batch_seconds = 0.0
+        for start in range(0, len(documents), self.batch_size):
+            elapsed = time.perf_counter() - started
+            if start and budget_ms is not None and (elapsed + batch_seconds) * 1000 > budget_ms:
+                break
+            batch_started = time.perf_counter()
+            pairs = [(query, document) for document in documents[start:start + self.batch_size]]
+            scores[start:start + len(pairs)] = model.predict(pairs, batch_size=self.batch_size)
+            batch_seconds = time.perf_counter() - batch_started
+        return scores, (time.perf_counter() - started) * 1000
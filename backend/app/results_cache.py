@@ -0,0 +1,78 @@
+# backend/app/results_cache.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Total size of the rendered /results bodies kept in memory
+RESULTS_CACHE_MAX_BYTES = int(os.getenv("RESULTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class ResultsCache:
+    """
+    Rendered /results bodies, one per job, evicted least recently used first
+
+    Each body is stored with the ETag of the results version it was rendered
+    from; a lookup with any other ETag misses, so a re-ranked job is never
+    served from a stale body. The total size of the bodies stays under
+    max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = RESULTS_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, job_id: int, etag: str) -> Optional[bytes]:
+        """Cached body of the job if it was rendered for this ETag"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None or entry[0] != etag:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(job_id)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, job_id: int, etag: str, body: bytes) -> None:
+        """Store the body of a job, replacing its older version"""
+        with self._lock:
+            self._pop(job_id)
+            if len(body) > self.max_bytes:
+                return
+            self._entries[job_id] = (etag, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, job_id: int) -> None:
+        """Drop the body of a job"""
+        with self._lock:
+            self._pop(job_id)
+
+    def clear(self) -> None:
+        """Drop every body"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict:
+        """Entries, memory use and hit rate"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _pop(self, job_id: int) -> None:
+        entry = self._entries.pop(job_id, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
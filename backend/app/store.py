@@ -0,0 +1,305 @@
+# backend/app/store.py
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .models import Resume, ResumeEmbedding, JobDescription, RankingResult
+from .utils import content_hash
+
+# Embedding rows fetched per round trip when loading the corpus
+EMBEDDING_LOAD_BATCH_SIZE = int(os.getenv("EMBEDDING_LOAD_BATCH_SIZE", "1000"))
+# Content hash of old resumes whose text duplicates another stored resume
+# (never a hex digest, so no upload matches it)
+DUPLICATE_CONTENT_MARKER = "duplicate:"
+
+
+def vector_to_blob(vector: np.ndarray) -> bytes:
+    """
+    Serialize an embedding vector for storage
+
+    Args:
+        vector: 1-D embedding vector
+
+    Returns:
+        Raw float32 bytes
+    """
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def blob_to_vector(blob: bytes) -> np.ndarray:
+    """
+    Deserialize an embedding vector produced by vector_to_blob
+
+    Args:
+        blob: Raw float32 bytes
+
+    Returns:
+        1-D float32 embedding vector
+    """
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def save_resume_embedding(
+    db: Session,
+    resume_id: int,
+    vector: np.ndarray,
+    embedder,
+    chunk_vectors: Optional[np.ndarray] = None
+) -> ResumeEmbedding:
+    """
+    Add the embedding of a resume to the session (the caller commits)
+
+    Args:
+        db: Database session
+        resume_id: ID of the embedded resume
+        vector: L2-normalized embedding vector
+        embedder: Embedder that produced the vector
+        chunk_vectors: Per-chunk vectors of a chunked resume, if any
+
+    Returns:
+        The pending ResumeEmbedding row
+    """
+    row = ResumeEmbedding(
+        resume_id=resume_id,
+        model_name=embedder.model_name,
+        model_version=embedder.model_version,
+        dimension=int(np.asarray(vector).shape[-1]),
+        vector=vector_to_blob(vector),
+        chunk_count=len(chunk_vectors) if chunk_vectors is not None else 1,
+        chunk_vectors=vector_to_blob(chunk_vectors) if chunk_vectors is not None else None
+    )
+    db.add(row)
+    return row
+
+
+def _restricted_rows(query, resume_ids):
+    """
+    Rows of an embedding query, restricted to some resumes
+
+    A SELECT of resume IDs becomes a subquery; an ID list is sent in
+    batches, since one IN list over a large slice would exceed the
+    database's limit on bound parameters (32766 for SQLite).
+    """
+    if resume_ids is None:
+        yield from query.yield_per(EMBEDDING_LOAD_BATCH_SIZE)
+    elif isinstance(resume_ids, Select):
+        yield from query.filter(ResumeEmbedding.resume_id.in_(resume_ids)).yield_per(EMBEDDING_LOAD_BATCH_SIZE)
+    else:
+        resume_ids = list(resume_ids)
+        for start in range(0, len(resume_ids), EMBEDDING_LOAD_BATCH_SIZE):
+            batch = resume_ids[start:start + EMBEDDING_LOAD_BATCH_SIZE]
+            yield from query.filter(ResumeEmbedding.resume_id.in_(batch))
+
+
+def load_resume_embeddings(
+    db: Session,
+    embedder,
+    resume_ids: Optional[Union[Iterable[int], Select]] = None
+) -> Dict[int, np.ndarray]:
+    """
+    Load stored embeddings produced by the embedder's model
+
+    Args:
+        db: Database session
+        embedder: Embedder whose model name and version must match
+        resume_ids: Restrict to these resumes, given as IDs or as a SELECT
+            of resume IDs (all resumes if None)
+
+    Returns:
+        Mapping of resume ID to embedding vector
+    """
+    query = db.query(ResumeEmbedding.resume_id, ResumeEmbedding.vector).filter(
+        ResumeEmbedding.model_name == embedder.model_name,
+        ResumeEmbedding.model_version == embedder.model_version
+    )
+    return {resume_id: blob_to_vector(blob) for resume_id, blob in _restricted_rows(query, resume_ids)}
+
+
+def load_resume_chunk_embeddings(
+    db: Session,
+    embedder,
+    resume_ids: Optional[Union[Iterable[int], Select]] = None
+) -> Dict[int, np.ndarray]:
+    """
+    Load stored chunk vectors, one matrix per resume
+
+    Resumes that were not chunked get their document vector as a
+    single-row matrix.
+
+    Args:
+        db: Database session
+        embedder: Embedder whose model name and version must match
+        resume_ids: Restrict to these resumes, given as IDs or as a SELECT
+            of resume IDs (all resumes if None)
+
+    Returns:
+        Mapping of resume ID to (chunk_count x dimension) matrix
+    """
+    query = db.query(
+        ResumeEmbedding.resume_id,
+        ResumeEmbedding.dimension,
+        ResumeEmbedding.vector,
+        ResumeEmbedding.chunk_vectors
+    ).filter(
+        ResumeEmbedding.model_name == embedder.model_name,
+        ResumeEmbedding.model_version == embedder.model_version
+    )
+    return {
+        resume_id: blob_to_vector(chunk_blob if chunk_blob is not None else blob).reshape(-1, dimension)
+        for resume_id, dimension, blob, chunk_blob in _restricted_rows(query, resume_ids)
+    }
+
+
+def embedding_fingerprint(db: Session, embedder) -> List[int]:
+    """
+    Count and sum of the stored embedding IDs of the embedder's model
+
+    Embedding IDs are never reused, so any insert or delete changes the
+    fingerprint; in-memory and on-disk copies of the embeddings compare it
+    with their own to notice writes they did not see.
+
+    Args:
+        db: Database session
+        embedder: Embedder whose model name and version must match
+
+    Returns:
+        [count, sum]
+    """
+    count, total = db.query(func.count(ResumeEmbedding.id), func.sum(ResumeEmbedding.id)).filter(
+        ResumeEmbedding.model_name == embedder.model_name,
+        ResumeEmbedding.model_version == embedder.model_version
+    ).one()
+    return [int(count), int(total or 0)]
+
+
+def resume_fingerprint(db: Session) -> List[int]:
+    """
+    Count and highest ID of the stored resumes
+
+    In-memory indexes over resume text compare it with their own to notice
+    uploads and deletes made by other workers. Resume IDs are not reused
+    (see models.Resume), so a delete followed by an upload still changes it.
+
+    Args:
+        db: Database session
+
+    Returns:
+        [count, highest ID (0 if none)]
+    """
+    count, highest = db.query(func.count(Resume.id), func.max(Resume.id)).one()
+    return [int(count), int(highest or 0)]
+
+
+def resumes_missing_embeddings(db: Session, embedder) -> List[int]:
+    """
+    Find resumes with no stored embedding for the embedder's model
+
+    Args:
+        db: Database session
+        embedder: Embedder whose model name and version must match
+
+    Returns:
+        IDs of the resumes that still need to be encoded
+    """
+    query = db.query(Resume.id).outerjoin(
+        ResumeEmbedding,
+        and_(
+            ResumeEmbedding.resume_id == Resume.id,
+            ResumeEmbedding.model_name == embedder.model_name,
+            ResumeEmbedding.model_version == embedder.model_version
+        )
+    ).filter(ResumeEmbedding.id.is_(None)).order_by(Resume.id)
+    return [resume_id for (resume_id,) in query]
+
+
+def backfill_content_hashes(db: Session, batch_size: int = 1000) -> int:
+    """
+    Hash the text of resumes stored before content hashes were recorded
+
+    A resume whose text matches an already hashed one cannot take the same
+    hash, since content hashes are unique; it gets DUPLICATE_CONTENT_MARKER
+    and its ID instead, so no row is read again on the next startup.
+
+    Args:
+        db: Database session
+        batch_size: Resumes hashed per transaction
+
+    Returns:
+        Number of resumes hashed
+    """
+    hashed = 0
+    while True:
+        rows = db.query(Resume.id, Resume.content).filter(
+            Resume.content_hash.is_(None)
+        ).order_by(Resume.id).limit(batch_size).all()
+        if not rows:
+            return hashed
+        hashes = {resume_id: content_hash(content) for resume_id, content in rows}
+        known = {
+            resume_hash
+            for (resume_hash,) in db.query(Resume.content_hash).filter(
+                Resume.content_hash.in_(set(hashes.values()))
+            )
+        }
+        updates = []
+        for resume_id, resume_hash in hashes.items():
+            if resume_hash in known:
+                resume_hash = f"{DUPLICATE_CONTENT_MARKER}{resume_id}"
+            else:
+                known.add(resume_hash)
+                hashed += 1
+            updates.append({"id": resume_id, "content_hash": resume_hash})
+        db.bulk_update_mappings(Resume, updates)
+        db.commit()
+
+
+def save_ranking_results(
+    db: Session,
+    job_id: int,
+    ranked: Sequence[Tuple[int, float]],
+    ranks: Optional[Sequence[Optional[int]]] = None
+) -> None:
+    """
+    Insert ranking rows with one executemany instead of an ORM object per row
+
+    Args:
+        db: Database session (the caller commits)
+        job_id: Job description the rows belong to
+        ranked: (resume ID, score) pairs
+        ranks: Rank of each pair (1, 2, ... in order if None; None entries
+            leave the rank unset)
+    """
+    if not ranked:
+        return
+    if ranks is None:
+        ranks = range(1, len(ranked) + 1)
+    db.execute(
+        insert(RankingResult),
+        [
+            {"resume_id": resume_id, "job_id": job_id, "similarity_score": float(score), "rank": rank}
+            for (resume_id, score), rank in zip(ranked, ranks)
+        ]
+    )
+
+
+def bump_results_version(db: Session, job_ids: Iterable[int]) -> None:
+    """
+    Mark the stored rankings of jobs as changed (the caller commits)
+
+    Call it in the transaction that writes the results, or after it: a
+    version committed before its results would let /results cache the old
+    rows under the new version.
+
+    Args:
+        db: Database session
+        job_ids: Jobs whose RankingResult rows were written or deleted
+    """
+    job_ids = list(job_ids)
+    if job_ids:
+        db.query(JobDescription).filter(JobDescription.id.in_(job_ids)).update(
+            {JobDescription.results_version: func.coalesce(JobDescription.results_version, 0) + 1},
+            synchronize_session=False
+        )
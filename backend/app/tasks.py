@@ -0,0 +1,140 @@
+# backend/app/tasks.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Resumes encoded or scored per step of a background ranking
+RANKING_CHUNK_SIZE = int(os.getenv("RANKING_CHUNK_SIZE", "2000"))
+# Background rankings running at the same time
+RANKING_TASK_WORKERS = int(os.getenv("RANKING_TASK_WORKERS", "1"))
+# Finished tasks kept around for status polling
+RANKING_TASK_HISTORY = 100
+
+
+class RankingTask:
+    """Progress of one background ranking run"""
+
+    def __init__(self, job_id: int):
+        self.id = uuid.uuid4().hex
+        self.job_id = job_id
+        self.status = "queued"
+        self.phase = None
+        self.processed = 0
+        self.total = 0
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._phase_started = None
+        self._started = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def begin_phase(self, phase: str, total: int) -> None:
+        """Start a step (e.g. encoding, scoring) of `total` resumes"""
+        if self._started is None:
+            self._started = time.monotonic()
+        self.status = "running"
+        self.phase = phase
+        self.total = total
+        self.processed = 0
+        self._phase_started = time.monotonic()
+
+    def advance(self, count: int) -> None:
+        self.processed += count
+
+    def finish(self, error: Optional[Exception] = None) -> None:
+        self.status = "failed" if error else "completed"
+        self.error = str(error) if error else None
+        self.finished_at = time.time()
+
+    def to_dict(self) -> dict:
+        """Status payload with progress and ETA of the current phase"""
+        eta = None
+        if self.status == "running" and self.processed and self.total:
+            elapsed = time.monotonic() - self._phase_started
+            eta = round(elapsed / self.processed * (self.total - self.processed), 1)
+        return {
+            "task_id": self.id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "phase": self.phase,
+            "processed": self.processed,
+            "total": self.total,
+            "progress": round(self.processed / self.total, 4) if self.total else 0.0,
+            "eta_seconds": eta,
+            "elapsed_seconds": round(time.monotonic() - self._started, 1) if self._started else 0.0,
+            "error": self.error,
+        }
+
+
+class RankingTaskManager:
+    """Runs ranking tasks in a background thread pool and tracks them"""
+
+    def __init__(self, max_workers: int = RANKING_TASK_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._tasks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: int, fn: Callable[..., None], *args) -> RankingTask:
+        """
+        Start fn(task, *args) in the background
+
+        Only one task runs per job; submitting while one is active returns
+        the active task instead of starting another.
+
+        Args:
+            job_id: Job description being ranked
+            fn: Worker called with the task and args
+            *args: Extra arguments for fn
+
+        Returns:
+            The new (or already active) task
+        """
+        with self._lock:
+            active = self.active_for_job(job_id)
+            if active is not None:
+                return active
+            task = RankingTask(job_id)
+            self._tasks[task.id] = task
+            self._prune()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ranking"
+                )
+            self._executor.submit(self._run, task, fn, args)
+            return task
+
+    def get(self, task_id: str) -> Optional[RankingTask]:
+        return self._tasks.get(task_id)
+
+    def active_for_job(self, job_id: int) -> Optional[RankingTask]:
+        for task in reversed(self._tasks.values()):
+            if task.job_id == job_id and task.active:
+                return task
+        return None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, task: RankingTask, fn, args) -> None:
+        try:
+            fn(task, *args)
+        except Exception as e:
+            task.finish(e)
+        else:
+            task.finish()
+
+    def _prune(self) -> None:
+        finished = [task_id for task_id, task in self._tasks.items() if not task.active]
+        for task_id in finished[:max(0, len(finished) - RANKING_TASK_HISTORY)]:
+            del self._tasks[task_id]
@@ -1,23 +1,232 @@
 # backend/app/text_extract.py
+import multiprocessing
 import os
+import threading
+import time
+from collections import deque
 from pathlib import Path
 from pdfminer.high_level import extract_text as pdf_extract_text
+from pdfminer.pdfpage import PDFPage
 from docx import Document as DocxDocument
 
+try:
+    import fitz  # PyMuPDF, optional and much faster than pdfminer
+except ImportError:
+    fitz = None
 
-def extract_text_from_pdf(file_path: str) -> str:
+# PDF text backend: auto (PyMuPDF when installed), pymupdf or pdfminer
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+# Wall-clock limit per PDF, enforced by extracting in a helper process (0 = no limit)
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "30"))
+# Slowest documents kept for /metrics/extraction
+EXTRACT_SLOWEST_KEPT = 20
+
+
+class PageLimitExceeded(ValueError):
+    """The document has more pages than allowed"""
+
+
+class ExtractionTimeout(ValueError):
+    """Extraction ran past EXTRACT_TIMEOUT_SECONDS"""
+
+
+def count_pdf_pages(file_path: str, limit: int = 0) -> int:
+    """
+    Count the pages of a PDF without extracting any text
+    
+    Args:
+        file_path: Path to PDF file
+        limit: Stop counting after this many pages (0 counts all)
+        
+    Returns:
+        Number of pages (at most limit)
+    """
+    with open(file_path, "rb") as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp, maxpages=limit))
+
+
+def _pdfminer_text(file_path: str, max_pages: int) -> str:
+    return pdf_extract_text(file_path, maxpages=max_pages)
+
+
+def _pymupdf_text(file_path: str, max_pages: int) -> str:
+    with fitz.open(file_path) as document:
+        pages = range(min(max_pages, document.page_count) if max_pages else document.page_count)
+        return "\n".join(document[number].get_text() for number in pages)
+
+
+PDF_BACKENDS = {
+    "pymupdf": _pymupdf_text,
+    "pdfminer": _pdfminer_text,
+}
+
+
+def pdf_backends(preferred: str = PDF_BACKEND) -> list:
+    """
+    PDF backends to try, in order
+    
+    Args:
+        preferred: auto, pymupdf or pdfminer
+        
+    Returns:
+        Backend names; pdfminer always comes last as the fallback
+    """
+    if preferred not in ("auto", *PDF_BACKENDS):
+        raise ValueError(f"Unsupported PDF backend: {preferred}")
+    fast = fitz is not None and preferred in ("auto", "pymupdf")
+    return ["pymupdf", "pdfminer"] if fast else ["pdfminer"]
+
+
+# Set by the initializer of extraction pool processes, which hold no model
+# threads and may fork their helper; any other process (the API, uvicorn
+# workers) must spawn it
+_in_extraction_pool = False
+# Idle helper processes of this process, reused across documents
+_idle_helpers = []
+_helpers_lock = threading.Lock()
+
+
+def mark_extraction_pool_process() -> None:
+    """Initializer of extraction pool processes (see executors.get_extract_pool)"""
+    global _in_extraction_pool
+    _in_extraction_pool = True
+
+
+def _extract_pdf(file_path: str, max_pages: int, stats: dict) -> str:
+    """Page check and backend fallback of extract_text_from_pdf, unbounded"""
+    if max_pages:
+        stats["pages"] = count_pdf_pages(file_path, max_pages + 1)
+        if stats["pages"] > max_pages:
+            raise PageLimitExceeded(f"PDF has more than {max_pages} pages")
+    
+    error = None
+    for backend in pdf_backends():
+        stats["backend"] = backend
+        try:
+            # Documents over max_pages were rejected above, so every page is read
+            text = PDF_BACKENDS[backend](file_path, max_pages or 0).strip()
+        except Exception as e:
+            error = e
+            continue
+        if text or backend == "pdfminer":
+            return text
+    raise error
+
+
+def _serve_extractions(connection) -> None:
+    """Helper process loop: extract each requested PDF until the pipe closes"""
+    while True:
+        try:
+            file_path, max_pages = connection.recv()
+        except EOFError:
+            return
+        stats = {}
+        try:
+            connection.send((_extract_pdf(file_path, max_pages, stats), stats, None))
+        except PageLimitExceeded as e:
+            connection.send((None, stats, e))
+        except Exception as e:
+            connection.send((None, stats, ValueError(str(e))))
+
+
+class _ExtractionHelper:
+    """A child process extracting PDFs one at a time, killed on timeout"""
+    
+    def __init__(self):
+        fork = _in_extraction_pool and "fork" in multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if fork else "spawn")
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve_extractions, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+    
+    def run(self, request: tuple, timeout: float) -> tuple:
+        try:
+            self.connection.send(request)
+            if not self.connection.poll(timeout):
+                raise ExtractionTimeout(f"PDF extraction took longer than {timeout:g} s")
+            return self.connection.recv()
+        except (EOFError, OSError):
+            raise ValueError("PDF extraction process died")
+    
+    def close(self) -> None:
+        self.connection.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+def _run_in_helper(request: tuple, timeout: float) -> tuple:
+    """
+    Run one extraction in an idle helper process (started if there is none)
+    
+    The helper is reused for later documents, so the process start is paid
+    once, not per document; one that times out or fails is killed and
+    replaced on the next call.
+    """
+    with _helpers_lock:
+        helper = _idle_helpers.pop() if _idle_helpers else None
+    if helper is None or not helper.process.is_alive():
+        helper = _ExtractionHelper()
+    try:
+        result = helper.run(request, timeout)
+    except BaseException:
+        helper.close()
+        raise
+    with _helpers_lock:
+        _idle_helpers.append(helper)
+    return result
+
+
+def close_extraction_helpers() -> None:
+    """Stop the idle helper processes"""
+    with _helpers_lock:
+        helpers = list(_idle_helpers)
+        _idle_helpers.clear()
+    for helper in helpers:
+        helper.close()
+
+
+def extract_text_from_pdf(
+    file_path: str,
+    max_pages: int = None,
+    timeout: float = EXTRACT_TIMEOUT_SECONDS,
+    stats: dict = None
+) -> str:
     """
     Extract text from PDF file
     
+    The fast backend is tried first when installed; pdfminer is the
+    fallback if it fails or finds no text. With a timeout, the page count
+    and all attempts run in a reused helper process that is killed once
+    the timeout runs out.
+    
     Args:
         file_path: Path to PDF file
+        max_pages: Reject documents with more pages (no limit if None)
+        timeout: Wall-clock seconds for extraction (0 runs it inline, unbounded)
+        stats: Filled with the backend used and the pages counted
         
     Returns:
         Extracted text content
+        
+    Raises:
+        PageLimitExceeded: If the PDF has more than max_pages pages
+        ExtractionTimeout: If extraction takes longer than timeout
     """
+    stats = {} if stats is None else stats
     try:
-        text = pdf_extract_text(file_path)
-        return text.strip()
+        if not timeout:
+            return _extract_pdf(file_path, max_pages, stats)
+        
+        stats["backend"] = pdf_backends()[0]
+        text, child_stats, error = _run_in_helper((file_path, max_pages), timeout)
+        stats.update(child_stats)
+        if error is not None:
+            raise error
+        return text
+    except (PageLimitExceeded, ExtractionTimeout):
+        raise
     except Exception as e:
         raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
@@ -40,12 +249,13 @@ def extract_text_from_docx(file_path: str) -> str:
         raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
 
 
-def extract_text(file_path: str) -> str:
+def extract_text(file_path: str, max_pages: int = None) -> str:
     """
     Extract text from file based on extension
     
     Args:
         file_path: Path to file
+        max_pages: Reject PDFs with more pages (no limit if None)
         
     Returns:
         Extracted text content
@@ -56,9 +266,73 @@ def extract_text(file_path: str) -> str:
     file_extension = Path(file_path).suffix.lower()
     
     if file_extension == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, max_pages)
     elif file_extension == ".docx":
         return extract_text_from_docx(file_path)
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
- 
+
+
+def extract_text_with_stats(file_path: str, max_pages: int = None) -> tuple:
+    """
+    Extract text and time it, never raising
+    
+    Args:
+        file_path: Path to file
+        max_pages: Reject PDFs with more pages (no limit if None)
+        
+    Returns:
+        (text or None on failure, stats dict with seconds, backend, pages,
+        bytes and error)
+    """
+    stats = {"bytes": os.path.getsize(file_path), "backend": None, "pages": None, "error": None}
+    started = time.perf_counter()
+    text = None
+    try:
+        if Path(file_path).suffix.lower() == ".pdf":
+            text = extract_text_from_pdf(file_path, max_pages, stats=stats)
+        else:
+            stats["backend"] = "python-docx"
+            text = extract_text(file_path, max_pages)
+    except Exception as e:
+        stats["error"] = str(e)
+    stats["seconds"] = round(time.perf_counter() - started, 4)
+    return text, stats
+
+
+class ExtractionStats:
+    """Running timing statistics of extracted documents"""
+    
+    def __init__(self, recent: int = 1000, slowest: int = EXTRACT_SLOWEST_KEPT):
+        self._recent = deque(maxlen=recent)
+        self._slowest = []
+        self._keep_slowest = slowest
+        self._counts = {}
+        self._lock = threading.Lock()
+    
+    def record(self, filename: str, stats: dict) -> None:
+        """Add the stats of one document (from extract_text_with_stats)"""
+        entry = {"filename": filename, **stats}
+        with self._lock:
+            self._recent.append(entry["seconds"])
+            key = (entry["backend"] or "none", "error" if entry["error"] else "ok")
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._slowest.append(entry)
+            self._slowest.sort(key=lambda item: -item["seconds"])
+            del self._slowest[self._keep_slowest:]
+    
+    def metrics(self) -> dict:
+        """Counts per backend and outcome, latency of recent documents, slowest documents"""
+        with self._lock:
+            recent = sorted(self._recent)
+            return {
+                "documents": sum(self._counts.values()),
+                "by_backend": [
+                    {"backend": backend, "status": status, "count": count}
+                    for (backend, status), count in sorted(self._counts.items())
+                ],
+                "seconds_mean": sum(recent) / len(recent) if recent else 0.0,
+                "seconds_p95": recent[int(0.95 * (len(recent) - 1))] if recent else 0.0,
+                "seconds_max": recent[-1] if recent else 0.0,
+                "slowest": list(self._slowest),
+            }
@@ -1,7 +1,15 @@
 # backend/app/utils.py
+import hashlib
 import re
 from typing import List
 
+# Word tokens; keeps tool names such as c++, c#, node.js and ci/cd intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with we you our your".split()
+)
+
 
 def preprocess_text(text: str) -> str:
     """
@@ -20,6 +28,35 @@ def preprocess_text(text: str) -> str:
     return text
 
 
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms
+    
+    Args:
+        text: Raw text content
+        
+    Returns:
+        Terms in document order, stopwords removed
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(preprocess_text(text).lower())
+        if token not in STOPWORDS
+    ]
+
+
+def content_hash(text: str) -> str:
+    """
+    Fingerprint of text that ignores case and whitespace differences
+    
+    Args:
+        text: Extracted document text
+        
+    Returns:
+        Hex SHA-256 digest of the normalized text
+    """
+    return hashlib.sha256(preprocess_text(text).lower().encode("utf-8")).hexdigest()
+
+
 def calculate_percentile(score: float, all_scores: List[float]) -> float:
     """
     Calculate percentile ranking for a score
@@ -0,0 +1,210 @@
+# backend/app/vector_index.py
+import math
+import os
+import threading
+from typing import Iterable, Optional, Tuple
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu is optional
+    faiss = None
+
+from .models import ResumeEmbedding
+from .store import blob_to_vector, embedding_fingerprint, EMBEDDING_LOAD_BATCH_SIZE
+
+# Corpus size from which an IVF index replaces the exact flat index
+FAISS_IVF_THRESHOLD = int(os.getenv("FAISS_IVF_THRESHOLD", "50000"))
+# Number of IVF cells visited per query (recall / speed trade-off)
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+
+
+class VectorIndex:
+    """
+    In-memory FAISS index over the stored resume embeddings
+
+    Small corpora use an exact inner-product index. From FAISS_IVF_THRESHOLD
+    vectors upwards an IVF index is trained instead; HNSW is not used because
+    it cannot remove vectors, which deleting a resume requires.
+
+    The index keeps the count and sum of the embedding IDs it holds (see
+    store.embedding_fingerprint) and is rebuilt whenever they differ from
+    the database's, e.g. after uploads through another worker.
+    """
+
+    def __init__(self, ivf_threshold: int = FAISS_IVF_THRESHOLD, nprobe: int = FAISS_NPROBE):
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._index = None
+        self._model_key = None
+        self._fingerprint = None
+        self._watermark = 0
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        """True if faiss is installed"""
+        return faiss is not None
+
+    @property
+    def size(self) -> int:
+        """Number of indexed vectors"""
+        return self._index.ntotal if self._index is not None else 0
+
+    @property
+    def watermark(self) -> int:
+        """Highest embedding ID in the index (0 if none)"""
+        return self._watermark
+
+    def is_built_for(self, embedder) -> bool:
+        """True if the index holds vectors of the embedder's model"""
+        return self._index is not None and self._model_key == (embedder.model_name, embedder.model_version)
+
+    def build(
+        self,
+        ids: Iterable[int],
+        matrix: np.ndarray,
+        embedder,
+        embedding_ids: Optional[Iterable[int]] = None
+    ) -> None:
+        """
+        Replace the index contents
+
+        Args:
+            ids: Resume IDs, one per matrix row
+            matrix: L2-normalized embeddings
+            embedder: Embedder that produced the vectors
+            embedding_ids: IDs of the ResumeEmbedding rows (if None, the
+                next ensure_built rebuilds from the database)
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        dimension = matrix.shape[1]
+
+        if len(ids) >= self.ivf_threshold:
+            nlist = max(1, int(4 * math.sqrt(len(ids))))
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(matrix)
+            index.nprobe = self.nprobe
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+
+        if len(ids):
+            index.add_with_ids(matrix, ids)
+
+        embedding_ids = None if embedding_ids is None else [int(embedding_id) for embedding_id in embedding_ids]
+        with self._lock:
+            self._index = index
+            self._model_key = (embedder.model_name, embedder.model_version)
+            self._fingerprint = None if embedding_ids is None else [len(embedding_ids), sum(embedding_ids)]
+            self._watermark = max(embedding_ids, default=0) if embedding_ids is not None else 0
+
+    def add(self, ids: Iterable[int], matrix: np.ndarray, embedder, embedding_ids: Iterable[int] = ()) -> None:
+        """
+        Add vectors to a built index
+
+        A flat index that grows past the IVF threshold is dropped so the
+        next ensure_built rebuilds it as IVF.
+
+        Args:
+            ids: Resume IDs, one per matrix row
+            matrix: L2-normalized embeddings
+            embedder: Embedder that produced the vectors
+            embedding_ids: IDs of the committed ResumeEmbedding rows
+        """
+        embedding_ids = [int(embedding_id) for embedding_id in embedding_ids]
+        with self._lock:
+            if not self.is_built_for(embedder):
+                return
+            ids = np.asarray(list(ids), dtype=np.int64)
+            # Replace, never duplicate. Rows already here came from a rebuild
+            # that saw the commit first: their IDs are counted already
+            replaced = self._index.remove_ids(ids)
+            self._index.add_with_ids(np.ascontiguousarray(matrix, dtype=np.float32), ids)
+            if replaced:
+                self._fingerprint = None
+            self._shift(embedding_ids, 1)
+            self._watermark = max([self._watermark, *embedding_ids])
+            if isinstance(self._index, faiss.IndexIDMap2) and self._index.ntotal >= self.ivf_threshold:
+                self._index = None
+
+    def remove(self, ids: Iterable[int], embedding_ids: Iterable[int] = ()) -> None:
+        """
+        Remove vectors by resume ID
+
+        Args:
+            ids: Resume IDs
+            embedding_ids: IDs of the deleted ResumeEmbedding rows
+        """
+        with self._lock:
+            if self._index is not None:
+                removed = self._index.remove_ids(np.asarray(list(ids), dtype=np.int64))
+                self._shift([int(embedding_id) for embedding_id in embedding_ids] if removed else [], -1)
+
+    def reset(self) -> None:
+        """Drop the index so it is rebuilt on next use"""
+        with self._lock:
+            self._index = None
+            self._model_key = None
+            self._fingerprint = None
+            self._watermark = 0
+
+    def ensure_built(self, db, embedder) -> bool:
+        """
+        Build the index from stored embeddings if it is missing, built for
+        another model, or its fingerprint differs from the database's
+
+        Args:
+            db: Database session
+            embedder: Embedder whose stored vectors are indexed
+
+        Returns:
+            True if the index is ready to search
+        """
+        if not self.available:
+            return False
+        with self._lock:
+            if self.is_built_for(embedder) and self._fingerprint == embedding_fingerprint(db, embedder):
+                return True
+            rows = db.query(ResumeEmbedding.id, ResumeEmbedding.resume_id, ResumeEmbedding.vector).filter(
+                ResumeEmbedding.model_name == embedder.model_name,
+                ResumeEmbedding.model_version == embedder.model_version
+            ).yield_per(EMBEDDING_LOAD_BATCH_SIZE)
+            # The fingerprint is taken from the rows indexed, not a second query
+            embedding_ids, ids, vectors = [], [], []
+            for embedding_id, resume_id, blob in rows:
+                embedding_ids.append(embedding_id)
+                ids.append(resume_id)
+                vectors.append(blob_to_vector(blob))
+            if not ids:
+                self.reset()
+                return False
+            self.build(ids, np.vstack(vectors), embedder, embedding_ids)
+            return True
+
+    def search(self, query_embedding: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k vectors with the highest inner product
+
+        Args:
+            query_embedding: L2-normalized query vector
+            k: Number of results
+
+        Returns:
+            (resume IDs, similarity scores), best first
+        """
+        with self._lock:
+            k = min(k, self.size)
+            if k <= 0:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            query = np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1)
+            scores, ids = self._index.search(query, k)
+
+        found = ids[0] >= 0
+        return ids[0][found], scores[0][found]
+
+    def _shift(self, embedding_ids: list, sign: int) -> None:
+        if self._fingerprint is not None:
+            count, total = self._fingerprint
+            self._fingerprint = [count + sign * len(embedding_ids), total + sign * sum(embedding_ids)]
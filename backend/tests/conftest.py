@@ -0,0 +1,125 @@
+# backend/tests/conftest.py
+"""Shared fixtures for API tests"""
+
+import sys
+import os
+import zlib
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+class FakeSentenceModel:
+    """Deterministic bag-of-words stand-in for SentenceTransformer"""
+
+    max_seq_length = 256
+    dimension = 64
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, convert_to_numpy=True):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dimension] += 1.0
+            vectors[row, -1] += 1e-3  # never all-zero
+        return vectors
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """TestClient backed by an in-memory database and the fake model"""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app import api, db as app_db
+    from app.main import app
+    from app.models import Base
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(app_db, "engine", engine)
+    monkeypatch.setattr(app_db, "SessionLocal", TestingSession)
+    monkeypatch.setattr(api.embedder, "_model", FakeSentenceModel())
+    monkeypatch.setattr(api.embedder, "ready", False)
+    monkeypatch.setattr(api, "current_job_id", None)
+    monkeypatch.setattr(api.embedding_matrix, "directory", str(tmp_path / "embedding_matrix"))
+    api.vector_index.reset()
+    api.lexical_index.reset()
+    api.near_duplicate_index.reset()
+    api.results_cache.clear()
+    api.query_embeddings.clear()
+    app.dependency_overrides[app_db.get_db] = override_get_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+    api.vector_index.reset()
+    api.lexical_index.reset()
+    api.near_duplicate_index.reset()
+
+
+@pytest.fixture
+def make_docx():
+    """Factory building in-memory DOCX uploads from plain text"""
+    import io
+    from docx import Document
+
+    def build(text):
+        document = Document()
+        for paragraph in text.split("\n"):
+            document.add_paragraph(paragraph)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+    return build
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory building minimal PDFs with one line of text per page"""
+
+    def build(pages):
+        font = 3 + 2 * len(pages)
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+                " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+            ),
+        ]
+        for i, text in enumerate(pages):
+            stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+                f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+            )
+            objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+        pdf = b"%PDF-1.4\n"
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(pdf))
+            pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+        xref = len(pdf)
+        pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+        pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        return pdf
+
+    return build
@@ -0,0 +1,729 @@
+# backend/tests/test_api.py
+"""Test suite for the REST API"""
+
+import time
+
+import pytest
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def upload_resume(client, make_docx, name, text):
+    response = client.post(
+        "/upload-resume",
+        files={"file": (f"{name}.docx", make_docx(text), DOCX_TYPE)},
+        params={"candidate_name": name}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def upload_job(client, content, title="Python Developer"):
+    response = client.post("/upload-job-description", params={"job_title": title, "content": content})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_health_live_and_ready(client):
+    """Test liveness is always up and readiness follows the warm-up"""
+    assert client.get("/health").status_code == 200
+    assert client.get("/health/live").status_code == 200
+    
+    deadline = time.monotonic() + 5
+    response = client.get("/health/ready")
+    while response.status_code == 503 and time.monotonic() < deadline:
+        time.sleep(0.05)
+        response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_readiness_before_warmup(client):
+    """Test readiness reports 503 until the model has encoded once"""
+    from app import api
+    
+    api.embedder.ready = False
+    assert client.get("/health/ready").status_code == 503
+
+
+def test_failed_warmup_is_retried_and_optional(client, monkeypatch):
+    """Test a failing warm-up is retried, and readiness ignores a disabled one"""
+    import asyncio
+    from app import api, main
+    
+    calls = []
+    
+    def flaky_warmup():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("model download failed")
+        api.embedder.ready = True
+    
+    api.embedder.ready = False
+    monkeypatch.setattr(api.embedder, "warmup", flaky_warmup)
+    asyncio.run(main.warm_up_embedder(retry_seconds=0.01))
+    assert len(calls) == 2
+    assert client.get("/health/ready").status_code == 200
+    
+    api.embedder.ready = False
+    monkeypatch.setattr(main, "EMBEDDER_WARMUP", False)
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["model_loaded"] is False
+
+
+def test_rank_resumes_orders_by_similarity(client, make_docx):
+    """Test ranking uses stored embeddings and orders by score"""
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    upload_resume(client, make_docx, "carol", "python django")
+    job = upload_job(client, "python fastapi docker")
+    
+    response = client.post("/rank-resumes", params={"job_id": job["id"]})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_resumes"] == 3
+    assert [r["candidate_name"] for r in data["rankings"]] == ["alice", "carol", "bob"]
+    assert [r["rank"] for r in data["rankings"]] == [1, 2, 3]
+
+
+def test_rank_resumes_top_k(client, make_docx):
+    """Test top_k returns and stores only the best resumes"""
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    upload_resume(client, make_docx, "carol", "python django")
+    job = upload_job(client, "python fastapi docker")
+    
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 2}).json()
+    
+    assert data["total_resumes"] == 3
+    assert [r["candidate_name"] for r in data["rankings"]] == ["alice", "carol"]
+    results = client.get("/results", params={"job_id": job["id"]}).json()
+    assert results["total_results"] == 2
+
+
+def test_deleted_resume_leaves_ranking(client, make_docx):
+    """Test the vector index drops deleted resumes"""
+    alice = upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "carol", "python django")
+    job = upload_job(client, "python fastapi docker")
+    client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 5})
+    
+    assert client.delete(f"/resume/{alice['id']}").status_code == 200
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 5}).json()
+    
+    assert [r["candidate_name"] for r in data["rankings"]] == ["carol"]
+
+
+def insert_resume_out_of_band(name, text):
+    """Store a resume the way another worker would, bypassing this process's indexes"""
+    from app import api, db as app_db
+    from app.models import Resume
+    from app.store import save_resume_embedding
+    
+    session = app_db.SessionLocal()
+    try:
+        resume = Resume(filename=f"{name}.docx", candidate_name=name, content=text)
+        session.add(resume)
+        session.flush()
+        vector, chunks = api.encode_documents(api.embedder, [text])
+        save_resume_embedding(session, resume.id, vector[0], api.embedder, chunks[0])
+        session.commit()
+        return resume.id
+    finally:
+        session.close()
+
+
+def delete_resume_out_of_band(resume_id):
+    """Delete a resume the way another worker would, bypassing this process's indexes"""
+    from app import db as app_db
+    from app.models import Resume, RankingResult
+    
+    session = app_db.SessionLocal()
+    try:
+        session.query(RankingResult).filter(RankingResult.resume_id == resume_id).delete()
+        session.delete(session.get(Resume, resume_id))
+        session.commit()
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("shared_matrix", [False, True])
+def test_top_k_ranking_sees_resumes_stored_by_other_workers(client, make_docx, monkeypatch, shared_matrix):
+    """Test top_k rankings see embeddings this process never indexed, from FAISS or the shared matrix"""
+    from app import api
+    
+    if not shared_matrix:
+        if not api.vector_index.available:
+            pytest.skip("faiss is not installed")
+        monkeypatch.setattr(api.embedding_matrix, "directory", "")
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    earlier = upload_job(client, "pasta chef")
+    client.post("/rank-resumes", params={"job_id": earlier["id"], "top_k": 2})
+    # With the shared matrix, no per-worker FAISS copy is built
+    assert api.vector_index.size == (0 if shared_matrix else 2)
+    
+    # A full ranking after the index was built must still see zed
+    insert_resume_out_of_band("zed", "python fastapi docker kubernetes")
+    job = upload_job(client, "python fastapi docker kubernetes")
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 2}).json()
+    assert [r["candidate_name"] for r in data["rankings"]] == ["zed", "alice"]
+    
+    # Incremental runs extend from the index's watermark, so they keep zed
+    # and pick up the next out-of-band resume too
+    insert_resume_out_of_band("yan", "python fastapi docker kubernetes helm")
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 2}).json()
+    assert sorted(r["candidate_name"] for r in data["rankings"]) == ["yan", "zed"]
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 2}).json()
+    assert sorted(r["candidate_name"] for r in data["rankings"]) == ["yan", "zed"]
+
+
+def test_bulk_upload_files_and_zip(client, make_docx, monkeypatch, tmp_path):
+    """Test bulk upload of loose files and a ZIP archive with per-file status"""
+    import io
+    import zipfile
+    
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("dave.docx", make_docx("python kubernetes"))
+        zf.writestr("notes.txt", "not a resume")
+    
+    response = client.post(
+        "/upload-resumes",
+        files=[
+            ("files", ("alice.docx", make_docx("python fastapi"), DOCX_TYPE)),
+            ("files", ("bob.pdf", b"not really a pdf", "application/pdf")),
+            ("files", ("batch.zip", archive.getvalue(), "application/zip")),
+        ],
+        data={"candidate_names": ["Alice A", "Bob B", "ignored"]}
+    )
+    
+    assert response.status_code == 200, response.text
+    data = response.json()
+    statuses = {r["filename"]: r for r in data["results"]}
+    assert data["uploaded"] == 2
+    assert data["failed"] == 2
+    assert statuses["alice.docx"]["candidate_name"] == "Alice A"
+    assert statuses["dave.docx"]["candidate_name"] == "dave"
+    assert statuses["bob.pdf"]["status"] == "error"
+    assert statuses["notes.txt"]["status"] == "error"
+    
+    job = upload_job(client, "python kubernetes")
+    ranked = client.post("/rank-resumes", params={"job_id": job["id"]}).json()
+    assert [r["candidate_name"] for r in ranked["rankings"]] == ["dave", "Alice A"]
+    
+    # Too many members: rejected from the ZIP directory, nothing is spooled
+    from app import api
+    import tempfile
+    
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spool))
+    monkeypatch.setattr(api, "BULK_UPLOAD_MAX_FILES", 2)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i in range(3):
+            zf.writestr(f"r{i}.docx", make_docx(f"resume {i}"))
+    response = client.post(
+        "/upload-resumes",
+        files=[
+            ("files", ("a.docx", make_docx("go"), DOCX_TYPE)),
+            ("files", ("big.zip", archive.getvalue(), "application/zip")),
+        ]
+    )
+    assert response.status_code == 413
+    assert "Too many resumes" in response.json()["detail"]
+    assert list(spool.iterdir()) == []
+
+
+def test_background_ranking_task(client, make_docx):
+    """Test background ranking reports progress and matches the sync ranking"""
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    upload_resume(client, make_docx, "carol", "python django")
+    job = upload_job(client, "python fastapi docker")
+    
+    response = client.post(
+        "/rank-resumes",
+        params={"job_id": job["id"], "background": True, "chunk_size": 1, "top_k": 2}
+    )
+    assert response.status_code == 202
+    task = response.json()
+    status_url = task["status_url"]
+    
+    deadline = time.monotonic() + 10
+    while task["status"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        task = client.get(status_url).json()
+    
+    assert task["status"] == "completed", task
+    assert task["processed"] == task["total"] == 3
+    results = client.get("/results", params={"job_id": job["id"]}).json()
+    assert results["complete"] is True
+    assert [r["rank"] for r in results["rankings"]] == [1, 2]
+    
+    expected = client.post("/rank-resumes", params={"job_id": job["id"], "top_k": 2}).json()
+    assert [r["resume_id"] for r in results["rankings"]] == [r["resume_id"] for r in expected["rankings"]]
+
+
+def test_unknown_ranking_task(client):
+    """Test polling an unknown task"""
+    assert client.get("/ranking-tasks/missing").status_code == 404
+
+
+def test_incremental_rerank_scores_only_new_resumes(client, make_docx, monkeypatch):
+    """Test re-ranking after an upload merges the new resume into the stored ranking"""
+    from app import api
+    
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    job = upload_job(client, "python fastapi docker")
+    client.post("/rank-resumes", params={"job_id": job["id"]})
+    
+    carol = upload_resume(client, make_docx, "carol", "python django")
+    scored = []
+    score_resumes = api._score_resumes
+    monkeypatch.setattr(
+        api, "_score_resumes", lambda db, ids, *args: scored.append(ids) or score_resumes(db, ids, *args)
+    )
+    incremental = client.post("/rank-resumes", params={"job_id": job["id"]}).json()
+    monkeypatch.setattr(api, "_score_resumes", score_resumes)
+    full = client.post("/rank-resumes", params={"job_id": job["id"], "incremental": False}).json()
+    
+    assert scored == [[carol["id"]]]
+    assert [r["candidate_name"] for r in incremental["rankings"]] == ["alice", "carol", "bob"]
+    assert incremental["rankings"] == full["rankings"]
+    results = client.get("/results", params={"job_id": job["id"]}).json()["rankings"]
+    assert [r["rank"] for r in results] == [1, 2, 3]
+
+
+def test_ranking_storage_cap(client, make_docx, monkeypatch):
+    """Test RANKING_MAX_STORED_RESULTS keeps only the best rows without top_k"""
+    from app import api
+    
+    monkeypatch.setattr(api, "RANKING_MAX_STORED_RESULTS", 2)
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    upload_resume(client, make_docx, "carol", "python django")
+    job = upload_job(client, "python fastapi docker")
+    
+    data = client.post("/rank-resumes", params={"job_id": job["id"]}).json()
+    
+    assert data["total_resumes"] == 3
+    assert [r["candidate_name"] for r in data["rankings"]] == ["alice", "carol"]
+    assert client.get("/results", params={"job_id": job["id"]}).json()["total_results"] == 2
+
+
+def test_rank_jobs_matrix(client, make_docx):
+    """Test ranking several jobs at once stores each job's top_k and the reverse view"""
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    upload_resume(client, make_docx, "carol", "python django")
+    python_job = upload_job(client, "python fastapi docker")
+    chef_job = upload_job(client, "pasta kitchen cooking", title="Chef")
+    
+    response = client.post(
+        "/rank-jobs",
+        params={"job_ids": [python_job["id"], chef_job["id"]], "top_k": 2, "jobs_per_resume": 1}
+    )
+    
+    assert response.status_code == 200, response.text
+    data = response.json()
+    rankings = {job["job_title"]: [r["candidate_name"] for r in job["rankings"]] for job in data["jobs"]}
+    assert rankings["Python Developer"] == ["alice", "carol"]
+    assert rankings["Chef"][0] == "bob"
+    best_jobs = {r["candidate_name"]: r["best_jobs"][0]["job_title"] for r in data["resumes"]}
+    assert best_jobs == {"alice": "Python Developer", "bob": "Chef", "carol": "Python Developer"}
+    
+    stored = client.get("/results", params={"job_id": python_job["id"]}).json()
+    assert [r["resume_id"] for r in stored["rankings"]] == [
+        r["resume_id"] for r in data["jobs"][0]["rankings"]
+    ]
+    assert client.post("/rank-jobs", params={"job_ids": [999]}).status_code == 404
+
+
+def test_hybrid_ranking_rewards_exact_terms(client, make_docx):
+    """Test BM25 fusion and lexical prefiltering in /rank-resumes"""
+    upload_resume(client, make_docx, "alice", "python developer")
+    upload_resume(client, make_docx, "bob", "python developer cissp")
+    upload_resume(client, make_docx, "carol", "cooking pasta recipes kitchen")
+    job = upload_job(client, "python developer cissp")
+    
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "lexical_weight": 0.5}).json()
+    assert data["rankings"][0]["candidate_name"] == "bob"
+    assert data["rankings"][0]["lexical_score"] > 0
+    assert "semantic_score" in data["rankings"][0]
+    
+    data = client.post(
+        "/rank-resumes", params={"job_id": job["id"], "fusion": "rrf", "lexical_candidates": 2}
+    ).json()
+    assert [r["candidate_name"] for r in data["rankings"]] == ["bob", "alice"]
+    assert client.post(
+        "/rank-resumes", params={"job_id": job["id"], "fusion": "rrf", "background": True}
+    ).status_code == 400
+
+
+def test_hybrid_ranking_sees_other_workers_writes(client, make_docx):
+    """Test the BM25 index follows uploads and deletes it did not make itself"""
+    from app import api
+    
+    upload_resume(client, make_docx, "alice", "python developer")
+    bob = upload_resume(client, make_docx, "bob", "python developer cissp")
+    job = upload_job(client, "python developer cissp")
+    params = {"job_id": job["id"], "lexical_weight": 0.5, "lexical_candidates": 5}
+    client.post("/rank-resumes", params=params)
+    assert api.lexical_index.size == 2
+    
+    # Resumes newer than the index are added, a delete elsewhere forces a rebuild
+    insert_resume_out_of_band("zed", "cissp cissp python developer")
+    data = client.post("/rank-resumes", params=params).json()
+    assert [r["candidate_name"] for r in data["rankings"]] == ["zed", "bob", "alice"]
+    
+    delete_resume_out_of_band(bob["id"])
+    insert_resume_out_of_band("yan", "go developer")
+    data = client.post("/rank-resumes", params=params).json()
+    assert [r["candidate_name"] for r in data["rankings"]] == ["zed", "alice", "yan"]
+    assert api.lexical_index.size == 3
+
+
+class FakeCrossEncoder:
+    """Prefers resumes mentioning django, the opposite of the bi-encoder here"""
+
+    def __init__(self):
+        self.pairs = 0
+
+    def predict(self, pairs, batch_size=16):
+        self.pairs += len(pairs)
+        return [float("django" in document) for _, document in pairs]
+
+
+def test_rerank_top_k_with_cross_encoder(client, make_docx, monkeypatch):
+    """Test the second stage reorders only the top rerank_k and reports both scores"""
+    from app import api
+    
+    cross_encoder = FakeCrossEncoder()
+    monkeypatch.setattr(api.reranker, "_model", cross_encoder)
+    monkeypatch.setattr(api.reranker, "batch_size", 1)
+    upload_resume(client, make_docx, "alice", "python fastapi sql docker")
+    upload_resume(client, make_docx, "carol", "python django")
+    upload_resume(client, make_docx, "bob", "cooking pasta recipes kitchen")
+    job = upload_job(client, "python fastapi docker")
+    
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "rerank_k": 2}).json()
+    
+    assert [r["candidate_name"] for r in data["rankings"]] == ["carol", "alice", "bob"]
+    assert [r["rerank_score"] for r in data["rankings"]] == [1.0, 0.0, None]
+    assert data["rankings"][0]["similarity_score"] < data["rankings"][1]["similarity_score"]
+    assert data["rerank"]["scored"] == 2 and cross_encoder.pairs == 2
+    stored = client.get("/results", params={"job_id": job["id"]}).json()["rankings"]
+    assert stored[0]["resume_id"] == data["rankings"][1]["resume_id"]
+    
+    # A spent budget still lets the first batch through, then stops
+    data = client.post(
+        "/rank-resumes", params={"job_id": job["id"], "rerank_k": 3, "rerank_budget_ms": 1e-6}
+    ).json()
+    assert data["rerank"]["scored"] == 1
+
+
+def test_duplicate_uploads_are_not_stored_again(client, make_docx):
+    """Test same bytes or same normalized text map to the stored resume"""
+    payload = make_docx("python fastapi sql")
+    first = upload_resume(client, make_docx, "alice", "python fastapi sql")
+    assert first["duplicate"] is False
+    
+    same_text = upload_resume(client, make_docx, "alice again", "Python  FastAPI SQL")
+    assert same_text["duplicate"] is True
+    assert same_text["id"] == first["id"]
+    
+    response = client.post(
+        "/upload-resumes",
+        files=[
+            ("files", ("copy1.docx", payload, DOCX_TYPE)),
+            ("files", ("copy2.docx", payload, DOCX_TYPE)),
+            ("files", ("new.docx", make_docx("go kubernetes"), DOCX_TYPE)),
+            ("files", ("new-again.docx", make_docx("go  kubernetes"), DOCX_TYPE)),
+        ]
+    )
+    data = response.json()
+    statuses = {r["filename"]: r for r in data["results"]}
+    assert (data["uploaded"], data["duplicates"], data["failed"]) == (1, 3, 0)
+    assert statuses["copy1.docx"]["duplicate_of"] == first["id"]
+    assert statuses["copy2.docx"]["duplicate_of"] == first["id"]
+    assert statuses["new-again.docx"]["duplicate_of"] == statuses["new.docx"]["id"]
+    assert client.get("/resumes").json()["total"] == 2
+    
+    payload = make_docx("rust embedded")
+    response = client.post(
+        "/upload-resumes",
+        files=[("files", ("a.docx", payload, DOCX_TYPE)), ("files", ("b.docx", payload, DOCX_TYPE))]
+    )
+    statuses = {r["filename"]: r for r in response.json()["results"]}
+    assert statuses["b.docx"]["duplicate_of"] == statuses["a.docx"]["id"]
+    again = client.post("/upload-resume", files={"file": ("c.docx", payload, DOCX_TYPE)}).json()
+    assert again == {**{k: statuses["a.docx"][k] for k in ("id", "filename", "candidate_name")}, "duplicate": True}
+
+
+def test_upload_without_text_is_rejected(client, make_docx):
+    """Test files with no extractable text get 400 instead of all matching one another"""
+    for name, text in (("scan1", ""), ("scan2", "   \n ")):
+        response = client.post(
+            "/upload-resume",
+            files={"file": (f"{name}.docx", make_docx(text), DOCX_TYPE)},
+            params={"candidate_name": name}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "No text could be extracted"
+    assert client.get("/resumes").json()["total"] == 0
+
+
+def test_concurrent_duplicate_insert_and_hash_backfill(client, make_docx):
+    """Test an insert losing a hash race reports the stored resume, and old rows are hashed once"""
+    import numpy as np
+    from app import api, db as app_db
+    from app.models import Resume
+    from app.store import backfill_content_hashes
+    from app.utils import content_hash
+    
+    first = upload_resume(client, make_docx, "alice", "python fastapi sql")
+    db = app_db.SessionLocal()
+    try:
+        stored = db.query(Resume.file_hash, Resume.content_hash).filter(Resume.id == first["id"]).one()
+        vector = np.ones(64, dtype=np.float32) / 8
+        # Both passed the duplicate checks before either was inserted
+        results = api._save_resumes(db, [
+            ("copy.docx", "copy", "python fastapi sql", vector, None, stored.file_hash, stored.content_hash),
+            ("new.docx", "bob", "go kubernetes", vector, None, "f" * 64, content_hash("go kubernetes")),
+        ])
+        assert results[0]["id"] == first["id"] and results[0]["duplicate"] is True
+        assert results[1]["duplicate"] is False
+        
+        # Resumes stored before content hashes existed, two with the same text
+        db.add_all([Resume(filename=f"old{i}.docx", content="Rust  embedded") for i in range(2)])
+        db.commit()
+        assert backfill_content_hashes(db) == 1
+        assert db.query(Resume).filter(Resume.content_hash.is_(None)).count() == 0
+        assert backfill_content_hashes(db) == 0
+    finally:
+        db.close()
+    assert client.get("/resumes").json()["total"] == 4
+
+
+def test_near_duplicate_clusters_and_collapse(client, make_docx):
+    """Test edited copies are clustered and collapsed in rankings"""
+    base = "senior python engineer building fastapi services with sql docker and kubernetes for ten years"
+    alice = upload_resume(client, make_docx, "alice", base)
+    alice_copy = upload_resume(client, make_docx, "alice copy", base + " references")
+    upload_resume(client, make_docx, "bob", "pastry chef cooking pasta recipes in a busy kitchen")
+    job = upload_job(client, "python fastapi docker kubernetes")
+    
+    clusters = client.get("/near-duplicates", params={"threshold": 0.7}).json()
+    assert clusters["total_clusters"] == 1
+    assert {r["id"] for r in clusters["clusters"][0]["resumes"]} == {alice["id"], alice_copy["id"]}
+    
+    data = client.post("/rank-resumes", params={"job_id": job["id"], "collapse_duplicates": True}).json()
+    assert len(data["rankings"]) == 2
+    assert data["rankings"][0]["duplicates"] in ([alice["id"]], [alice_copy["id"]])
+    assert data["rankings"][1]["candidate_name"] == "bob"
+
+
+def test_near_duplicates_see_other_workers_writes(client, make_docx):
+    """Test the MinHash index follows uploads and deletes it did not make itself"""
+    from app import api
+    
+    base = "senior python engineer building fastapi services with sql docker and kubernetes for ten years"
+    alice = upload_resume(client, make_docx, "alice", base)
+    bob = upload_resume(client, make_docx, "bob", "pastry chef cooking pasta recipes in a busy kitchen")
+    assert client.get("/near-duplicates", params={"threshold": 0.7}).json()["total_clusters"] == 0
+    
+    # Resumes newer than the index are added, a delete elsewhere forces a rebuild
+    copy_id = insert_resume_out_of_band("alice copy", base + " references")
+    clusters = client.get("/near-duplicates", params={"threshold": 0.7}).json()
+    assert {r["id"] for r in clusters["clusters"][0]["resumes"]} == {alice["id"], copy_id}
+    
+    delete_resume_out_of_band(bob["id"])
+    delete_resume_out_of_band(copy_id)
+    insert_resume_out_of_band("scan", "")
+    assert client.get("/near-duplicates", params={"threshold": 0.7}).json()["total_clusters"] == 0
+    assert api.near_duplicate_index.size == 2
+
+
+def test_upload_size_and_page_limits(client, make_docx, make_pdf, monkeypatch):
+    """Test oversized files get 413 (per-file errors in bulk) and long PDFs are rejected"""
+    from app import api, ingest
+    
+    monkeypatch.setattr(ingest, "UPLOAD_MAX_BYTES", 2048)
+    monkeypatch.setattr(api, "UPLOAD_MAX_PAGES", 2)
+    big = make_docx("python " * 5000)
+    assert len(big) > 2048
+    
+    response = client.post("/upload-resume", files={"file": ("big.docx", big, DOCX_TYPE)})
+    assert response.status_code == 413
+    
+    response = client.post(
+        "/upload-resume", files={"file": ("long.pdf", make_pdf(["one", "two", "three"]), "application/pdf")}
+    )
+    assert response.status_code == 400
+    assert "more than 2 pages" in response.json()["detail"]
+    
+    response = client.post(
+        "/upload-resumes",
+        files=[
+            ("files", ("big.docx", big, DOCX_TYPE)),
+            ("files", ("short.pdf", make_pdf(["python fastapi", "docker"]), "application/pdf")),
+        ]
+    )
+    statuses = {r["filename"]: r for r in response.json()["results"]}
+    assert "limit" in statuses["big.docx"]["error"]
+    assert statuses["short.pdf"]["status"] == "ok"
+    
+    metrics = client.get("/metrics/extraction").json()
+    assert metrics["documents"] >= 2
+    assert any(entry["status"] == "error" for entry in metrics["by_backend"])
+    
+    monkeypatch.setattr(api, "UPLOAD_MAX_REQUEST_BYTES", 100)
+    response = client.post(
+        "/upload-resumes", files=[("files", ("short.pdf", make_pdf(["go rust"]), "application/pdf"))]
+    )
+    assert response.status_code == 413
+
+
+def test_oversized_body_rejected_before_form_parsing(client, make_docx, monkeypatch):
+    """Test request bodies over the limit get 413 by Content-Length or by counted bytes"""
+    import httpx
+    from app import ingest, request_limits
+    
+    monkeypatch.setattr(ingest, "UPLOAD_MAX_BYTES", 2048)
+    monkeypatch.setattr(ingest, "UPLOAD_MAX_REQUEST_BYTES", 2048)
+    monkeypatch.setattr(request_limits, "UPLOAD_FORM_OVERHEAD_BYTES", 512)
+    big = make_docx("python " * 5000)
+    
+    for path, field in (("/upload-resume", "file"), ("/upload-resumes", "files")):
+        response = client.post(path, files={field: ("big.docx", big, DOCX_TYPE)})
+        assert response.status_code == 413
+        assert "limit" in response.json()["detail"]
+    
+    # Chunked body without Content-Length: counted while it is received
+    request = httpx.Request("POST", "http://test/upload-resume", files={"file": ("big.docx", big, DOCX_TYPE)})
+    body = request.read()
+    chunks = (body[start:start + 1024] for start in range(0, len(body), 1024))
+    response = client.post(
+        "/upload-resume", content=chunks, headers={"content-type": request.headers["content-type"]}
+    )
+    assert response.status_code == 413
+    assert client.get("/resumes").json()["total"] == 0
+    
+    # Uploads within the limit and other endpoints pass through
+    monkeypatch.setattr(ingest, "UPLOAD_MAX_BYTES", 1024 * 1024)
+    upload_resume(client, make_docx, "ann", "ann python developer")
+    assert client.get("/health").status_code == 200
+
+
+def test_list_resumes_pages_with_cursor(client, make_docx):
+    """Test listing walks the pool page by page with next_cursor"""
+    ids = [upload_resume(client, make_docx, name, f"{name} python developer")["id"] for name in ("ann", "ben", "cal")]
+    
+    first = client.get("/resumes", params={"limit": 2}).json()
+    assert first["total"] == 3
+    assert [r["id"] for r in first["resumes"]] == ids[:2]
+    assert "content" not in first["resumes"][0]
+    
+    second = client.get("/resumes", params={"limit": 2, "after_id": first["next_cursor"]}).json()
+    assert [r["id"] for r in second["resumes"]] == ids[2:]
+    assert second["next_cursor"] is None
+    
+    assert client.get("/jobs", params={"limit": 0}).status_code == 400
+
+
+def test_results_etag_and_cache(client, make_docx):
+    """Test /results answers 304 for an unchanged ranking and a new ETag after re-ranking"""
+    upload_resume(client, make_docx, "alice", "python fastapi developer")
+    job = upload_job(client, "python developer")
+    client.post("/rank-resumes", params={"job_id": job["id"]})
+    
+    first = client.get("/results", params={"job_id": job["id"]})
+    etag = first.headers["etag"]
+    cached = client.get("/results", params={"job_id": job["id"]})
+    assert cached.json() == first.json()
+    assert client.get("/metrics/results-cache").json()["hits"] == 1
+    
+    response = client.get("/results", params={"job_id": job["id"]}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    upload_resume(client, make_docx, "bob", "python django developer")
+    client.post("/rank-resumes", params={"job_id": job["id"]})
+    response = client.get("/results", params={"job_id": job["id"]}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total_results"] == 2
+
+
+def test_job_embedding_is_stored_and_reused(client, make_docx, monkeypatch):
+    """Test ranking reads the job vector stored at upload and repeated texts skip the model"""
+    from app import api
+    
+    upload_resume(client, make_docx, "alice", "python fastapi developer")
+    job = upload_job(client, "senior python developer")
+    
+    encoded = []
+    original = api.encode_documents
+    
+    def recording(embedder, texts, *args, **kwargs):
+        encoded.extend(texts)
+        return original(embedder, texts, *args, **kwargs)
+    
+    monkeypatch.setattr(api, "encode_documents", recording)
+    for _ in range(2):
+        assert client.post("/rank-resumes", params={"job_id": job["id"]}).status_code == 200
+    upload_job(client, "senior python developer", title="Same text")
+    assert encoded == []
+    
+    upload_job(client, "go developer", title="New text")
+    assert encoded == ["go developer"]
+
+
+def test_ranking_prefilters(client, make_docx, monkeypatch):
+    """Test date, name and requisition filters restrict the ranked slice"""
+    def upload(name, text, requisition_id=None):
+        response = client.post(
+            "/upload-resume",
+            files={"file": (f"{name}.docx", make_docx(text), DOCX_TYPE)},
+            params={"candidate_name": name, "requisition_id": requisition_id}
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+    
+    alice = upload("alice", "python fastapi developer", "REQ-1")
+    upload("bob", "python django developer", "REQ-2")
+    carol = upload("carol", "python flask developer", "REQ-1")
+    job = upload_job(client, "python developer")
+    
+    def ranked(**filters):
+        response = client.post("/rank-resumes", params={"job_id": job["id"], **filters})
+        assert response.status_code == 200, response.text
+        return sorted(r["resume_id"] for r in response.json()["rankings"])
+    
+    assert ranked(requisition_id="REQ-1") == [alice["id"], carol["id"]]
+    assert ranked(name="CAR") == [carol["id"]]
+    assert ranked(name="a*.docx") == [alice["id"]]
+    assert ranked(uploaded_after="2000-01-01T00:00:00", requisition_id="REQ-1", lexical_weight=0.5) == [
+        alice["id"], carol["id"]
+    ]
+    assert len(ranked()) == 3  # unfiltered ranking is full again
+    
+    # Without the embedding matrix the slice is read through a subquery,
+    # and ID lists in batches
+    from app import api, store
+    monkeypatch.setattr(api.embedding_matrix, "directory", "")
+    monkeypatch.setattr(store, "EMBEDDING_LOAD_BATCH_SIZE", 1)
+    monkeypatch.setattr(api, "EMBEDDING_LOAD_BATCH_SIZE", 1)
+    assert ranked(requisition_id="REQ-1") == [alice["id"], carol["id"]]
+    assert ranked(requisition_id="REQ-1", lexical_weight=0.5) == [alice["id"], carol["id"]]
+    assert len(ranked(incremental=False)) == 3
+    
+    response = client.post("/rank-resumes", params={"job_id": job["id"], "uploaded_before": "2000-01-01T00:00:00"})
+    assert response.status_code == 404
+    response = client.post("/rank-resumes", params={"job_id": job["id"], "name": "bob", "background": True})
+    assert response.status_code == 400
@@ -0,0 +1,112 @@
+# backend/tests/test_batching.py
+"""Test suite for the micro-batching embedding scheduler"""
+
+import sys
+import os
+import asyncio
+import threading
+
+# Add backend/app to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from batching import MicroBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    """Test that concurrent submits are coalesced and fanned back out"""
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def scenario():
+        batcher = MicroBatcher(encode, max_items=64, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(f"text{i}") for i in range(10)))
+        finally:
+            await batcher.stop()
+        return results, batcher.metrics()
+
+    results, metrics = asyncio.run(scenario())
+
+    assert results == [f"TEXT{i}" for i in range(10)]
+    assert len(calls) == 1
+    assert metrics["batches"] == 1
+    assert metrics["batch_size_max"] == 10
+    assert metrics["queue_wait_ms_max"] >= 0
+
+
+def test_batches_are_capped_at_max_items():
+    """Test that a full batch is flushed without waiting"""
+    calls = []
+
+    def encode(texts):
+        calls.append(len(texts))
+        return texts
+
+    async def scenario():
+        batcher = MicroBatcher(encode, max_items=4, max_wait_ms=1000)
+        await batcher.start()
+        try:
+            await asyncio.gather(*(batcher.submit(str(i)) for i in range(8)))
+        finally:
+            await batcher.stop()
+
+    asyncio.run(scenario())
+
+    assert calls == [4, 4]
+
+
+def test_encode_errors_reach_every_caller():
+    """Test that a failing batch raises in each awaiting coroutine"""
+    def encode(texts):
+        raise RuntimeError("model failed")
+
+    async def scenario():
+        batcher = MicroBatcher(encode, max_wait_ms=10)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_submit_without_start_encodes_directly():
+    """Test the fallback path when the batcher is not running"""
+    batcher = MicroBatcher(lambda texts: [len(text) for text in texts])
+
+    assert asyncio.run(batcher.submit("abc")) == 3
+
+
+def test_stop_fails_the_batch_in_flight():
+    """Test that stopping mid-batch fails its callers instead of leaving them waiting"""
+    release = threading.Event()
+
+    def encode(texts):
+        release.wait(5)
+        return texts
+
+    async def scenario():
+        collecting = MicroBatcher(encode, max_items=64, max_wait_ms=10000)
+        encoding = MicroBatcher(encode, max_items=1)
+        results = []
+        for batcher in (collecting, encoding):
+            await batcher.start()
+            waiting = asyncio.ensure_future(batcher.submit("a"))
+            await asyncio.sleep(0.05)
+            await batcher.stop()
+            results.append(await asyncio.wait_for(asyncio.gather(waiting, return_exceptions=True), 1))
+        release.set()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert [str(result) for (result,) in results] == ["Embedding batcher stopped"] * 2
@@ -0,0 +1,51 @@
+# backend/tests/test_db.py
+"""Test suite for database connection settings"""
+
+import sys
+import os
+from sqlalchemy import text
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import make_engine
+
+
+def test_sqlite_file_connections_use_wal(tmp_path):
+    """Test every new SQLite connection gets WAL, NORMAL sync and a busy timeout"""
+    engine = make_engine(f"sqlite:///{tmp_path / 'resumes.db'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    engine.dispose()
+
+
+def test_in_memory_and_untuned_engines(tmp_path):
+    """Test in-memory databases skip the journal settings and pragmas can be turned off"""
+    engine = make_engine("sqlite://")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "memory"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    
+    engine = make_engine(f"sqlite:///{tmp_path / 'plain.db'}", pragmas={})
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
+
+
+def test_init_db_adds_indexes_to_existing_tables(tmp_path, monkeypatch):
+    """Test indexes added to the models are created on databases made before them"""
+    from sqlalchemy import inspect
+    from app import db as app_db
+    
+    engine = make_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    monkeypatch.setattr(app_db, "engine", engine)
+    app_db.init_db()
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_ranking_results_resume_id"))
+    
+    app_db.init_db()
+    indexes = {index["name"] for index in inspect(engine).get_indexes("ranking_results")}
+    assert "ix_ranking_results_resume_id" in indexes
+    engine.dispose()
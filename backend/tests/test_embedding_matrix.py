@@ -0,0 +1,118 @@
+# backend/tests/test_embedding_matrix.py
+"""Test suite for the memory-mapped embedding matrix"""
+
+import sys
+import os
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.embedding_matrix import EmbeddingMatrix
+from app.models import Base
+from app.store import save_resume_embedding
+
+
+class StubEmbedder:
+    model_name = "org/stub"
+    model_version = "1"
+
+
+def random_unit_vectors(n, dimension=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float16", 1e-3), ("int8", 2e-2)])
+def test_scores_match_float32(db, tmp_path, dtype, tolerance):
+    """Test compact storage keeps scores close to the exact ones"""
+    embedder = StubEmbedder()
+    vectors = random_unit_vectors(50)
+    for resume_id, vector in enumerate(vectors, 1):
+        save_resume_embedding(db, resume_id, vector, embedder)
+    db.commit()
+    
+    matrix = EmbeddingMatrix(str(tmp_path), dtype)
+    assert matrix.ensure_built(db, embedder)
+    ids, scores = matrix.score(vectors[7], embedder, block_size=8)
+    assert ids.tolist() == list(range(1, 51))
+    np.testing.assert_allclose(scores, vectors @ vectors[7], atol=tolerance)
+    
+    ids, scores = matrix.score(vectors[7], embedder, resume_ids=[8, 3])
+    assert ids.tolist() == [3, 8]
+
+
+def test_append_remove_and_rebuild(db, tmp_path):
+    """Test appends replace rows, deletes hide them and a stale file is rebuilt"""
+    embedder = StubEmbedder()
+    vectors = random_unit_vectors(4)
+    matrix = EmbeddingMatrix(str(tmp_path))
+    matrix.ensure_built(db, embedder)  # empty table
+    
+    rows = [save_resume_embedding(db, resume_id, vector, embedder) for resume_id, vector in zip((1, 2, 3), vectors[:3])]
+    db.commit()
+    matrix.add([1, 2, 3], vectors[:3], embedder, [row.id for row in rows])
+    # Appends kept the fingerprint in step: no rebuild
+    ids_file = os.stat(matrix._paths(embedder)["ids"])
+    assert matrix.ensure_built(db, embedder)
+    assert os.stat(matrix._paths(embedder)["ids"]).st_ino == ids_file.st_ino
+    
+    matrix.add([2], vectors[3:], embedder, [])  # re-encoded in place
+    matrix.remove([1], embedder, [rows[0].id])
+    
+    ids, scores = matrix.score(vectors[3], embedder)
+    assert ids.tolist() == [3, 2]
+    assert np.isclose(scores[1], 1.0, atol=1e-3)
+    
+    # Another process sharing the files sees the same rows
+    assert EmbeddingMatrix(str(tmp_path)).view(embedder)[0].tolist() == [-1, -1, 3, 2]
+    
+    # The embedding of resume 1 is still stored: rebuilt from the database
+    assert matrix.ensure_built(db, embedder)
+    assert matrix.view(embedder)[0].tolist() == [1, 2, 3]
+
+
+def test_replaced_database_is_detected(db, tmp_path):
+    """Test files built from another database with as many embeddings are rebuilt"""
+    from app.models import ResumeEmbedding
+    
+    embedder = StubEmbedder()
+    vectors = random_unit_vectors(6)
+    for resume_id, vector in zip((1, 2, 3), vectors[:3]):
+        save_resume_embedding(db, resume_id, vector, embedder)
+    db.commit()
+    matrix = EmbeddingMatrix(str(tmp_path))
+    matrix.ensure_built(db, embedder)
+    
+    # Same number of embeddings, different resumes
+    db.query(ResumeEmbedding).delete()
+    for resume_id, vector in zip((7, 8, 9), vectors[3:]):
+        save_resume_embedding(db, resume_id, vector, embedder)
+    db.commit()
+    assert matrix.ensure_built(db, embedder)
+    assert matrix.score(vectors[4], embedder)[0].tolist() == [7, 8, 9]
+
+
+def test_disabled_matrix_ignores_writes(db, tmp_path, monkeypatch):
+    """Test an unset directory turns appends and deletes into no-ops"""
+    monkeypatch.chdir(tmp_path)
+    embedder = StubEmbedder()
+    matrix = EmbeddingMatrix("")
+    
+    with matrix.locked(embedder):
+        matrix.add([1], random_unit_vectors(1), embedder, [1])
+        matrix.remove([1], embedder, [1])
+    assert not matrix.ensure_built(db, embedder)
+    assert list(tmp_path.iterdir()) == []
@@ -8,7 +8,9 @@ import numpy as np
 # Add backend/app to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
-from embeddings import Embedder
+import pytest
+
+from embeddings import Embedder, token_windows, parity_check
 
 
 def test_embedder_initialization():
@@ -82,6 +84,55 @@ def test_dissimilar_texts():
     print(f"✓ Dissimilar texts test passed (similarity: {similarity:.4f})")
 
 
+def test_token_windows():
+    """Test overlapping token windows cover the whole document"""
+    assert token_windows(100, 254, 32) == [(0, 100)]
+    
+    windows = token_windows(600, 254, 32)
+    assert windows == [(0, 254), (222, 476), (444, 600)]
+    print("✓ Token windows test passed")
+
+
+def test_chunk_text_covers_long_resume():
+    """Test that a long resume is split into several chunks"""
+    embedder = Embedder(chunking=True)
+    text = " ".join(f"skill{i}" for i in range(1000))
+    
+    chunks = embedder.chunk_text(text)
+    
+    assert len(chunks) > 1
+    assert chunks[0].startswith("skill0")
+    assert chunks[-1].endswith("skill999")
+    print(f"✓ Chunk text test passed ({len(chunks)} chunks)")
+
+
+def test_unknown_backend_rejected():
+    """Test that an unsupported backend name fails fast"""
+    with pytest.raises(ValueError):
+        Embedder(backend="tensorflow")
+    print("✓ Unknown backend test passed")
+
+
+def test_parity_check_reports_drift():
+    """Test parity report between a reference and a drifted backend"""
+    class FixedEmbedder:
+        def __init__(self, vectors):
+            self.vectors = np.array(vectors)
+        
+        def embed_text(self, texts, batch_size=32):
+            return self.vectors
+    
+    reference = FixedEmbedder([[1.0, 0.0], [0.0, 1.0]])
+    candidate = FixedEmbedder([[1.0, 0.0], [0.6, 0.8]])
+    
+    report = parity_check(candidate, reference, ["a", "b"])
+    
+    assert report["samples"] == 2
+    assert np.isclose(report["max_drift"], 0.2)
+    assert np.isclose(report["mean_cosine"], 0.9)
+    print("✓ Parity check test passed")
+
+
 def run_all_tests():
     """Run all embedding tests"""
     print("\n" + "="*50)
@@ -94,6 +145,10 @@ def run_all_tests():
         test_multiple_texts_embedding()
         test_cosine_similarity()
         test_dissimilar_texts()
+        test_token_windows()
+        test_chunk_text_covers_long_resume()
+        test_unknown_backend_rejected()
+        test_parity_check_reports_drift()
         
         print("\n" + "="*50)
         print("✓ All tests passed!")
@@ -0,0 +1,66 @@
+# backend/tests/test_lexical_index.py
+"""Test suite for the BM25 lexical index"""
+
+import sys
+import os
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.lexical_index import LexicalIndex
+from app.ranking import fuse_scores, reciprocal_rank_fusion
+from app.utils import tokenize
+
+
+def built_index(documents):
+    index = LexicalIndex()
+    index._built = True
+    for resume_id, text in documents.items():
+        index.add(resume_id, text)
+    return index
+
+
+def test_tokenize_keeps_tool_names():
+    """Test tokens keep symbols of tool names and drop stopwords"""
+    assert tokenize("The C++ and C# devs, Node.js; CI/CD.") == ["c++", "c#", "devs", "node.js", "ci/cd"]
+
+
+def test_search_ranks_rare_terms_higher():
+    """Test BM25 ranks documents matching rarer query terms first"""
+    index = built_index({
+        1: "python developer",
+        2: "python developer with cissp certification",
+        3: "java developer",
+        4: "pastry chef",
+    })
+
+    ids, scores = index.search("python cissp", 10)
+
+    assert ids.tolist() == [2, 1]
+    assert scores[0] > scores[1] > 0
+
+
+def test_add_and_remove_are_incremental():
+    """Test updates are reflected without a rebuild, including slot reuse"""
+    index = built_index({i: "java developer" for i in range(1, 2001)})
+    index.remove(range(1, 2000))
+    index.add(5000, "kubernetes operator")
+    for i in range(6000, 7100):
+        index.add(i, "java kubernetes")
+
+    ids, _ = index.search("kubernetes operator", 1)
+    assert ids.tolist() == [5000]
+    assert index.size == 1 + 1 + 1100
+    ids, _ = index.score("java", resume_ids=[2000, 6000, 5000])
+    assert sorted(ids.tolist()) == [2000, 6000]
+
+
+def test_fusion():
+    """Test weighted fusion normalizes BM25 and RRF skips missing documents"""
+    semantic = np.array([0.9, 0.5, 0.1])
+    lexical = np.array([0.0, 4.0, 2.0])
+
+    assert np.allclose(fuse_scores(semantic, lexical, 0.5), [0.45, 0.75, 0.3])
+    fused = reciprocal_rank_fusion([semantic, np.array([-np.inf, 4.0, 2.0])], k=1)
+    assert np.allclose(fused, [1 / 2, 1 / 3 + 1 / 2, 1 / 4 + 1 / 3])
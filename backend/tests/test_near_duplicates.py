@@ -0,0 +1,52 @@
+# backend/tests/test_near_duplicates.py
+"""Test suite for the MinHash/LSH near-duplicate index"""
+
+import sys
+import os
+import random
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.near_duplicates import MinHashIndex
+
+
+def random_text(rng, words=200):
+    return " ".join(f"skill{rng.randrange(3000)}" for _ in range(words))
+
+
+def built_index(documents):
+    index = MinHashIndex()
+    index._built = True
+    for resume_id, text in documents.items():
+        index.add(resume_id, text)
+    return index
+
+
+def test_clusters_group_edited_copies_only():
+    """Test lightly edited copies cluster together and distinct texts do not"""
+    rng = random.Random(0)
+    original = random_text(rng)
+    edited = original.split()
+    edited[50] = "changed"
+    documents = {i: random_text(rng) for i in range(1, 51)}
+    documents.update({100: original, 101: " ".join(edited), 102: original + " references available"})
+
+    index = built_index(documents)
+
+    assert index.clusters() == [[100, 101, 102]]
+    assert index.near_duplicates(101) == [100, 102]
+    assert index.similarity(100, 101) > 0.8
+    assert index.near_duplicates(1) == []
+
+
+def test_remove_drops_from_buckets():
+    """Test removed resumes no longer show up as near duplicates"""
+    rng = random.Random(1)
+    text = random_text(rng)
+    index = built_index({1: text, 2: text, 3: text})
+
+    index.remove([2])
+
+    assert index.clusters() == [[1, 3]]
+    assert index.size == 2
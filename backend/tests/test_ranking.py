@@ -0,0 +1,133 @@
+# backend/tests/test_ranking.py
+"""Test suite for the vectorized ranking engine"""
+
+import sys
+import os
+import numpy as np
+
+# Add backend/app to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from ranking import (
+    encode_in_batches, encode_documents, mean_pool, score_embeddings, score_chunked, top_k_indices,
+    merge_rankings, score_matrix_top_k
+)
+
+
+class RecordingEmbedder:
+    """Embedder stand-in that encodes text length and records batches"""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_text(self, texts, batch_size=32):
+        self.batches.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def test_encode_in_batches_preserves_input_order():
+    """Test that length sorting does not reorder the output"""
+    embedder = RecordingEmbedder()
+    texts = ["ccc", "a", "bbbbb", "dd"]
+
+    embeddings = encode_in_batches(embedder, texts, batch_size=2)
+
+    assert embeddings[:, 0].tolist() == [3.0, 1.0, 5.0, 2.0]
+    assert embedder.batches == [["a", "dd"], ["ccc", "bbbbb"]]
+
+
+class ChunkingEmbedder:
+    """Embedder stand-in that splits on '|' and encodes one-hot chunks"""
+
+    chunking = True
+
+    def chunk_text(self, text):
+        return text.split("|")
+
+    def embed_text(self, texts, batch_size=32):
+        return np.array([[1.0, 0.0] if text.startswith("x") else [0.0, 1.0] for text in texts])
+
+
+def test_encode_documents_pools_chunks():
+    """Test that chunked documents are encoded in one pass and mean-pooled"""
+    documents, chunks = encode_documents(ChunkingEmbedder(), ["x1|y1", "x2"])
+
+    assert np.allclose(documents[0], [np.sqrt(0.5), np.sqrt(0.5)])
+    assert np.allclose(documents[1], [1.0, 0.0])
+    assert chunks[0].shape == (2, 2)
+    assert chunks[1] is None
+
+
+def test_score_chunked_pooling_modes():
+    """Test max and top-n pooling of chunk scores"""
+    query = np.array([1.0, 0.0])
+    documents = [
+        np.array([[0.9, 0.0], [0.5, 0.0], [0.1, 0.0]]),
+        np.array([[0.6, 0.0]]),
+    ]
+
+    assert np.allclose(score_chunked(query, documents, "max"), [0.9, 0.6])
+    assert np.allclose(score_chunked(query, documents, "top-n", top_n=2), [0.7, 0.6])
+
+
+def test_score_chunked_mean_matches_stored_document_vectors():
+    """Test mean pooling scores the normalized mean vector, like the stored embeddings"""
+    query = np.array([1.0, 0.0])
+    documents = [
+        np.array([[1.0, 0.0], [0.0, 1.0]]),
+        np.array([[0.6, 0.8], [0.6, -0.8], [1.0, 0.0]]),
+        np.array([[1.0, 0.0], [-1.0, 0.0]]),
+    ]
+    pooled = np.vstack([mean_pool(chunks) for chunks in documents])
+
+    scores = score_chunked(query, documents, "mean")
+
+    assert np.allclose(scores, score_embeddings(query, pooled))
+    # Not the mean of chunk scores (0.5 and 0.733...)
+    assert np.allclose(scores, [np.sqrt(0.5), 1.0, 0.0])
+
+
+def test_score_embeddings_matches_dot_product():
+    """Test that matrix scoring equals per-row dot products"""
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(10, 8))
+    query = rng.normal(size=8)
+
+    scores = score_embeddings(query, matrix)
+
+    assert np.allclose(scores, [np.dot(query, row) for row in matrix])
+
+
+def test_top_k_indices():
+    """Test that top-k returns the best scores in descending order"""
+    scores = np.array([0.1, 0.9, 0.4, 0.7, 0.2])
+
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores).tolist() == [1, 3, 2, 4, 0]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert len(top_k_indices(scores, 0)) == 0
+
+
+def test_merge_rankings_moves_only_shifted_rows():
+    """Test merging new scores rewrites only ranks that changed"""
+    existing = [(1, 0.9, 1), (2, 0.5, 2), (3, 0.2, 3)]
+
+    merged, moved, dropped = merge_rankings(existing, {4: 0.7, 3: 0.95}, top_k=3)
+
+    assert merged == [(3, 0.95), (1, 0.9), (4, 0.7)]
+    assert moved == {1: 2}
+    assert dropped == [2]
+
+
+def test_score_matrix_top_k_matches_per_query_ranking():
+    """Test blocked multi-query scoring against one ranking per query"""
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(4, 8))
+    matrix = rng.normal(size=(25, 8))
+    scores = queries @ matrix.T
+
+    indices, top_scores, reverse, _ = score_matrix_top_k(queries, matrix, k=5, reverse_k=2, block_size=7)
+
+    assert [row.tolist() for row in indices] == [top_k_indices(row, 5).tolist() for row in scores]
+    assert np.allclose(top_scores, np.take_along_axis(scores, indices, axis=1))
+    assert [row.tolist() for row in reverse] == [top_k_indices(col, 2).tolist() for col in scores.T]
@@ -0,0 +1,74 @@
+# backend/tests/test_text_extract.py
+"""Test suite for bounded document text extraction"""
+
+import pytest
+
+from app import text_extract
+from app.text_extract import ExtractionStats, ExtractionTimeout, PageLimitExceeded, extract_text_from_pdf
+
+
+def write_pdf(tmp_path, make_pdf, pages):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(make_pdf(pages))
+    return str(path)
+
+
+def test_page_limit(tmp_path, make_pdf):
+    """Test documents within the limit are read whole and longer ones are rejected"""
+    path = write_pdf(tmp_path, make_pdf, ["first page", "second page", "third page"])
+    
+    stats = {}
+    text = extract_text_from_pdf(path, max_pages=3, timeout=0, stats=stats)
+    assert "first page" in text and "third page" in text
+    assert stats["pages"] == 3
+    
+    with pytest.raises(PageLimitExceeded):
+        extract_text_from_pdf(path, max_pages=2, timeout=0)
+
+
+def test_fast_backend_falls_back_to_pdfminer(tmp_path, make_pdf, monkeypatch):
+    """Test a failing fast backend is followed by pdfminer"""
+    def broken(file_path, max_pages):
+        raise RuntimeError("cannot parse")
+    
+    monkeypatch.setitem(text_extract.PDF_BACKENDS, "pymupdf", broken)
+    monkeypatch.setattr(text_extract, "pdf_backends", lambda: ["pymupdf", "pdfminer"])
+    stats = {}
+    text = extract_text_from_pdf(write_pdf(tmp_path, make_pdf, ["python developer"]), timeout=0, stats=stats)
+    assert text == "python developer"
+    assert stats["backend"] == "pdfminer"
+
+
+def test_timeout_kills_extraction(tmp_path, make_pdf):
+    """Test extraction running past the timeout raises instead of blocking"""
+    path = write_pdf(tmp_path, make_pdf, ["python developer"])
+    with pytest.raises(ExtractionTimeout):
+        extract_text_from_pdf(path, timeout=0.001)
+
+
+def test_helper_process_is_reused(tmp_path, make_pdf):
+    """Test timed extractions share one helper and the page check runs inside it"""
+    path = write_pdf(tmp_path, make_pdf, ["first page", "second page"])
+    text_extract.close_extraction_helpers()
+    try:
+        assert "second page" in extract_text_from_pdf(path, timeout=30)
+        helper = text_extract._idle_helpers[0]
+        with pytest.raises(PageLimitExceeded):
+            extract_text_from_pdf(path, max_pages=1, timeout=30)
+        assert text_extract._idle_helpers == [helper]
+        assert helper.process.is_alive()
+    finally:
+        text_extract.close_extraction_helpers()
+
+
+def test_extraction_stats():
+    """Test counts per backend and the slowest documents are reported"""
+    stats = ExtractionStats(slowest=2)
+    for name, seconds, error in [("a.pdf", 0.5, None), ("b.pdf", 2.0, None), ("c.pdf", 1.0, "timeout")]:
+        stats.record(name, {"backend": "pdfminer", "pages": 1, "bytes": 10, "error": error, "seconds": seconds})
+    
+    metrics = stats.metrics()
+    assert metrics["documents"] == 3
+    assert {"backend": "pdfminer", "status": "error", "count": 1} in metrics["by_backend"]
+    assert [entry["filename"] for entry in metrics["slowest"]] == ["b.pdf", "c.pdf"]
+    assert metrics["seconds_max"] == 2.0
@@ -0,0 +1,71 @@
+# backend/tests/test_vector_index.py
+"""Test suite for the FAISS vector index"""
+
+import sys
+import os
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.vector_index import VectorIndex
+
+pytest.importorskip("faiss")
+
+
+class StubEmbedder:
+    model_name = "stub"
+    model_version = "1"
+
+
+def random_unit_vectors(n, dimension=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_flat_index_search_add_remove():
+    """Test exact search stays in sync with adds and removes"""
+    embedder = StubEmbedder()
+    vectors = random_unit_vectors(20)
+    index = VectorIndex(ivf_threshold=1000)
+    index.build(range(100, 120), vectors, embedder)
+
+    ids, scores = index.search(vectors[3], 3)
+    assert ids[0] == 103
+    assert np.isclose(scores[0], 1.0, atol=1e-5)
+
+    index.remove([103])
+    ids, _ = index.search(vectors[3], 3)
+    assert 103 not in ids.tolist()
+
+    index.add([500], vectors[3:4], embedder)
+    ids, _ = index.search(vectors[3], 1)
+    assert ids.tolist() == [500]
+    assert index.size == 20
+
+
+def test_ivf_index_above_threshold():
+    """Test that large corpora use an IVF index that still finds exact matches"""
+    embedder = StubEmbedder()
+    vectors = random_unit_vectors(400)
+    index = VectorIndex(ivf_threshold=100, nprobe=64)
+    index.build(range(400), vectors, embedder)
+
+    ids, _ = index.search(vectors[42], 5)
+    assert ids[0] == 42
+
+    index.remove([42])
+    ids, _ = index.search(vectors[42], 5)
+    assert 42 not in ids.tolist()
+
+
+def test_index_is_tied_to_model():
+    """Test that an index built for one model is stale for another"""
+    index = VectorIndex()
+    index.build([1], random_unit_vectors(1), StubEmbedder())
+
+    other = StubEmbedder()
+    other.model_version = "2"
+    assert index.is_built_for(StubEmbedder())
+    assert not index.is_built_for(other)
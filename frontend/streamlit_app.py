@@ -40,6 +40,8 @@ if "job_id" not in st.session_state:
     st.session_state.job_id = None
 if "uploaded_resumes" not in st.session_state:
     st.session_state.uploaded_resumes = []
+if "results_cache" not in st.session_state:
+    st.session_state.results_cache = None  # (job_id, ETag, results) of the last fetch
 
 # Sidebar
 with st.sidebar:
@@ -75,54 +77,52 @@ with tab1:
     # Resume Upload
     with col1:
         st.subheader("📝 Resumes")
-        st.write("Upload one or more resume files (PDF or DOCX)")
+        st.write("Upload one or more resume files (PDF or DOCX), or ZIP archives of them")
         
         resume_files = st.file_uploader(
             "Choose resume files",
-            type=["pdf", "docx"],
+            type=["pdf", "docx", "zip"],
             accept_multiple_files=True,
             key="resume_uploader"
         )
         
         if resume_files:
-            resume_progress = st.progress(0)
-            status_text = st.empty()
+            # Get candidate names (ZIP members are named after their files)
+            candidate_names = [
+                st.text_input(
+                    f"Candidate name for {file.name}",
+                    value=file.name.split('.')[0],
+                    key=f"candidate_{file.name}"
+                )
+                if not file.name.lower().endswith(".zip") else ""
+                for file in resume_files
+            ]
             
-            for idx, file in enumerate(resume_files):
-                status_text.text(f"Processing: {file.name}")
-                
+            with st.spinner(f"Processing {len(resume_files)} file(s)..."):
                 try:
-                    # Get candidate name
-                    candidate_name = st.text_input(
-                        f"Candidate name for {file.name}",
-                        value=file.name.split('.')[0],
-                        key=f"candidate_{file.name}"
-                    )
-                    
-                    # Upload file
-                    files = {"file": file}
-                    params = {"candidate_name": candidate_name}
+                    # Upload all files in one bulk request
+                    files = [("files", (file.name, file.getvalue(), file.type)) for file in resume_files]
                     
                     response = requests.post(
-                        f"{API_BASE_URL}/upload-resume",
+                        f"{API_BASE_URL}/upload-resumes",
                         files=files,
-                        params=params
+                        data={"candidate_names": candidate_names}
                     )
                     
                     if response.status_code == 200:
-                        data = response.json()
-                        st.session_state.uploaded_resumes.append(data)
-                        st.success(f"✅ {file.name} uploaded!")
+                        for result in response.json()["results"]:
+                            if result["status"] == "ok":
+                                st.session_state.uploaded_resumes.append(result)
+                                st.success(f"✅ {result['filename']} uploaded!")
+                            elif result["status"] == "duplicate":
+                                st.info(f"ℹ️ {result['filename']} is already stored as resume #{result['duplicate_of']}")
+                            else:
+                                st.error(f"❌ Failed to upload {result['filename']}: {result['error']}")
                     else:
-                        st.error(f"❌ Failed to upload {file.name}")
+                        st.error(f"❌ Upload failed: {response.json()}")
                 
                 except Exception as e:
-                    st.error(f"Error uploading {file.name}: {str(e)}")
-                
-                resume_progress.progress((idx + 1) / len(resume_files))
-            
-            status_text.empty()
-            resume_progress.empty()
+                    st.error(f"Error uploading resumes: {str(e)}")
     
     # Job Description Upload
     with col2:
@@ -281,13 +281,24 @@ with tab3:
     
     if st.session_state.job_id:
         try:
+            # Every widget interaction reruns this tab; revalidate instead of refetching
+            cached = st.session_state.results_cache
+            headers = {}
+            if cached and cached[0] == st.session_state.job_id:
+                headers["If-None-Match"] = cached[1]
             response = requests.get(
                 f"{API_BASE_URL}/results",
-                params={"job_id": st.session_state.job_id}
+                params={"job_id": st.session_state.job_id},
+                headers=headers
             )
             
-            if response.status_code == 200:
-                results = response.json()
+            if response.status_code in (200, 304):
+                if response.status_code == 304:
+                    results = cached[2]
+                else:
+                    results = response.json()
+                    etag = response.headers.get("ETag")
+                    st.session_state.results_cache = (st.session_state.job_id, etag, results) if etag else None
                 
                 st.subheader(f"Job: {results['job_title']}")
                 st.write(f"Total Results: {results['total_results']}")
@@ -0,0 +1,50 @@
+import sys
+import os
+import time
+import argparse
+
+# --- Ensure backend/app is importable ---
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/app'))
+sys.path.append(backend_path)
+
+from embeddings import Embedder, BACKENDS, parity_check
+
+parser = argparse.ArgumentParser(description="Compare embedding backends for throughput and parity")
+parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+parser.add_argument("--texts", type=int, default=512, help="number of sample texts")
+parser.add_argument("--batch-size", type=int, default=32)
+args = parser.parse_args()
+
+# --- Resume-like sample texts of varying length ---
+skills = ["Python", "FastAPI", "SQL", "Docker", "Kubernetes", "PyTorch", "React", "AWS", "Spark", "Go"]
+texts = [
+    f"Candidate {i}: " + " ".join(
+        f"{skills[(i + j) % len(skills)]} experience of {j + 1} years in production systems."
+        for j in range(4 + i % 24)
+    )
+    for i in range(args.texts)
+]
+
+print(f"Torch threads: {os.getenv('OMP_NUM_THREADS', 'default')}, texts: {len(texts)}\n")
+
+reference = None
+baseline = None
+for backend in args.backends:
+    print(f"Loading backend '{backend}'...")
+    embedder = Embedder(backend=backend)
+    embedder.embed_text(texts[:8])  # warm-up
+
+    start = time.perf_counter()
+    embedder.embed_text(texts, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    throughput = len(texts) / elapsed
+    baseline = baseline or throughput
+
+    print(f"  throughput: {throughput:.1f} texts/s ({throughput / baseline:.2f}x vs {args.backends[0]})")
+
+    if reference is None:
+        reference = embedder
+    else:
+        report = parity_check(embedder, reference, texts)
+        print(f"  parity vs {reference.backend}: mean cosine {report['mean_cosine']:.5f}, "
+              f"max drift {report['max_drift']:.5f}")
@@ -0,0 +1,83 @@
+"""
+Time storing one ranking: an ORM object per row versus one executemany.
+
+    python scripts/benchmark_ranking_persistence.py --resumes 50000
+
+Both variants run against a fresh SQLite file; each repetition first
+deletes the job's previous rows, as /rank-resumes does.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# --- Ensure backend is importable ---
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(backend_path)
+
+from app.models import Base, Resume, JobDescription, RankingResult
+from app.store import save_ranking_results
+
+
+def orm_loop(db, job_id, ranked):
+    for rank, (resume_id, score) in enumerate(ranked, 1):
+        db.add(RankingResult(resume_id=resume_id, job_id=job_id, similarity_score=score, rank=rank))
+
+
+def bulk(db, job_id, ranked):
+    save_ranking_results(db, job_id, ranked)
+
+
+def run(session_factory, job_id, ranked, store, repeats):
+    timings = []
+    for _ in range(repeats):
+        db = session_factory()
+        start = time.perf_counter()
+        db.query(RankingResult).filter(RankingResult.job_id == job_id).delete()
+        store(db, job_id, ranked)
+        db.commit()
+        timings.append(time.perf_counter() - start)
+        db.close()
+    return min(timings)
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        with session_factory() as db:
+            db.execute(insert(Resume), [
+                {"filename": f"r{i}.pdf", "content": "", "candidate_name": f"r{i}"}
+                for i in range(args.resumes)
+            ])
+            job = JobDescription(job_title="Benchmark", content="")
+            db.add(job)
+            db.commit()
+            job_id = job.id
+
+        scores = np.random.default_rng(0).random(args.resumes)
+        order = np.argsort(-scores)
+        ranked = [(int(i) + 1, float(scores[i])) for i in order]
+        if args.top_k:
+            ranked = ranked[:args.top_k]
+
+        print(f"Rows per ranking: {len(ranked)}\n")
+        baseline = run(session_factory, job_id, ranked, orm_loop, args.repeats)
+        print(f"  {'ORM object per row':<22} {baseline * 1000:9.1f} ms")
+        elapsed = run(session_factory, job_id, ranked, bulk, args.repeats)
+        print(f"  {'executemany':<22} {elapsed * 1000:9.1f} ms  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=0, help="store only the best N rows (0 stores all)")
+    parser.add_argument("--repeats", type=int, default=3)
+    main(parser.parse_args())
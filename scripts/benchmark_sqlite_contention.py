@@ -0,0 +1,114 @@
+"""
+Concurrent uploads and rankings on SQLite: default connections versus WAL.
+
+    python scripts/benchmark_sqlite_contention.py --writers 4 --readers 4 --seconds 5
+
+Writer threads insert resumes (one transaction each, like /upload-resume)
+while reader threads run the count and result queries of /rank-resumes and
+/results. With the rollback journal a commit locks readers out and every
+commit syncs the file; with WAL readers keep reading the last committed
+snapshot while a write is in progress and commits only append to the log.
+"database is locked" errors are counted for both: the default connections
+only have the driver's 5 s wait, the tuned ones busy_timeout.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# --- Ensure backend is importable ---
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(backend_path)
+
+from app.db import make_engine, sqlite_pragmas
+from app.models import Base, Resume, RankingResult
+
+
+def writer(session_factory, stop, stats, number):
+    text = "python developer with fastapi and docker experience " * 80
+    count = 0
+    while not stop.is_set():
+        db = session_factory()
+        try:
+            db.add(Resume(filename=f"w{number}-{count}.pdf", candidate_name="bench", content=text))
+            db.commit()
+            stats["writes"].append(time.perf_counter())
+        except OperationalError:
+            db.rollback()
+            stats["write_errors"] += 1
+        finally:
+            db.close()
+        count += 1
+
+
+def reader(session_factory, stop, stats):
+    while not stop.is_set():
+        db = session_factory()
+        start = time.perf_counter()
+        try:
+            db.query(func.count(Resume.id)).scalar()
+            db.query(RankingResult.resume_id, RankingResult.similarity_score).filter(
+                RankingResult.job_id == 1
+            ).order_by(RankingResult.rank).limit(50).all()
+            stats["reads"].append((start, time.perf_counter()))
+        except OperationalError:
+            stats["read_errors"] += 1
+        finally:
+            db.close()
+
+
+def run_mode(mode, args):
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = make_engine(url, pragmas=sqlite_pragmas() if mode == "tuned" else {})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        stats = {"writes": [], "reads": [], "write_errors": 0, "read_errors": 0}
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=writer, args=(session_factory, stop, stats, i)) for i in range(args.writers)
+        ] + [
+            threading.Thread(target=reader, args=(session_factory, stop, stats)) for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    latencies = np.array([end - start for start, end in stats["reads"]]) * 1000
+    # A read overlaps a write if some commit finished while it was running
+    writes = np.sort(np.array(stats["writes"]))
+    overlapping = sum(
+        np.searchsorted(writes, end) > np.searchsorted(writes, start) for start, end in stats["reads"]
+    )
+    print(
+        f"  {mode:<8} writes/s={len(stats['writes']) / args.seconds:8.1f}  "
+        f"reads/s={len(stats['reads']) / args.seconds:8.1f}  "
+        f"reads overlapping a commit={overlapping:6d}  "
+        f"read p95={np.percentile(latencies, 95) if len(latencies) else 0:7.1f} ms  "
+        f"locked errors: write={stats['write_errors']} read={stats['read_errors']}"
+    )
+
+
+def main(args):
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds} s per mode\n")
+    for mode in ("default", "tuned"):
+        run_mode(mode, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    main(parser.parse_args())
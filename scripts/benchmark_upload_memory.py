@@ -0,0 +1,81 @@
+"""
+Peak memory of spooling concurrent uploads: whole-file read versus streaming.
+
+    python scripts/benchmark_upload_memory.py --uploads 8 --size-mb 40
+
+Each mode runs in a fresh interpreter so the peak RSS of one does not
+hide the other. "buffered" mirrors the old `await file.read()` followed
+by a write to a temporary file; "streamed" is ingest.spool_to_temp_file,
+which copies fixed-size chunks.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Ensure backend is importable ---
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend'))
+sys.path.append(backend_path)
+
+
+def buffered(path):
+    with open(path, "rb") as source:
+        contents = source.read()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(contents)
+        return tmp.name
+
+
+def streamed(path):
+    from app.ingest import spool_to_temp_file
+
+    with open(path, "rb") as source:
+        return spool_to_temp_file(source, "upload.pdf", max_bytes=1 << 40)[0]
+
+
+def run_mode(mode, path, uploads):
+    spool = {"buffered": buffered, "streamed": streamed}[mode]
+    tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=uploads) as pool:
+        spooled = list(pool.map(spool, [path] * uploads))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    for spooled_path in spooled:
+        os.unlink(spooled_path)
+    # ru_maxrss is KiB on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"  {mode:<10} peak allocated={peak / 2 ** 20:8.1f} MiB  peak RSS={rss:8.1f} MiB  time={elapsed:6.2f} s")
+
+
+def main(args):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as upload:
+        for _ in range(args.size_mb):
+            upload.write(os.urandom(1024 * 1024))
+    try:
+        print(f"{args.uploads} concurrent uploads of {args.size_mb} MiB\n")
+        for mode in ("buffered", "streamed"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--path", upload.name, "--uploads", str(args.uploads)],
+                check=True
+            )
+    finally:
+        os.unlink(upload.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=40)
+    parser.add_argument("--mode", choices=("buffered", "streamed"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.path, args.uploads)
+    else:
+        main(args)
@@ -0,0 +1,149 @@
+"""
+Latency of light endpoints while heavy uploads are in flight.
+
+Start the backend first (uvicorn app.main:app from backend/), then run:
+
+    python scripts/load_test.py --uploads 16 --paragraphs 3000
+
+A few small resumes and a job are uploaded and ranked first, so /results
+serves a real ranking. /health and /results are probed on their own while
+idle, then again while concurrent large DOCX uploads run. With extraction,
+encoding and database work off the event loop, both latency profiles should
+be about the same. Responses other than 200 are counted as errors, not
+latency samples. Every upload has its own text, so none is skipped as a
+duplicate.
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+
+import httpx
+from docx import Document
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def build_docx(paragraphs, tag):
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(
+            f"Paragraph {i} of {tag}: Python, FastAPI, SQL and Docker experience on distributed systems."
+        )
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class Samples:
+    """Latencies of successful responses and the status codes of failed ones"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = []
+
+    def record(self, response, started):
+        if response.status_code == 200:
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        else:
+            self.errors.append(response.status_code)
+
+
+async def probe(client, path, params, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        samples.record(await client.get(path, params=params), start)
+        await asyncio.sleep(0.05)
+
+
+async def upload(client, payload, index, samples):
+    start = time.perf_counter()
+    response = await client.post(
+        "/upload-resume",
+        files={"file": (f"load_{index}.docx", payload, DOCX_TYPE)},
+        params={"candidate_name": f"load {index}"}
+    )
+    samples.record(response, start)
+
+
+def summarize(label, samples):
+    errors = f"  errors={len(samples.errors)} {sorted(set(samples.errors))}" if samples.errors else ""
+    if not samples.latencies:
+        print(f"  {label:<28} no successful responses{errors}")
+        return
+    latencies = sorted(samples.latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"  {label:<28} n={len(latencies):<5} median={statistics.median(latencies):7.1f} ms"
+          f"  p95={p95:7.1f} ms  max={latencies[-1]:7.1f} ms{errors}")
+
+
+async def measure(client, job_id, duration=None, uploads=None):
+    stop = asyncio.Event()
+    health, results = Samples(), Samples()
+    probes = [
+        asyncio.create_task(probe(client, "/health", None, stop, health)),
+        asyncio.create_task(probe(client, "/results", {"job_id": job_id}, stop, results)),
+    ]
+    if uploads:
+        await asyncio.gather(*uploads)
+    else:
+        await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*probes)
+    return health, results
+
+
+async def seed(client, resumes):
+    """Upload small resumes and a job, rank them, and return the job ID"""
+    for i in range(resumes):
+        response = await client.post(
+            "/upload-resume",
+            files={"file": (f"seed_{i}.docx", build_docx(5, f"seed resume {i}"), DOCX_TYPE)},
+            params={"candidate_name": f"seed {i}"}
+        )
+        response.raise_for_status()
+    job = await client.post(
+        "/upload-job-description",
+        params={"job_title": "Load test", "content": "Python FastAPI developer"}
+    )
+    job.raise_for_status()
+    job_id = job.json()["id"]
+    (await client.post("/rank-resumes", params={"job_id": job_id})).raise_for_status()
+    (await client.get("/results", params={"job_id": job_id})).raise_for_status()
+    return job_id
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=600) as client:
+        job_id = await seed(client, args.seed_resumes)
+
+        # Distinct texts: identical uploads would be answered as duplicates
+        # without extraction or encoding
+        run = time.time_ns()
+        payloads = [build_docx(args.paragraphs, f"upload {run}-{i}") for i in range(args.uploads)]
+        print(f"Upload size: {len(payloads[0]) / 1024:.0f} KiB, concurrent uploads: {args.uploads}\n")
+
+        health, results = await measure(client, job_id, duration=args.idle_seconds)
+        print("Idle:")
+        summarize("GET /health", health)
+        summarize("GET /results", results)
+
+        started = time.perf_counter()
+        upload_samples = Samples()
+        uploads = [upload(client, payload, i, upload_samples) for i, payload in enumerate(payloads)]
+        health, results = await measure(client, job_id, uploads=uploads)
+        print(f"During uploads ({time.perf_counter() - started:.1f} s):")
+        summarize("GET /health", health)
+        summarize("GET /results", results)
+        summarize("POST /upload-resume", upload_samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--paragraphs", type=int, default=3000, help="paragraphs per uploaded DOCX")
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument("--seed-resumes", type=int, default=5, help="small resumes uploaded before ranking")
+    asyncio.run(main(parser.parse_args()))